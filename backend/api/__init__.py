@@ -3,9 +3,23 @@ from api.routes.healthcheck import healthcheck_bp
 from api.routes.users import users_bp
 from api.routes.costs import costs_bp
 from api.routes.receivements import receivements_bp
+from api.routes.transactions import transactions_bp
+from api.routes.summary import summary_bp
+from api.routes.balance import balance_bp
+from api.routes.metrics import metrics_bp
+from api.middlewares.metrics_middleware import init_metrics
+from api.middlewares.logging_middleware import init_request_logging
+from api.tools.json_provider import FastJSONProvider
+from api.tools.logs import setup_logging
 
 
+setup_logging()
+
 app = Flask(__name__)
+app.json_provider_class = FastJSONProvider
+app.json = FastJSONProvider(app)
+init_metrics(app)
+init_request_logging(app)
 
 @app.before_request
 def handle_preflight():
@@ -19,4 +33,8 @@ def handle_preflight():
 app.register_blueprint(healthcheck_bp)
 app.register_blueprint(users_bp)
 app.register_blueprint(costs_bp)
-app.register_blueprint(receivements_bp)
\ No newline at end of file
+app.register_blueprint(receivements_bp)
+app.register_blueprint(transactions_bp)
+app.register_blueprint(summary_bp)
+app.register_blueprint(balance_bp)
+app.register_blueprint(metrics_bp)
\ No newline at end of file
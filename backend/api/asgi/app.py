@@ -0,0 +1,44 @@
+import logging, os
+from contextlib import asynccontextmanager
+from a2wsgi import WSGIMiddleware
+from starlette.applications import Starlette
+from starlette.routing import Mount
+from api.asgi.db import get_async_db
+from api.asgi.routes import routes
+
+logger = logging.getLogger(__name__)
+
+# Threads que atendem as rotas do Flask montadas no app ASGI; cada uma
+# pode segurar uma conexão do pool síncrono
+WSGI_WORKERS = int(os.getenv('ASGI_WSGI_WORKERS', 10))
+
+
+@asynccontextmanager
+async def lifespan(app):
+    # O pool é criado no processo que atende, depois de qualquer fork. Com o
+    # banco fora do ar o app sobe assim mesmo, como o Flask, e o pool é
+    # criado na primeira requisição
+    db = get_async_db()
+    try:
+        await db.open()
+    except Exception:
+        logger.warning("Banco de dados indisponível na inicialização", exc_info=True)
+    try:
+        yield
+    finally:
+        await db.close()
+
+
+def create_async_app() -> Starlette:
+    # Rotas quentes (listagem, detalhe e criação de lançamentos, saldo e
+    # healthcheck) rodam no event loop sobre o asyncpg; todas as outras
+    # continuam nos blueprints do Flask, chamados por um pool de threads
+    from api import app as flask_app
+
+    return Starlette(
+        routes=[
+            *routes,
+            Mount("/", app=WSGIMiddleware(flask_app, workers=WSGI_WORKERS)),
+        ],
+        lifespan=lifespan,
+    )
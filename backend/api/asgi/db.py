@@ -0,0 +1,124 @@
+import asyncio, logging, os, time
+from contextlib import asynccontextmanager
+from api.tools.db import PREPARED_STATEMENTS, get_db_params
+from api.tools.metrics import record_acquire, record_query
+from typing import Optional
+
+try:
+    import asyncpg
+except ImportError:  # pragma: no cover - depende do ambiente
+    asyncpg = None
+
+
+logger = logging.getLogger(__name__)
+
+# Conexões por processo: milhares de requisições em andamento dividem
+# poucas conexões, esperando na fila do pool sem ocupar threads
+DB_ASYNC_POOL_MIN = int(os.getenv('DB_ASYNC_POOL_MIN', 1))
+DB_ASYNC_POOL_MAX = int(os.getenv('DB_ASYNC_POOL_MAX', 20))
+DB_ASYNC_POOL_TIMEOUT = float(os.getenv('DB_ASYNC_POOL_TIMEOUT', 30))
+
+
+class InstrumentedConnection:
+    # Como o InstrumentedCursor: soma o tempo de cada comando às métricas da
+    # requisição em andamento; o restante vai direto à conexão do asyncpg
+    def __init__(self, conn):
+        self._conn = conn
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    async def _timed(self, method, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return await method(*args, **kwargs)
+        finally:
+            record_query(time.perf_counter() - start)
+
+    async def execute(self, *args, **kwargs):
+        return await self._timed(self._conn.execute, *args, **kwargs)
+
+    async def executemany(self, *args, **kwargs):
+        return await self._timed(self._conn.executemany, *args, **kwargs)
+
+    async def fetch(self, *args, **kwargs):
+        return await self._timed(self._conn.fetch, *args, **kwargs)
+
+    async def fetchrow(self, *args, **kwargs):
+        return await self._timed(self._conn.fetchrow, *args, **kwargs)
+
+    async def fetchval(self, *args, **kwargs):
+        return await self._timed(self._conn.fetchval, *args, **kwargs)
+
+
+class AsyncDB:
+    def __init__(self, params_db=None):
+        self.params_db = params_db
+        self._pool = None
+        self._lock = asyncio.Lock()
+
+    async def open(self):
+        if asyncpg is None:
+            raise RuntimeError("asyncpg não instalado: pip install asyncpg")
+
+        async with self._lock:
+            if self._pool is not None:
+                return
+
+            params = self.params_db or get_db_params()
+            self._pool = await asyncpg.create_pool(
+                database=params["dbname"],
+                user=params["user"],
+                password=params["password"],
+                host=params["host"],
+                port=int(params["port"]) if params["port"] else None,
+                min_size=DB_ASYNC_POOL_MIN,
+                max_size=DB_ASYNC_POOL_MAX,
+                # O asyncpg prepara todo comando; atrás de um pgbouncer em modo
+                # transaction o cache precisa ficar desligado, como no pool síncrono
+                statement_cache_size=1024 if PREPARED_STATEMENTS else 0,
+            )
+            logger.info(
+                "Pool assíncrono de conexões criado",
+                extra={"minconn": DB_ASYNC_POOL_MIN, "maxconn": DB_ASYNC_POOL_MAX},
+            )
+
+    async def close(self):
+        async with self._lock:
+            if self._pool is not None:
+                await self._pool.close()
+                self._pool = None
+
+    @asynccontextmanager
+    async def connection(self):
+        # Cria o pool no primeiro uso se o banco estava fora do ar na
+        # inicialização; a conexão volta ao pool sem transação aberta
+        if self._pool is None:
+            await self.open()
+
+        start = time.perf_counter()
+        async with self._pool.acquire(timeout=DB_ASYNC_POOL_TIMEOUT) as conn:
+            record_acquire(time.perf_counter() - start)
+            yield InstrumentedConnection(conn)
+
+    def stats(self) -> Optional[dict]:
+        pool = self._pool
+        if pool is None:
+            return None
+        size = pool.get_size()
+        idle = pool.get_idle_size()
+        return {
+            "min": pool.get_min_size(),
+            "max": pool.get_max_size(),
+            "size": size,
+            "idle": idle,
+            "in_use": size - idle,
+        }
+
+
+_async_db = AsyncDB()
+
+
+def get_async_db() -> AsyncDB:
+    # Um pool por processo, aberto e fechado pelo lifespan do app
+    return _async_db
@@ -0,0 +1,109 @@
+import logging
+from functools import wraps
+from starlette.responses import Response
+from werkzeug.http import parse_etags, quote_etag
+from api.asgi.repository import get_versions
+from api.asgi.responses import json_response
+from api.middlewares.etag_middleware import CACHE_CONTROL, etag_for
+from api.middlewares.logging_middleware import REQUEST_ID_HEADER, log_access, new_request_id
+from api.middlewares.metrics_middleware import server_timing
+from api.tools.logs import request_id
+from api.tools.metrics import RequestMetrics, current_request, registry
+from api.tools.token import validate_token
+
+logger = logging.getLogger(__name__)
+
+
+def observed(rule: str):
+    # Equivale aos hooks de métricas e de logs do Flask: X-Request-ID, log de
+    # acesso, Server-Timing e histogramas do /metrics. O rótulo é a regra da
+    # rota Flask equivalente, então as duas somam nas mesmas séries
+    def decorator(f):
+        @wraps(f)
+        async def decorated(request):
+            rid = new_request_id(request.headers.get(REQUEST_ID_HEADER))
+            rid_token = request_id.set(rid)
+            metrics = RequestMetrics()
+            metrics_token = current_request.set(metrics)
+
+            try:
+                response = await f(request)
+
+                elapsed = metrics.elapsed()
+                registry.observe_request(request.method, rule, response.status_code, metrics, elapsed)
+                response.headers["Server-Timing"] = server_timing(metrics, elapsed)
+                response.headers[REQUEST_ID_HEADER] = rid
+                log_access(request.method, request.url.path, response.status_code, elapsed * 1000)
+                return response
+            finally:
+                current_request.reset(metrics_token)
+                request_id.reset(rid_token)
+
+        return decorated
+
+    return decorator
+
+
+def require_auth(f):
+    # Mesmas mensagens e códigos do require_auth do Flask; o payload fica
+    # em request.state.user
+    @wraps(f)
+    async def decorated(request):
+        auth_header = request.headers.get('Authorization')
+
+        if not auth_header:
+            return json_response({"error": "Token de acesso não fornecido"}, 401)
+
+        try:
+            # Verifica se o header começa com "Bearer "
+            if not auth_header.startswith('Bearer '):
+                return json_response({"error": "Formato de token inválido"}, 401)
+
+            # Extrai e valida o token
+            token = auth_header.split(' ')[1]
+            payload = validate_token(token)
+            if not payload:
+                return json_response({"error": "Token inválido ou expirado"}, 401)
+
+            request.state.user = payload
+
+        except Exception:
+            logger.warning("Erro ao validar token", exc_info=True)
+            return json_response({"error": "Erro ao validar token"}, 401)
+
+        return await f(request)
+
+    return decorated
+
+
+def conditional_get(*resources):
+    # Deve vir depois do require_auth; gera o mesmo ETag do app Flask para
+    # a mesma URL, então os dois podem atender o mesmo cliente
+    def decorator(f):
+        @wraps(f)
+        async def decorated(request):
+            user_id = request.state.user["id"]
+            full_path = f"{request.url.path}?{request.url.query}"
+
+            try:
+                etag = etag_for(user_id, full_path, await get_versions(user_id, resources))
+            except Exception:
+                logger.warning("Falha ao consultar versões dos dados", exc_info=True)
+                return await f(request)
+
+            # ETag fraco: a comparação com If-None-Match também é fraca
+            if parse_etags(request.headers.get("If-None-Match")).contains_weak(etag):
+                response = Response(status_code=304)
+            else:
+                response = await f(request)
+                if response.status_code != 200:
+                    return response
+
+            response.headers["ETag"] = quote_etag(etag, weak=True)
+            response.headers["Cache-Control"] = CACHE_CONTROL
+            response.headers["Vary"] = "Authorization"
+            return response
+
+        return decorated
+
+    return decorator
@@ -0,0 +1,112 @@
+from api.asgi.db import get_async_db
+from api.controllers.balance_controller import BALANCE_QUERY, RECORD_ENTRY, STATEMENT_KINDS, UPSERT_BALANCE
+from api.controllers.monthly_totals_controller import UPSERT_MONTHS, month_rows
+from api.controllers.version_controller import VERSIONS_QUERY
+from api.repositories.transaction_repository import TransactionRepository, as_row
+from api.tools.cache import CACHE_BACKEND, get_read_cache
+from api.tools.db import to_positional
+from starlette.concurrency import run_in_threadpool
+from datetime import date
+from decimal import Decimal
+from typing import Optional, Dict, Iterable, Tuple
+
+
+async def invalidate(user_id: int):
+    # No redis o INCR é uma ida à rede: sai do event loop
+    if CACHE_BACKEND == "redis":
+        await run_in_threadpool(get_read_cache().invalidate, user_id)
+    else:
+        get_read_cache().invalidate(user_id)
+
+
+async def get_versions(user_id: int, resources: Iterable[str]) -> Dict[str, int]:
+    resources = list(resources)
+
+    async with get_async_db().connection() as conn:
+        rows = await conn.fetch(to_positional(VERSIONS_QUERY), user_id, resources)
+
+    # Recursos ainda sem escrita registrada estão na versão 0
+    versions = dict(rows)
+    return {resource: versions.get(resource, 0) for resource in resources}
+
+
+async def get_balance(user_id: int) -> Dict:
+    async with get_async_db().connection() as conn:
+        value = await conn.fetchval(to_positional(BALANCE_QUERY), user_id)
+
+    return {"value": value if value is not None else Decimal("0.00")}
+
+
+class AsyncTransactionRepository:
+    # Mesmos comandos do TransactionRepository, executados pelo asyncpg.
+    # Só cobre as rotas quentes; as demais seguem no app Flask
+    def __init__(self, repository: TransactionRepository):
+        self.repository = repository
+        self.db = get_async_db()
+
+    async def create(
+        self,
+        user_id: int,
+        title: str,
+        description: Optional[str],
+        value: Decimal,
+        transaction_date: date,
+    ) -> dict:
+        repository = self.repository
+        statement_type, id_column, sign = STATEMENT_KINDS[repository.kind]
+
+        async with self.db.connection() as conn:
+            async with conn.transaction():
+                item = as_row(await conn.fetchrow(
+                    to_positional(repository.create_statement()),
+                    user_id, title, description, value, transaction_date,
+                ))
+
+                # Saldo, extrato e totais mensais na mesma transação, como no
+                # BalanceController.record e no MonthlyTotalsController.record
+                delta = sign * item["value"]
+                if delta:
+                    balance = await conn.fetchval(to_positional(UPSERT_BALANCE), user_id, delta)
+                    await conn.execute(
+                        to_positional(RECORD_ENTRY.format(id_column=id_column)),
+                        delta, delta, user_id, item["transaction_date"],
+                        user_id, statement_type, item["id"], delta, item["transaction_date"],
+                        balance,
+                    )
+
+                rows = month_rows(
+                    user_id, repository.kind, [(item["transaction_date"], item["value"], 1)]
+                )
+                if rows:
+                    await conn.executemany(
+                        to_positional(UPSERT_MONTHS.format(values="VALUES (%s, %s, %s, %s, %s)")),
+                        rows,
+                    )
+
+        await invalidate(user_id)
+        return item
+
+    async def list_page(
+        self,
+        user_id: int,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        page: int = 1,
+        page_size: int = 20,
+        include_total: bool = True,
+        cursor: Optional[Tuple[date, int]] = None,
+    ) -> Dict[str, any]:
+        query, params = self.repository.list_statement(
+            user_id, start_date, end_date, page, page_size, include_total, cursor
+        )
+
+        async with self.db.connection() as conn:
+            rows = await conn.fetch(to_positional(query), *params)
+
+        return self.repository.list_result(rows, page, page_size, include_total, cursor)
+
+    async def get(self, user_id: int, item_id: int) -> Optional[Dict]:
+        async with self.db.connection() as conn:
+            row = await conn.fetchrow(to_positional(self.repository.get_statement()), item_id, user_id)
+
+        return as_row(row)
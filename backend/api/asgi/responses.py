@@ -0,0 +1,7 @@
+from starlette.responses import Response
+from api.tools.json_provider import dumps
+
+
+def json_response(obj, status_code: int = 200) -> Response:
+    # Mesmo encoder e mesmo corpo (com a quebra de linha final) do jsonify
+    return Response(dumps(obj) + b"\n", status_code=status_code, media_type="application/json")
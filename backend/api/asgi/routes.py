@@ -0,0 +1,186 @@
+import logging
+from starlette.routing import Route
+from api.asgi.db import get_async_db
+from api.asgi.middlewares import conditional_get, observed, require_auth
+from api.asgi.repository import AsyncTransactionRepository, get_balance
+from api.asgi.responses import json_response
+from api.controllers.cost_controller import CostController
+from api.controllers.receivement_controller import ReceivementController
+from api.dtos.cost_dto import CreateCostDTO, GetCostsDTO
+from api.dtos.receivement_dto import CreateReceivementDTO, GetReceivementsDTO
+from api.tools.cursor import decode_cursor
+from api.tools.pagination import pagination_links
+from pydantic import ValidationError
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+
+def int_arg(args, name: str, default: int) -> int:
+    # Como request.args.get(..., type=int): valores inválidos usam o padrão
+    try:
+        return int(args[name])
+    except (KeyError, ValueError):
+        return default
+
+
+def route(path: str, endpoint, methods: list, rule: str = None) -> Route:
+    return Route(path, observed(rule or path)(endpoint), methods=methods)
+
+
+async def healthcheck(request):
+    return json_response({"status": "ok"})
+
+
+async def healthcheck_db(request):
+    try:
+        # Empresta uma conexão para validar o banco e devolve as estatísticas do pool
+        db = get_async_db()
+        async with db.connection() as conn:
+            await conn.fetchval("SELECT 1")
+
+        return json_response({"status": "ok", "pool": db.stats()})
+
+    except Exception:
+        logger.warning("Banco de dados indisponível", exc_info=True)
+        return json_response({"status": "error"}, 503)
+
+
+@require_auth
+@conditional_get("costs", "receivements")
+async def balance(request):
+    try:
+        # Saldo materializado, sem percorrer o histórico
+        return json_response(await get_balance(request.state.user["id"]))
+
+    except Exception:
+        logger.exception("Erro não tratado em get_balance")
+        return json_response({"error": "Erro interno do servidor"}, 500)
+
+
+def transaction_routes(path: str, name: str, repository: AsyncTransactionRepository, create_dto, get_dto):
+    # Listagem, detalhe e criação de costs/receivements, com os mesmos DTOs,
+    # parâmetros e respostas das rotas Flask equivalentes
+    resource = path.strip("/")
+
+    @require_auth
+    async def create(request):
+        try:
+            data = await request.json()
+            # Valida os dados recebidos usando o DTO
+            item_data = create_dto(**data)
+
+            item = await repository.create(
+                user_id=request.state.user["id"],
+                title=item_data.title,
+                description=item_data.description,
+                value=item_data.value,
+                transaction_date=item_data.transaction_date,
+            )
+
+            return json_response(item, 201)
+
+        except ValidationError as e:
+            return json_response({"error": "Dados inválidos", "details": e.errors()}, 400)
+        except ValueError as e:
+            return json_response({"error": str(e)}, 400)
+        except Exception:
+            logger.exception(f"Erro não tratado em create_{name}")
+            return json_response({"error": "Erro interno do servidor"}, 500)
+
+    @require_auth
+    @conditional_get(resource)
+    async def list_items(request):
+        try:
+            args = request.query_params
+            start_date = args.get("start_date")
+            end_date = args.get("end_date")
+
+            params = {
+                "page": int_arg(args, "page", 1),
+                "page_size": int_arg(args, "page_size", 20),
+            }
+
+            include_total = args.get("include_total")
+            if include_total is not None:
+                params["include_total"] = include_total
+
+            cursor = args.get("cursor")
+            if cursor:
+                params["cursor"] = cursor
+
+            if start_date:
+                params["start_date"] = datetime.strptime(start_date, "%Y-%m-%d").date()
+            if end_date:
+                params["end_date"] = datetime.strptime(end_date, "%Y-%m-%d").date()
+
+            # Valida os parâmetros usando o DTO
+            query_params = get_dto(**params)
+            query_params.validate_dates()
+
+            result = await repository.list_page(
+                user_id=request.state.user["id"],
+                start_date=query_params.start_date,
+                end_date=query_params.end_date,
+                page=query_params.page,
+                page_size=query_params.page_size,
+                include_total=query_params.include_total,
+                cursor=decode_cursor(query_params.cursor) if query_params.cursor else None,
+            )
+
+            # Adiciona links de paginação
+            result["links"] = pagination_links(
+                str(request.url.replace(query="")),
+                result["pagination"],
+                cursor_mode=bool(query_params.cursor),
+                include_total=query_params.include_total,
+                filters={"start_date": start_date, "end_date": end_date},
+            )
+
+            return json_response(result)
+
+        except ValidationError as e:
+            return json_response({"error": "Dados inválidos", "details": e.errors()}, 400)
+        except ValueError as e:
+            return json_response({"error": str(e)}, 400)
+        except Exception:
+            logger.exception(f"Erro não tratado em get_{resource}")
+            return json_response({"error": "Erro interno do servidor"}, 500)
+
+    @require_auth
+    @conditional_get(resource)
+    async def detail(request):
+        try:
+            item = await repository.get(request.state.user["id"], request.path_params["item_id"])
+
+            if not item:
+                return json_response({"error": repository.repository.not_found}, 404)
+
+            return json_response(item)
+
+        except Exception:
+            logger.exception(f"Erro não tratado em get_{name}_by_id")
+            return json_response({"error": "Erro interno do servidor"}, 500)
+
+    return [
+        route(path, create, ["POST"]),
+        route(path, list_items, ["GET"]),
+        route(f"{path}/{{item_id:int}}", detail, ["GET"], rule=f"{path}/<int:{name}_id>"),
+    ]
+
+
+routes = [
+    route("/healthcheck", healthcheck, ["GET"]),
+    route("/healthcheck/db", healthcheck_db, ["GET"]),
+    route("/balance", balance, ["GET"]),
+    *transaction_routes(
+        "/costs", "cost",
+        AsyncTransactionRepository(CostController().repository),
+        CreateCostDTO, GetCostsDTO,
+    ),
+    *transaction_routes(
+        "/receivements", "receivement",
+        AsyncTransactionRepository(ReceivementController().repository),
+        CreateReceivementDTO, GetReceivementsDTO,
+    ),
+]
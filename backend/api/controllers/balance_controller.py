@@ -0,0 +1,245 @@
+from api.tools.db import DB, as_dicts, execute_prepared
+from api.tools.cursor import encode_cursor
+from psycopg2.extras import execute_values
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Optional, Dict, List, Tuple
+
+
+# Tipo do extrato e efeito no saldo de cada tipo de lançamento
+STATEMENT_KINDS = {
+    "cost": ("C", "cost_id", Decimal("-1")),
+    "receivement": ("R", "receivement_id", Decimal("1")),
+}
+
+# O upsert trava a linha do saldo do usuário até o commit, serializando
+# escritas concorrentes sem perder atualizações. Roda num comando próprio:
+# o seguinte já enxerga tudo o que foi commitado antes da trava
+UPSERT_BALANCE = """
+    INSERT INTO balances (user_id, value)
+    VALUES (%s, %s)
+    ON CONFLICT (user_id) DO UPDATE
+    SET value = balances.value + EXCLUDED.value
+    RETURNING value
+"""
+
+# O extrato segue a data do lançamento, como no rebuild: a linha nova entra
+# depois das linhas da mesma data e as de datas posteriores recebem o delta.
+# O último parâmetro é o saldo já atualizado. Os casts tipam os parâmetros
+# quando o comando é preparado (asyncpg)
+RECORD_ENTRY = """
+    WITH later AS (
+        UPDATE statements
+        SET previous_balance = previous_balance + %s,
+            updated_balance = updated_balance + %s
+        WHERE user_id = %s AND transaction_date > %s::date
+        RETURNING updated_balance - previous_balance AS delta
+    )
+    INSERT INTO statements (user_id, type, {id_column}, previous_balance, updated_balance, transaction_date)
+    SELECT %s::int4, %s::varchar, %s::int4, balance - %s, balance, %s::date
+    FROM (SELECT %s::numeric - COALESCE(SUM(delta), 0) AS balance FROM later) AS s
+"""
+
+# Refaz a sequência de saldos a partir de uma data, de trás para frente:
+# cada linha vale o saldo atual menos as variações posteriores a ela
+RESEQUENCE = """
+    UPDATE statements AS s
+    SET previous_balance = r.balance - r.delta, updated_balance = r.balance
+    FROM (
+        SELECT id, updated_balance - previous_balance AS delta,
+               %s::numeric - COALESCE(SUM(updated_balance - previous_balance) OVER (
+                   ORDER BY transaction_date DESC, id DESC
+                   ROWS BETWEEN UNBOUNDED PRECEDING AND 1 PRECEDING
+               ), 0) AS balance
+        FROM statements
+        WHERE user_id = %s AND transaction_date >= %s::date
+    ) AS r
+    WHERE s.id = r.id
+"""
+
+BALANCE_QUERY = "SELECT value FROM balances WHERE user_id = %s"
+
+
+class BalanceController:
+    def __init__(self):
+        self.db = DB()
+
+    def record(
+        self,
+        cur,
+        user_id: int,
+        kind: str,
+        entries: List[Tuple[Optional[int], Decimal, date]],
+    ) -> Optional[Decimal]:
+        # Registra a variação de valor de lançamentos (novo - antigo) na data
+        # de cada um, no saldo e no extrato, usando o cursor da transação de
+        # quem chamou
+        statement_type, id_column, sign = STATEMENT_KINDS[kind]
+        entries = [
+            (item_id, sign * delta, transaction_date)
+            for item_id, delta, transaction_date in entries if delta
+        ]
+
+        if not entries:
+            return None
+
+        total = sum(delta for _, delta, _ in entries)
+        cur.execute(UPSERT_BALANCE, (user_id, total))
+        updated_balance = cur.fetchone()[0]
+
+        if len(entries) == 1:
+            item_id, delta, transaction_date = entries[0]
+            cur.execute(
+                RECORD_ENTRY.format(id_column=id_column),
+                (
+                    delta, delta, user_id, transaction_date,
+                    user_id, statement_type, item_id, delta, transaction_date,
+                    updated_balance,
+                ),
+            )
+            return updated_balance
+
+        # Várias linhas: entram com a própria variação e os saldos são
+        # refeitos a partir da data mais antiga do lote
+        execute_values(
+            cur,
+            f"""
+            INSERT INTO statements (user_id, type, {id_column}, previous_balance, updated_balance, transaction_date)
+            VALUES %s
+            """,
+            [
+                (user_id, statement_type, item_id, 0, delta, transaction_date)
+                for item_id, delta, transaction_date in entries
+            ],
+        )
+        cur.execute(
+            RESEQUENCE,
+            (updated_balance, user_id, min(transaction_date for _, _, transaction_date in entries)),
+        )
+        return updated_balance
+
+    def get_balance(self, user_id: int) -> Dict:
+        with self.db.connection() as conn:
+            with conn.cursor() as cur:
+                execute_prepared(cur, BALANCE_QUERY, (user_id,))
+                row = cur.fetchone()
+
+        return {"value": row[0] if row else Decimal("0.00")}
+
+    def get_statements(
+        self,
+        user_id: int,
+        page_size: int = 20,
+        cursor: Optional[Tuple[datetime, int]] = None,
+    ) -> Dict[str, any]:
+        with self.db.connection() as conn:
+            with conn.cursor() as cur:
+                query = """
+                    SELECT id, type, cost_id, receivement_id,
+                           previous_balance, updated_balance, transaction_date
+                    FROM statements
+                    WHERE user_id = %s
+                """
+                params = [user_id]
+
+                if cursor:
+                    # Keyset: continua logo após o último item entregue
+                    query += " AND (transaction_date, id) < (%s, %s)"
+                    params.extend(cursor)
+
+                query += """
+                    ORDER BY transaction_date DESC, id DESC
+                    LIMIT %s
+                """
+                params.append(page_size + 1)
+
+                cur.execute(query, params)
+                rows = as_dicts(cur, cur.fetchall())
+
+        has_next = len(rows) > page_size
+        statements = []
+        for statement in rows[:page_size]:
+            statement["value"] = statement["updated_balance"] - statement["previous_balance"]
+            statements.append(statement)
+
+        next_cursor = None
+        if has_next:
+            last = statements[-1]
+            next_cursor = encode_cursor(last["transaction_date"], last["id"])
+
+        return {
+            "items": statements,
+            "pagination": {
+                "page_size": page_size,
+                "has_next": has_next,
+                "next_cursor": next_cursor,
+            }
+        }
+
+    def rebuild(self, user_id: Optional[int] = None) -> int:
+        # Recalcula extrato e saldo a partir de todo o histórico de lançamentos,
+        # na mesma ordem das escritas (data do lançamento). Dentro de um dia as
+        # receitas vêm antes dos gastos; o saldo ao fim de cada dia é o mesmo
+        user_filter = ""
+        balance_filter = ""
+        params = []
+        if user_id is not None:
+            user_filter = "WHERE user_id = %s"
+            balance_filter = "WHERE u.id = %s"
+            params = [user_id]
+
+        with self.db.connection() as conn:
+            with conn.cursor() as cur:
+                # Bloqueia novas escritas de saldo; lançamentos ainda não
+                # commitados somam seu delta depois que o rebuild terminar
+                cur.execute("LOCK TABLE balances IN SHARE ROW EXCLUSIVE MODE")
+
+                cur.execute(f"DELETE FROM statements {user_filter}", params)
+                cur.execute(
+                    f"""
+                    INSERT INTO statements (
+                        user_id, type, receivement_id, cost_id,
+                        previous_balance, updated_balance, transaction_date
+                    )
+                    SELECT user_id, type, receivement_id, cost_id,
+                           balance - delta, balance, transaction_date
+                    FROM (
+                        SELECT t.*,
+                               SUM(delta) OVER (
+                                   PARTITION BY user_id
+                                   ORDER BY transaction_date, type DESC, item_id
+                                   ROWS UNBOUNDED PRECEDING
+                               ) AS balance
+                        FROM (
+                            SELECT user_id, 'R' AS type, id AS receivement_id,
+                                   NULL::int4 AS cost_id, id AS item_id,
+                                   value AS delta, transaction_date::timestamp AS transaction_date
+                            FROM receivements
+                            UNION ALL
+                            SELECT user_id, 'C', NULL, id, id,
+                                   -value, transaction_date::timestamp
+                            FROM costs
+                        ) AS t
+                        {user_filter}
+                    ) AS s
+                    ORDER BY user_id, transaction_date, type DESC, item_id
+                    """,
+                    params,
+                )
+                rebuilt = cur.rowcount
+
+                cur.execute(
+                    f"""
+                    INSERT INTO balances (user_id, value)
+                    SELECT u.id,
+                           COALESCE((SELECT SUM(value) FROM receivements r WHERE r.user_id = u.id), 0)
+                           - COALESCE((SELECT SUM(value) FROM costs c WHERE c.user_id = u.id), 0)
+                    FROM users u
+                    {balance_filter}
+                    ON CONFLICT (user_id) DO UPDATE SET value = EXCLUDED.value
+                    """,
+                    params,
+                )
+                conn.commit()
+
+        return rebuilt
@@ -0,0 +1,184 @@
+from api.tools.db import DB
+from psycopg2.extras import execute_values
+from datetime import date
+from decimal import Decimal
+from typing import Optional, Dict, List, Tuple
+
+
+# Totais recalculados a partir dos lançamentos, no formato da monthly_totals
+AGGREGATE_QUERY = """
+    SELECT user_id, date_trunc('month', transaction_date)::date AS month,
+           'cost' AS kind, SUM(value) AS total, COUNT(*) AS count
+    FROM costs
+    {user_filter}
+    GROUP BY 1, 2
+    UNION ALL
+    SELECT user_id, date_trunc('month', transaction_date)::date,
+           'receivement', SUM(value), COUNT(*)
+    FROM receivements
+    {user_filter}
+    GROUP BY 1, 2
+"""
+
+
+# Soma variações aos totais de um mês; {values} é "VALUES %s" no
+# execute_values ou uma linha de parâmetros
+UPSERT_MONTHS = """
+    INSERT INTO monthly_totals (user_id, month, kind, total, count)
+    {values}
+    ON CONFLICT (user_id, month, kind) DO UPDATE
+    SET total = monthly_totals.total + EXCLUDED.total,
+        count = monthly_totals.count + EXCLUDED.count
+"""
+
+
+def month_rows(user_id: int, kind: str, entries: List[Tuple[date, Decimal, int]]) -> List[tuple]:
+    # Agrupa variações (data, valor, quantidade) por mês. Uma alteração que
+    # troca o mês entra como saída do mês antigo e entrada no novo; no mesmo
+    # mês as duas se compensam e sobra só a diferença de valor
+    months = {}
+    for transaction_date, delta, count in entries:
+        month = transaction_date.replace(day=1)
+        total, quantity = months.get(month, (Decimal("0"), 0))
+        months[month] = (total + delta, quantity + count)
+
+    # Meses em ordem: escritas concorrentes travam as linhas na mesma sequência
+    return [
+        (user_id, month, kind, total, quantity)
+        for month, (total, quantity) in sorted(months.items())
+        if total or quantity
+    ]
+
+
+class MonthlyTotalsController:
+    def __init__(self):
+        self.db = DB()
+
+    def record(
+        self,
+        cur,
+        user_id: int,
+        kind: str,
+        entries: List[Tuple[date, Decimal, int]],
+    ):
+        # Aplica as variações aos totais mensais, usando o cursor da
+        # transação de quem chamou
+        rows = month_rows(user_id, kind, entries)
+
+        if not rows:
+            return
+
+        execute_values(
+            cur,
+            UPSERT_MONTHS.format(values="VALUES %s"),
+            rows,
+            page_size=len(rows),
+        )
+
+    def get_totals(
+        self,
+        cur,
+        user_id: int,
+        start_month: Optional[date] = None,
+        end_month: Optional[date] = None,
+        group_by: str = "month",
+    ) -> List[Tuple[str, Optional[date], bool, Decimal, int]]:
+        # Totais por período e o total geral (bucket nulo) lidos só da tabela
+        # de totais: o custo depende do número de meses, não de lançamentos
+        filters = "user_id = %s AND count <> 0"
+        params = [group_by, user_id]
+
+        if start_month:
+            filters += " AND month >= %s"
+            params.append(start_month)
+        if end_month:
+            filters += " AND month <= %s"
+            params.append(end_month)
+
+        cur.execute(
+            f"""
+            SELECT CASE kind WHEN 'receivement' THEN 'income' ELSE 'expenses' END,
+                   bucket, GROUPING(bucket) = 1,
+                   COALESCE(SUM(total), 0), COALESCE(SUM(count), 0)
+            FROM (
+                SELECT kind, date_trunc(%s, month)::date AS bucket, total, count
+                FROM monthly_totals
+                WHERE {filters}
+            ) AS t
+            GROUP BY GROUPING SETS ((kind, bucket), (kind))
+            """,
+            params,
+        )
+        return cur.fetchall()
+
+    def rebuild(self, user_id: Optional[int] = None) -> int:
+        # Recalcula os totais mensais a partir de todo o histórico de lançamentos
+        user_filter = ""
+        params = []
+        if user_id is not None:
+            user_filter = "WHERE user_id = %s"
+            params = [user_id]
+
+        with self.db.connection() as conn:
+            with conn.cursor() as cur:
+                # Bloqueia novas escritas nos totais; lançamentos ainda não
+                # commitados somam sua variação depois que o rebuild terminar
+                cur.execute("LOCK TABLE monthly_totals IN SHARE ROW EXCLUSIVE MODE")
+
+                cur.execute(f"DELETE FROM monthly_totals {user_filter}", params)
+                cur.execute(
+                    f"""
+                    INSERT INTO monthly_totals (user_id, month, kind, total, count)
+                    {AGGREGATE_QUERY.format(user_filter=user_filter)}
+                    """,
+                    params * 2,
+                )
+                rebuilt = cur.rowcount
+                conn.commit()
+
+        return rebuilt
+
+    def verify(self, user_id: Optional[int] = None) -> List[Dict]:
+        # Compara os totais mantidos com os recalculados; meses zerados
+        # equivalem a meses sem linha
+        user_filter = ""
+        params = []
+        if user_id is not None:
+            user_filter = "WHERE user_id = %s"
+            params = [user_id]
+
+        with self.db.connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    f"""
+                    SELECT COALESCE(m.user_id, a.user_id), COALESCE(m.month, a.month),
+                           COALESCE(m.kind, a.kind),
+                           COALESCE(m.total, 0), COALESCE(m.count, 0),
+                           COALESCE(a.total, 0), COALESCE(a.count, 0)
+                    FROM (
+                        SELECT user_id, month, kind, total, count
+                        FROM monthly_totals
+                        {user_filter}
+                    ) AS m
+                    FULL JOIN ({AGGREGATE_QUERY.format(user_filter=user_filter)}) AS a
+                        ON a.user_id = m.user_id AND a.month = m.month AND a.kind = m.kind
+                    WHERE COALESCE(m.total, 0) <> COALESCE(a.total, 0)
+                       OR COALESCE(m.count, 0) <> COALESCE(a.count, 0)
+                    ORDER BY 1, 2, 3
+                    """,
+                    params * 3,
+                )
+                rows = cur.fetchall()
+
+        return [
+            {
+                "user_id": row_user_id,
+                "month": month,
+                "kind": kind,
+                "stored_total": stored_total,
+                "stored_count": stored_count,
+                "expected_total": expected_total,
+                "expected_count": expected_count,
+            }
+            for row_user_id, month, kind, stored_total, stored_count, expected_total, expected_count in rows
+        ]
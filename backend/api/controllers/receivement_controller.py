@@ -1,14 +1,17 @@
-from api.tools.db import DB
-from psycopg2.extras import DictCursor
+from api.repositories.transaction_repository import TransactionRepository
+from api.tools.cache import cached, invalidates
+from api.tools.exporter import EXPORT_ITERSIZE
 from datetime import date
 from decimal import Decimal
-from typing import Optional, Dict, List
+from typing import Optional, Dict, Iterable, Iterator, List, Tuple
 
 
 class ReceivementController:
     def __init__(self):
-        self.db = DB()
+        # Consultas, transações e efeitos no saldo ficam no repositório
+        self.repository = TransactionRepository("receivements", "receivement", "Recebimento não encontrado")
 
+    @invalidates
     def create_receivement(
         self,
         user_id: int,
@@ -17,30 +20,9 @@ class ReceivementController:
         value: Decimal,
         transaction_date: date,
     ) -> dict:
-        try:
-            conn = self.db.get_connection()
-            with conn.cursor(cursor_factory=DictCursor) as cur:
-                cur.execute(
-                    """
-                    INSERT INTO receivements (user_id, title, description, value, transaction_date)
-                    VALUES (%s, %s, %s, %s, %s)
-                    RETURNING id, title, description, value, transaction_date
-                    """,
-                    (user_id, title, description, value, transaction_date),
-                )
-                new_receivement = cur.fetchone()
-                conn.commit()
-
-                return dict(new_receivement)
-
-        except Exception as e:
-            if conn:
-                conn.rollback()
-            raise e
-        finally:
-            if conn:
-                self.db.close_connection()
+        return self.repository.create(user_id, title, description, value, transaction_date)
 
+    @cached("receivements", "receivements")
     def get_receivements(
         self,
         user_id: int,
@@ -48,98 +30,18 @@ class ReceivementController:
         end_date: Optional[date] = None,
         page: int = 1,
         page_size: int = 20,
+        include_total: bool = True,
+        cursor: Optional[Tuple[date, int]] = None,
     ) -> Dict[str, any]:
-        try:
-            conn = self.db.get_connection()
-            with conn.cursor(cursor_factory=DictCursor) as cur:
-                # Monta a query base
-                query = """
-                    SELECT id, title, description, value, transaction_date
-                    FROM receivements
-                    WHERE user_id = %s
-                """
-                params = [user_id]
-
-                # Adiciona filtros de data se fornecidos
-                if start_date:
-                    query += " AND transaction_date >= %s"
-                    params.append(start_date)
-                if end_date:
-                    query += " AND transaction_date <= %s"
-                    params.append(end_date)
-
-                # Adiciona ordenação e paginação
-                query += """
-                    ORDER BY transaction_date DESC
-                    LIMIT %s OFFSET %s
-                """
-                offset = (page - 1) * page_size
-                params.extend([page_size, offset])
-
-                # Executa a query principal
-                cur.execute(query, params)
-                receivements = [dict(row) for row in cur.fetchall()]
-
-                # Conta o total de registros para calcular a paginação
-                count_query = """
-                    SELECT COUNT(*)
-                    FROM receivements
-                    WHERE user_id = %s
-                """
-                count_params = [user_id]
-
-                if start_date:
-                    count_query += " AND transaction_date >= %s"
-                    count_params.append(start_date)
-                if end_date:
-                    count_query += " AND transaction_date <= %s"
-                    count_params.append(end_date)
-
-                cur.execute(count_query, count_params)
-                total_items = cur.fetchone()[0]
-                total_pages = (total_items + page_size - 1) // page_size
-
-                return {
-                    "items": receivements,
-                    "pagination": {
-                        "page": page,
-                        "page_size": page_size,
-                        "total_items": total_items,
-                        "total_pages": total_pages
-                    }
-                }
-
-        except Exception as e:
-            raise e
-        finally:
-            if conn:
-                self.db.close_connection()
+        return self.repository.list_page(
+            user_id, start_date, end_date, page, page_size, include_total, cursor
+        )
 
+    @cached("receivement", "receivements")
     def get_receivement_by_id(self, user_id: int, receivement_id: int) -> Optional[Dict]:
-        try:
-            conn = self.db.get_connection()
-            with conn.cursor(cursor_factory=DictCursor) as cur:
-                cur.execute(
-                    """
-                    SELECT id, title, description, value, transaction_date
-                    FROM receivements
-                    WHERE id = %s AND user_id = %s
-                    """,
-                    (receivement_id, user_id)
-                )
-                receivement = cur.fetchone()
-                
-                if not receivement:
-                    return None
-
-                return dict(receivement)
-
-        except Exception as e:
-            raise e
-        finally:
-            if conn:
-                self.db.close_connection()
+        return self.repository.get(user_id, receivement_id)
 
+    @invalidates
     def update_receivement(
         self,
         user_id: int,
@@ -149,120 +51,34 @@ class ReceivementController:
         value: Decimal,
         transaction_date: date,
     ) -> Optional[Dict]:
-        try:
-            conn = self.db.get_connection()
-            with conn.cursor(cursor_factory=DictCursor) as cur:
-                # Verifica se o recebimento existe e pertence ao usuário
-                cur.execute(
-                    "SELECT id FROM receivements WHERE id = %s AND user_id = %s",
-                    (receivement_id, user_id)
-                )
-                if not cur.fetchone():
-                    return None
+        return self.repository.update(user_id, receivement_id, title, description, value, transaction_date)
 
-                # Atualiza o recebimento
-                cur.execute(
-                    """
-                    UPDATE receivements
-                    SET title = %s,
-                        description = %s,
-                        value = %s,
-                        transaction_date = %s
-                    WHERE id = %s AND user_id = %s
-                    RETURNING id, title, description, value, transaction_date
-                    """,
-                    (title, description, value, transaction_date, receivement_id, user_id)
-                )
-                updated_receivement = cur.fetchone()
-                conn.commit()
+    @invalidates
+    def patch_receivement(self, user_id: int, receivement_id: int, updates: Dict) -> Optional[Dict]:
+        return self.repository.patch(user_id, receivement_id, updates)
 
-                return dict(updated_receivement)
+    @invalidates
+    def delete_receivement(self, user_id: int, receivement_id: int) -> bool:
+        return self.repository.delete(user_id, receivement_id)
 
-        except Exception as e:
-            if conn:
-                conn.rollback()
-            raise e
-        finally:
-            if conn:
-                self.db.close_connection()
+    @invalidates
+    def import_receivements(self, user_id: int, batches: Iterable[List[Tuple[int, any]]]) -> int:
+        return self.repository.import_rows(user_id, batches)
 
-    def patch_receivement(
+    def export_receivements(
         self,
         user_id: int,
-        receivement_id: int,
-        updates: Dict
-    ) -> Optional[Dict]:
-        try:
-            conn = self.db.get_connection()
-            with conn.cursor(cursor_factory=DictCursor) as cur:
-                # Verifica se o recebimento existe e pertence ao usuário
-                cur.execute(
-                    "SELECT * FROM receivements WHERE id = %s AND user_id = %s",
-                    (receivement_id, user_id)
-                )
-                current_receivement = cur.fetchone()
-                if not current_receivement:
-                    return None
-
-                # Monta a query de atualização dinamicamente
-                update_fields = []
-                params = []
-                for key, value in updates.items():
-                    if value is not None:
-                        update_fields.append(f"{key} = %s")
-                        params.append(value)
-
-                if not update_fields:
-                    return dict(current_receivement)
-
-                # Adiciona os parâmetros restantes
-                params.extend([receivement_id, user_id])
-
-                # Executa a atualização
-                query = f"""
-                    UPDATE receivements
-                    SET {", ".join(update_fields)}
-                    WHERE id = %s AND user_id = %s
-                    RETURNING id, title, description, value, transaction_date
-                """
-                cur.execute(query, params)
-                updated_receivement = cur.fetchone()
-                conn.commit()
-
-                return dict(updated_receivement)
-
-        except Exception as e:
-            if conn:
-                conn.rollback()
-            raise e
-        finally:
-            if conn:
-                self.db.close_connection()
-
-    def delete_receivement(self, user_id: int, receivement_id: int) -> bool:
-        try:
-            conn = self.db.get_connection()
-            with conn.cursor() as cur:
-                # Verifica se o recebimento existe e pertence ao usuário
-                cur.execute(
-                    "SELECT id FROM receivements WHERE id = %s AND user_id = %s",
-                    (receivement_id, user_id)
-                )
-                if not cur.fetchone():
-                    return False
-
-                # Remove o recebimento
-                cur.execute(
-                    "DELETE FROM receivements WHERE id = %s AND user_id = %s",
-                    (receivement_id, user_id)
-                )
-                conn.commit()
-                return True
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        itersize: int = EXPORT_ITERSIZE,
+    ) -> Iterator[tuple]:
+        return self.repository.export(user_id, start_date, end_date, itersize)
 
-        except Exception as e:
-            if conn:
-                conn.rollback()
-            raise e
-        finally:
-            if conn:
-                self.db.close_connection() 
\ No newline at end of file
+    @invalidates
+    def batch_receivements(
+        self,
+        user_id: int,
+        operations: List[Tuple[int, str, Optional[int], any]],
+        atomic: bool = False,
+    ) -> Tuple[Dict[int, dict], bool]:
+        return self.repository.batch(user_id, operations, atomic)
@@ -0,0 +1,115 @@
+from api.tools.db import DB
+from api.controllers.monthly_totals_controller import MonthlyTotalsController
+from api.tools.cache import cached
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Optional, Dict
+
+
+# Agrupamentos atendidos pelos totais mensais
+ROLLUP_GROUPS = ("month", "year")
+
+
+def covers_whole_months(start_date: Optional[date], end_date: Optional[date]) -> bool:
+    # Os totais mensais só respondem períodos que começam no dia 1
+    # e terminam no último dia de um mês
+    if start_date and start_date.day != 1:
+        return False
+    if end_date and (end_date + timedelta(days=1)).day != 1:
+        return False
+    return True
+
+
+class SummaryController:
+    def __init__(self):
+        self.db = DB()
+        self.monthly_totals = MonthlyTotalsController()
+
+    @cached("summary", "costs", "receivements")
+    def get_summary(
+        self,
+        user_id: int,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        group_by: str = "month",
+    ) -> Dict[str, any]:
+        # Filtros de data aplicados às duas tabelas
+        filters = "user_id = %s"
+        filter_params = [user_id]
+
+        if start_date:
+            filters += " AND transaction_date >= %s"
+            filter_params.append(start_date)
+        if end_date:
+            filters += " AND transaction_date <= %s"
+            filter_params.append(end_date)
+
+        # Uma agregação por tabela, na mesma ida ao banco: o GROUPING SETS
+        # devolve os totais por período e o total geral (bucket nulo)
+        aggregate = """
+            SELECT %s AS kind, bucket, GROUPING(bucket) = 1 AS is_total,
+                   COALESCE(SUM(value), 0) AS total, COUNT(value) AS count
+            FROM (
+                SELECT date_trunc(%s, transaction_date::timestamp)::date AS bucket, value
+                FROM {table}
+                WHERE {filters}
+            ) AS t
+            GROUP BY GROUPING SETS ((bucket), ())
+        """
+
+        with self.db.connection() as conn:
+            with conn.cursor() as cur:
+                if group_by in ROLLUP_GROUPS and covers_whole_months(start_date, end_date):
+                    # Relatórios por mês ou ano leem apenas os totais mensais
+                    rows = self.monthly_totals.get_totals(cur, user_id, start_date, end_date, group_by)
+                else:
+                    cur.execute(
+                        aggregate.format(table="receivements", filters=filters)
+                        + " UNION ALL "
+                        + aggregate.format(table="costs", filters=filters),
+                        [
+                            "income", group_by, *filter_params,
+                            "expenses", group_by, *filter_params,
+                        ],
+                    )
+                    rows = cur.fetchall()
+
+        totals = {
+            "income": Decimal("0"),
+            "expenses": Decimal("0"),
+            "income_count": 0,
+            "expenses_count": 0,
+        }
+        buckets = {}
+
+        for kind, period, is_total, total, count in rows:
+            if is_total:
+                totals[kind] = total
+                totals[f"{kind}_count"] = count
+                continue
+
+            bucket = buckets.setdefault(period, {
+                "period": period,
+                "income": Decimal("0"),
+                "expenses": Decimal("0"),
+                "income_count": 0,
+                "expenses_count": 0,
+            })
+            bucket[kind] = total
+            bucket[f"{kind}_count"] = count
+
+        totals["net"] = totals["income"] - totals["expenses"]
+
+        series = []
+        for period in sorted(buckets):
+            bucket = buckets[period]
+            bucket["net"] = bucket["income"] - bucket["expenses"]
+            series.append(bucket)
+
+        return {
+            "start_date": start_date,
+            "end_date": end_date,
+            "group_by": group_by,
+            "totals": totals,
+            "buckets": series,
+        }
@@ -0,0 +1,83 @@
+from api.repositories.merged_transaction_repository import TRANSACTION_TABLES, MergedTransactionRepository
+from api.tools.cache import cached
+from api.tools.cursor import encode_cursor
+from datetime import date
+from decimal import Decimal
+from typing import Optional, Dict, Tuple
+
+
+COLUMNS = ("id", "kind", "title", "description", "value", "transaction_date")
+
+
+class TransactionController:
+    def __init__(self):
+        # A consulta mesclada fica no repositório
+        self.repository = MergedTransactionRepository()
+
+    @cached("transactions", "costs", "receivements")
+    def get_transactions(
+        self,
+        user_id: int,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        kind: Optional[str] = None,
+        page: int = 1,
+        page_size: int = 20,
+        include_total: bool = True,
+        cursor: Optional[Tuple[date, int, str]] = None,
+    ) -> Dict[str, any]:
+        rows = self.repository.list_rows(
+            user_id,
+            (kind,) if kind else tuple(TRANSACTION_TABLES),
+            start_date=start_date,
+            end_date=end_date,
+            page=page,
+            page_size=page_size,
+            include_total=include_total,
+            cursor=cursor,
+        )
+
+        transactions = []
+        sums = {}
+        for row_type, *row, count in rows:
+            if row_type == "total":
+                sums[row[1]] = (row[4], count)
+            else:
+                transactions.append(dict(zip(COLUMNS, row)))
+
+        has_next = len(transactions) > page_size
+        transactions = transactions[:page_size]
+
+        next_cursor = None
+        if has_next:
+            last = transactions[-1]
+            next_cursor = encode_cursor(last["transaction_date"], last["id"], last["kind"])
+
+        totals = None
+        total_items = None
+        total_pages = None
+        if include_total:
+            income, income_count = sums.get("receivement", (Decimal("0"), 0))
+            expenses, expenses_count = sums.get("cost", (Decimal("0"), 0))
+            totals = {
+                "income": income,
+                "expenses": expenses,
+                "net": income - expenses,
+                "income_count": income_count,
+                "expenses_count": expenses_count,
+            }
+            total_items = income_count + expenses_count
+            total_pages = (total_items + page_size - 1) // page_size
+
+        return {
+            "items": transactions,
+            "totals": totals,
+            "pagination": {
+                "page": None if cursor else page,
+                "page_size": page_size,
+                "total_items": total_items,
+                "total_pages": total_pages,
+                "has_next": has_next,
+                "next_cursor": next_cursor,
+            }
+        }
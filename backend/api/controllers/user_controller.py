@@ -1,7 +1,13 @@
-from api.tools.db import DB
-from api.tools.password import hash_password, check_password
-from api.tools.token import generate_token
-from psycopg2.extras import DictCursor
+from api.tools.db import DB, as_dict
+from api.tools.password import hash_password, check_password, check_dummy_password, needs_rehash, PasswordHasherBusy
+from api.tools.token import (
+    ACCESS_TOKEN_EXPIRATION,
+    REFRESH_TOKEN_EXPIRATION,
+    generate_refresh_token,
+    generate_token,
+    hash_refresh_token,
+)
+import secrets
 
 
 class UserController:
@@ -9,12 +15,11 @@ class UserController:
         self.db = DB()
 
     def create_user(self, name: str, email: str, password: str) -> dict:
-        try:
-            # Criptografa a senha usando a função do módulo password
-            hashed_password = hash_password(password)
+        # Criptografa a senha usando a função do módulo password
+        hashed_password = hash_password(password)
 
-            conn = self.db.get_connection()
-            with conn.cursor(cursor_factory=DictCursor) as cur:
+        with self.db.connection() as conn:
+            with conn.cursor() as cur:
                 # Verifica se o email já existe
                 cur.execute("SELECT id FROM users WHERE email = %s", (email,))
                 if cur.fetchone():
@@ -25,49 +30,155 @@ class UserController:
                     "INSERT INTO users (name, email, password) VALUES (%s, %s, %s) RETURNING id, name, email",
                     (name, email, hashed_password),
                 )
-                new_user = cur.fetchone()
+                new_user = as_dict(cur, cur.fetchone())
                 conn.commit()
 
-                return dict(new_user)
-
-        except Exception as e:
-            if conn:
-                conn.rollback()
-            raise e
-        finally:
-            if conn:
-                self.db.close_connection()
+                return new_user
 
     def login(self, email: str, password: str) -> dict:
-        try:
-            conn = self.db.get_connection()
-            with conn.cursor(cursor_factory=DictCursor) as cur:
+        with self.db.connection() as conn:
+            with conn.cursor() as cur:
                 # Busca o usuário pelo email
                 cur.execute(
                     "SELECT id, name, email, password FROM users WHERE email = %s",
                     (email,),
                 )
-                user = cur.fetchone()
-
-                if not user:
-                    raise ValueError("Email ou senha inválidos")
-
-                # Verifica se a senha está correta
-                if not check_password(password, user["password"]):
-                    raise ValueError("Email ou senha inválidos")
-
-                # Gera o token de acesso
-                user_info = {
-                    "id": user["id"],
-                    "name": user["name"],
-                    "email": user["email"],
-                }
-                token = generate_token(user_info)
-
-                return {"access_token": token}
-
-        except Exception as e:
-            raise e
-        finally:
-            if conn:
-                self.db.close_connection()
+                user = as_dict(cur, cur.fetchone())
+
+        # A conexão volta ao pool antes da verificação da senha, que é lenta
+        if not user:
+            # Confere contra um hash fixo: o tempo de resposta não revela se o email existe
+            check_dummy_password(password)
+            raise ValueError("Email ou senha inválidos")
+
+        # Verifica se a senha está correta
+        if not check_password(password, user["password"]):
+            raise ValueError("Email ou senha inválidos")
+
+        # Hashes gerados com custo antigo são refeitos com a senha em mãos
+        if needs_rehash(user["password"]):
+            self._rehash_password(user["id"], user["password"], password)
+
+        # Inicia uma nova família de refresh tokens para esta sessão
+        with self.db.connection() as conn:
+            with conn.cursor() as cur:
+                refresh_token, token_hash = generate_refresh_token()
+                cur.execute(
+                    """
+                    INSERT INTO refresh_tokens (user_id, token_hash, family_id, expires_at)
+                    VALUES (%s, %s, %s, now() + %s * interval '1 second')
+                    """,
+                    (user["id"], token_hash, secrets.token_hex(16), REFRESH_TOKEN_EXPIRATION),
+                )
+                conn.commit()
+
+        return self._token_response(user, refresh_token)
+
+    def refresh(self, refresh_token: str) -> dict:
+        token_hash = hash_refresh_token(refresh_token)
+
+        with self.db.connection() as conn:
+            with conn.cursor() as cur:
+                # Revoga o token apresentado; só um refresh concorrente vence
+                cur.execute(
+                    """
+                    UPDATE refresh_tokens AS rt
+                    SET revoked_at = now()
+                    FROM users u
+                    WHERE rt.token_hash = %s
+                      AND rt.revoked_at IS NULL
+                      AND rt.expires_at > now()
+                      AND u.id = rt.user_id
+                    RETURNING rt.id, rt.family_id, u.id AS user_id, u.name, u.email
+                    """,
+                    (token_hash,),
+                )
+                current = as_dict(cur, cur.fetchone())
+
+                if not current:
+                    # Token já rotacionado sendo reutilizado: provável vazamento,
+                    # então toda a família é revogada
+                    cur.execute(
+                        """
+                        UPDATE refresh_tokens
+                        SET revoked_at = now()
+                        WHERE revoked_at IS NULL
+                          AND family_id = (
+                              SELECT family_id FROM refresh_tokens
+                              WHERE token_hash = %s AND replaced_by IS NOT NULL
+                          )
+                        """,
+                        (token_hash,),
+                    )
+                    conn.commit()
+                    raise ValueError("Refresh token inválido ou expirado")
+
+                # Emite o próximo token da família e encadeia a rotação
+                new_refresh_token, new_hash = generate_refresh_token()
+                cur.execute(
+                    """
+                    WITH new_token AS (
+                        INSERT INTO refresh_tokens (user_id, token_hash, family_id, expires_at)
+                        VALUES (%s, %s, %s, now() + %s * interval '1 second')
+                        RETURNING id
+                    )
+                    UPDATE refresh_tokens
+                    SET replaced_by = new_token.id
+                    FROM new_token
+                    WHERE refresh_tokens.id = %s
+                    """,
+                    (
+                        current["user_id"], new_hash, current["family_id"],
+                        REFRESH_TOKEN_EXPIRATION, current["id"],
+                    ),
+                )
+                conn.commit()
+
+        user = {"id": current["user_id"], "name": current["name"], "email": current["email"]}
+        return self._token_response(user, new_refresh_token)
+
+    def logout(self, refresh_token: str) -> bool:
+        with self.db.connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    """
+                    UPDATE refresh_tokens
+                    SET revoked_at = now()
+                    WHERE token_hash = %s AND revoked_at IS NULL
+                    """,
+                    (hash_refresh_token(refresh_token),),
+                )
+                conn.commit()
+                return cur.rowcount > 0
+
+    def _token_response(self, user, refresh_token: str) -> dict:
+        # Gera o token de acesso
+        user_info = {
+            "id": user["id"],
+            "name": user["name"],
+            "email": user["email"],
+        }
+        token = generate_token(user_info)
+
+        return {
+            "access_token": token,
+            "refresh_token": refresh_token,
+            "token_type": "Bearer",
+            "expires_in": ACCESS_TOKEN_EXPIRATION,
+        }
+
+    def _rehash_password(self, user_id: int, old_hash: str, password: str):
+        try:
+            new_hash = hash_password(password)
+        except PasswordHasherBusy:
+            # Melhor esforço: tenta de novo no próximo login
+            return
+
+        with self.db.connection() as conn:
+            with conn.cursor() as cur:
+                # Só substitui se a senha não mudou desde a leitura
+                cur.execute(
+                    "UPDATE users SET password = %s WHERE id = %s AND password = %s",
+                    (new_hash, user_id, old_hash),
+                )
+                conn.commit()
@@ -0,0 +1,27 @@
+from api.tools.db import DB, execute_prepared
+from typing import Dict, Iterable
+
+
+# Busca pela chave primária; mantida pelas triggers da migração 005
+VERSIONS_QUERY = """
+    SELECT resource, version
+    FROM data_versions
+    WHERE user_id = %s AND resource = ANY(%s)
+"""
+
+
+class VersionController:
+    def __init__(self):
+        self.db = DB()
+
+    def get_versions(self, user_id: int, resources: Iterable[str]) -> Dict[str, int]:
+        resources = list(resources)
+
+        with self.db.connection() as conn:
+            with conn.cursor() as cur:
+                # Roda antes de todo GET condicional, então vai preparada
+                execute_prepared(cur, VERSIONS_QUERY, (user_id, resources))
+                versions = dict(cur.fetchall())
+
+        # Recursos ainda sem escrita registrada estão na versão 0
+        return {resource: versions.get(resource, 0) for resource in resources}
@@ -0,0 +1,7 @@
+from pydantic import BaseModel, Field
+from typing import Optional
+
+
+class GetStatementsDTO(BaseModel):
+    page_size: int = Field(default=20, ge=1, le=100)
+    cursor: Optional[str] = Field(default=None, max_length=255)
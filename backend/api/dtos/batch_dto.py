@@ -0,0 +1,13 @@
+from pydantic import BaseModel, Field
+from typing import Any, Dict, List, Literal, Optional
+
+
+class BatchOperationDTO(BaseModel):
+    op: Literal["create", "update", "patch", "delete"]
+    id: Optional[int] = Field(default=None, ge=1)
+    data: Optional[Dict[str, Any]] = None
+
+
+class BatchDTO(BaseModel):
+    atomic: bool = False
+    operations: List[BatchOperationDTO] = Field(..., min_length=1, max_length=1000)
@@ -16,6 +16,8 @@ class GetCostsDTO(BaseModel):
     end_date: Optional[date] = None
     page: int = Field(default=1, ge=1)
     page_size: int = Field(default=20, ge=1, le=100)
+    include_total: bool = True
+    cursor: Optional[str] = Field(default=None, max_length=255)
 
     def validate_dates(self):
         if self.start_date and self.end_date and self.start_date > self.end_date:
@@ -0,0 +1,13 @@
+from pydantic import BaseModel
+from datetime import date
+from typing import Literal, Optional
+
+
+class GetSummaryDTO(BaseModel):
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+    group_by: Literal["day", "week", "month", "year"] = "month"
+
+    def validate_dates(self):
+        if self.start_date and self.end_date and self.start_date > self.end_date:
+            raise ValueError("Data inicial não pode ser maior que a data final")
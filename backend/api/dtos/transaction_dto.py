@@ -0,0 +1,7 @@
+from api.dtos.cost_dto import GetCostsDTO
+from typing import Literal, Optional
+
+
+class GetTransactionsDTO(GetCostsDTO):
+    # Mesmas regras de datas e paginação das listagens de gastos e receitas
+    type: Optional[Literal["cost", "receivement"]] = None
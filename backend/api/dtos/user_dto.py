@@ -10,3 +10,7 @@ class CreateUserDTO(BaseModel):
 class LoginUserDTO(BaseModel):
     email: EmailStr = Field(..., max_length=255)
     password: str = Field(..., min_length=6, max_length=255)
+
+
+class RefreshTokenDTO(BaseModel):
+    refresh_token: str = Field(..., min_length=1, max_length=255)
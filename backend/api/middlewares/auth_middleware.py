@@ -1,7 +1,10 @@
+import logging
 from functools import wraps
 from flask import request, jsonify
 from api.tools.token import validate_token
 
+logger = logging.getLogger(__name__)
+
 
 def require_auth(f):
     @wraps(f)
@@ -29,7 +32,8 @@ def require_auth(f):
             
             return f(*args, **kwargs)
             
-        except Exception as e:
+        except Exception:
+            logger.warning("Erro ao validar token", exc_info=True)
             return jsonify({"error": "Erro ao validar token"}), 401
             
     return decorated 
\ No newline at end of file
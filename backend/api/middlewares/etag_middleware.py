@@ -0,0 +1,56 @@
+import hashlib, logging
+from functools import wraps
+from flask import g, request, make_response
+from api.controllers.version_controller import VersionController
+
+logger = logging.getLogger(__name__)
+version_controller = VersionController()
+
+# Cache privado (navegador), sempre revalidado com If-None-Match
+CACHE_CONTROL = "private, no-cache"
+
+
+def etag_for(user_id: int, full_path: str, versions: dict) -> str:
+    # A query string entra no hash: cada página/filtro tem o seu ETag
+    state = ",".join(f"{resource}={version}" for resource, version in sorted(versions.items()))
+    return hashlib.sha1(f"{user_id}|{full_path}|{state}".encode()).hexdigest()[:16]
+
+
+def build_etag(user_id: int, versions: dict) -> str:
+    return etag_for(user_id, request.full_path, versions)
+
+
+def conditional_get(*resources):
+    # Deve vir depois do require_auth, que preenche request.user
+    def decorator(f):
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            user_id = request.user["id"]
+
+            # A versão é lida antes dos dados: se uma escrita ocorrer no meio,
+            # o ETag fica desatualizado e a próxima requisição recebe os dados de novo
+            try:
+                versions = version_controller.get_versions(user_id, resources)
+                etag = build_etag(user_id, versions)
+                # O cache de leituras usa as mesmas versões na chave
+                g.data_versions = versions
+            except Exception:
+                logger.warning("Falha ao consultar versões dos dados", exc_info=True)
+                return f(*args, **kwargs)
+
+            # ETag fraco: a comparação com If-None-Match também é fraca
+            if request.if_none_match.contains_weak(etag):
+                response = make_response("", 304)
+            else:
+                response = make_response(f(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+
+            response.set_etag(etag, weak=True)
+            response.headers["Cache-Control"] = CACHE_CONTROL
+            response.headers["Vary"] = "Authorization"
+            return response
+
+        return decorated
+
+    return decorator
@@ -0,0 +1,56 @@
+import logging, os, re, time, uuid
+from flask import Flask, g, request
+from api.tools.logs import request_id
+
+logger = logging.getLogger("api.access")
+
+LOG_SLOW_REQUEST_MS = float(os.getenv('LOG_SLOW_REQUEST_MS', 1000))
+REQUEST_ID_HEADER = "X-Request-ID"
+_VALID_REQUEST_ID = re.compile(r"^[A-Za-z0-9._-]{1,64}$")
+
+
+def new_request_id(incoming: str = None) -> str:
+    # Reaproveita o id do proxy quando válido, para correlacionar os logs
+    incoming = incoming or ""
+    return incoming if _VALID_REQUEST_ID.match(incoming) else uuid.uuid4().hex
+
+
+def log_access(method: str, path: str, status: int, elapsed_ms: float):
+    # Sucesso rápido só aparece em DEBUG: o volume fica limitado aos problemas
+    if status >= 500 or elapsed_ms >= LOG_SLOW_REQUEST_MS:
+        level = logging.WARNING
+    else:
+        level = logging.DEBUG
+
+    if logger.isEnabledFor(level):
+        logger.log(level, "Requisição concluída", extra={
+            "method": method,
+            "path": path,
+            "status": status,
+            "duration_ms": round(elapsed_ms, 2),
+        })
+
+
+def init_request_logging(app: Flask):
+    @app.before_request
+    def start_request_logging():
+        g.request_id = new_request_id(request.headers.get(REQUEST_ID_HEADER))
+        g.request_id_token = request_id.set(g.request_id)
+        g.request_started = time.perf_counter()
+
+    @app.after_request
+    def log_request(response):
+        started = g.pop("request_started", None)
+        if started is None:
+            return response
+
+        response.headers[REQUEST_ID_HEADER] = g.request_id
+        log_access(request.method, request.path, response.status_code, (time.perf_counter() - started) * 1000)
+
+        return response
+
+    @app.teardown_request
+    def reset_request_logging(exc=None):
+        token = g.pop("request_id_token", None)
+        if token is not None:
+            request_id.reset(token)
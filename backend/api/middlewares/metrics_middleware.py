@@ -0,0 +1,64 @@
+import logging, os
+from flask import Flask, g, request
+from api.tools.metrics import RequestMetrics, current_request, registry
+from api.tools.profiler import SamplingProfiler, should_profile
+
+logger = logging.getLogger(__name__)
+
+
+def _route() -> str:
+    # Usa o padrão da rota (/costs/<int:cost_id>) para não explodir as séries
+    return request.url_rule.rule if request.url_rule is not None else "<unmatched>"
+
+
+def server_timing(metrics: RequestMetrics, elapsed: float) -> str:
+    return ", ".join([
+        f"app;dur={elapsed * 1000:.1f}",
+        f'db;dur={metrics.db_time * 1000:.1f};desc="{metrics.queries} queries"',
+        f"pool;dur={metrics.acquire_time * 1000:.1f}",
+    ])
+
+
+def init_metrics(app: Flask):
+    # Registrado antes dos demais hooks para medir a requisição inteira
+    @app.before_request
+    def start_request_metrics():
+        g.request_metrics = RequestMetrics()
+        g.request_metrics_token = current_request.set(g.request_metrics)
+
+        if should_profile(request.headers):
+            g.profiler = SamplingProfiler()
+            g.profiler.start()
+
+    @app.after_request
+    def record_request_metrics(response):
+        metrics = g.pop("request_metrics", None)
+        if metrics is None:
+            return response
+
+        elapsed = metrics.elapsed()
+        registry.observe_request(request.method, _route(), response.status_code, metrics, elapsed)
+        response.headers["Server-Timing"] = server_timing(metrics, elapsed)
+
+        profiler = g.pop("profiler", None)
+        if profiler is not None:
+            profiler.stop()
+            try:
+                path = profiler.write(f"{request.method}-{_route()}")
+                # O cliente recebe só o nome do arquivo; o caminho fica no log
+                logger.info("Perfil da requisição gravado", extra={"profile_file": path})
+                response.headers["X-Profile-File"] = os.path.basename(path)
+            except OSError:
+                logger.warning("Falha ao gravar o perfil da requisição", exc_info=True)
+
+        return response
+
+    @app.teardown_request
+    def reset_request_metrics(exc=None):
+        profiler = g.pop("profiler", None)
+        if profiler is not None:
+            profiler.stop()
+
+        token = g.pop("request_metrics_token", None)
+        if token is not None:
+            current_request.reset(token)
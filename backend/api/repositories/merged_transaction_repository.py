@@ -0,0 +1,153 @@
+import os
+from api.tools.db import DB, execute_prepared
+from api.repositories.transaction_repository import render
+from psycopg2 import sql
+from datetime import date
+from typing import Callable, Optional, Dict, List, Tuple
+
+
+TRANSACTION_TABLES = {"cost": "costs", "receivement": "receivements"}
+
+# No modo por página cada tabela lê offset + page_size linhas; além disso
+# a listagem só avança pelo cursor
+TRANSACTIONS_MAX_OFFSET = int(os.getenv("TRANSACTIONS_MAX_OFFSET", 10000))
+
+
+class MergedTransactionRepository:
+    # Gastos e receitas numa única lista ordenada por data, tipo e id. Como
+    # no TransactionRepository, cada combinação de filtros é montada uma vez
+    # com psycopg2.sql e roda como prepared statement
+    def __init__(self):
+        self.db = DB()
+        self._statements: Dict[tuple, str] = {}
+
+    def statement(self, key: tuple, build: Callable[[], sql.Composable]) -> str:
+        statement = self._statements.get(key)
+        if statement is None:
+            statement = render(build())
+            self._statements[key] = statement
+        return statement
+
+    def _build_list(
+        self,
+        kinds: Tuple[str, ...],
+        has_start: bool,
+        has_end: bool,
+        cursor_kind: Optional[str],
+        include_total: bool,
+    ) -> sql.Composed:
+        # Filtros compartilhados pelas páginas e pelos totais
+        filters = [sql.SQL("user_id = %s")]
+        if has_start:
+            filters.append(sql.SQL("transaction_date >= %s"))
+        if has_end:
+            filters.append(sql.SQL("transaction_date <= %s"))
+
+        branches = []
+        for kind in kinds:
+            branch_filters = list(filters)
+            if cursor_kind:
+                # Ordem: data DESC, tipo DESC, id DESC. Cada ramo recebe um filtro
+                # que ainda usa o índice (user_id, transaction_date DESC, id DESC)
+                if kind == cursor_kind:
+                    branch_filters.append(sql.SQL("(transaction_date, id) < (%s, %s)"))
+                elif kind < cursor_kind:
+                    # Na data do cursor este tipo vem depois: nada dele foi entregue
+                    branch_filters.append(sql.SQL("transaction_date <= %s"))
+                else:
+                    branch_filters.append(sql.SQL("transaction_date < %s"))
+
+            # Cada tabela entrega no máximo o necessário para a página mesclada
+            branches.append(sql.SQL(
+                """
+                (SELECT id, %s::varchar AS kind, title, description, value, transaction_date
+                 FROM {table}
+                 WHERE {filters}
+                 ORDER BY transaction_date DESC, id DESC
+                 LIMIT %s)
+                """
+            ).format(
+                table=sql.Identifier(TRANSACTION_TABLES[kind]),
+                filters=sql.SQL(" AND ").join(branch_filters),
+            ))
+
+        # Busca um item a mais para saber se há próxima página
+        parts = [sql.SQL(
+            """
+            SELECT * FROM (
+                SELECT 'item' AS row_type, id, kind, title, description, value,
+                       transaction_date, NULL::int8 AS count
+                FROM ({branches}) AS merged
+                ORDER BY transaction_date DESC, kind DESC, id DESC
+                LIMIT %s OFFSET %s
+            ) AS page
+            """
+        ).format(branches=sql.SQL(" UNION ALL ").join(branches))]
+
+        if include_total:
+            # Totais por tipo na mesma ida ao banco, como linhas extras
+            for kind in kinds:
+                parts.append(sql.SQL(
+                    """
+                    SELECT 'total', NULL, %s, NULL, NULL, COALESCE(SUM(value), 0), NULL, COUNT(*)
+                    FROM {table}
+                    WHERE {filters}
+                    """
+                ).format(
+                    table=sql.Identifier(TRANSACTION_TABLES[kind]),
+                    filters=sql.SQL(" AND ").join(filters),
+                ))
+
+        return sql.Composed([
+            sql.SQL(" UNION ALL ").join(parts),
+            sql.SQL(" ORDER BY row_type, transaction_date DESC, kind DESC, id DESC"),
+        ])
+
+    def list_statement(
+        self,
+        user_id: int,
+        kinds: Tuple[str, ...],
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        page: int = 1,
+        page_size: int = 20,
+        include_total: bool = True,
+        cursor: Optional[Tuple[date, int, str]] = None,
+    ) -> Tuple[str, list]:
+        offset = 0 if cursor else (page - 1) * page_size
+        if offset > TRANSACTIONS_MAX_OFFSET:
+            raise ValueError(
+                f"Página além dos primeiros {TRANSACTIONS_MAX_OFFSET} itens; "
+                "continue pelo cursor (next_cursor)"
+            )
+
+        filter_params = [user_id]
+        if start_date:
+            filter_params.append(start_date)
+        if end_date:
+            filter_params.append(end_date)
+
+        params: List = []
+        for kind in kinds:
+            params.extend([kind, *filter_params])
+            if cursor:
+                cursor_date, cursor_id, cursor_kind = cursor
+                params.extend([cursor_date, cursor_id] if kind == cursor_kind else [cursor_date])
+            params.append(offset + page_size + 1)
+        params.extend([page_size + 1, offset])
+
+        if include_total:
+            for kind in kinds:
+                params.extend([kind, *filter_params])
+
+        flags = (kinds, bool(start_date), bool(end_date), cursor[2] if cursor else None, bool(include_total))
+
+        return self.statement(("list", *flags), lambda: self._build_list(*flags)), params
+
+    def list_rows(self, user_id: int, kinds: Tuple[str, ...], **options) -> list:
+        query, params = self.list_statement(user_id, kinds, **options)
+
+        with self.db.connection() as conn:
+            with conn.cursor() as cur:
+                execute_prepared(cur, query, params)
+                return cur.fetchall()
@@ -0,0 +1,631 @@
+from api.tools.db import DB, execute_prepared
+from api.controllers.balance_controller import BalanceController
+from api.controllers.monthly_totals_controller import MonthlyTotalsController
+from api.tools.cursor import encode_cursor
+from api.tools.importer import copy_buffer
+from api.tools.exporter import EXPORT_ITERSIZE
+from contextlib import contextmanager
+from psycopg2 import sql
+from psycopg2.extras import execute_values
+from datetime import date
+from decimal import Decimal
+from typing import Callable, Optional, Dict, Iterable, Iterator, List, Tuple
+
+
+COLUMNS = ("id", "title", "description", "value", "transaction_date")
+EXPORT_COLUMNS = COLUMNS
+
+# Campos que o PATCH pode alterar, na ordem usada nos comandos
+PATCH_FIELDS = ("title", "description", "value", "transaction_date")
+
+# Colunas devolvidas pelas escritas, com o estado anterior para os deltas
+RETURNING_PREVIOUS = sql.SQL(
+    """
+    RETURNING t.id, t.title, t.description, t.value, t.transaction_date,
+              old.value AS previous_value, old.transaction_date AS previous_date
+    """
+)
+
+
+def as_row(row) -> Optional[dict]:
+    if row is None:
+        return None
+    return dict(zip(COLUMNS, row))
+
+
+def changed_entries(item: Dict, previous_value: Decimal, previous_date: date) -> List[Tuple[int, Decimal, date]]:
+    # Entradas do extrato de uma alteração: mudando a data, o valor antigo
+    # sai na data antiga e o novo entra na nova
+    if item["transaction_date"] == previous_date:
+        return [(item["id"], item["value"] - previous_value, previous_date)]
+    return [(item["id"], -previous_value, previous_date), (item["id"], item["value"], item["transaction_date"])]
+
+
+def render(composable: sql.Composable) -> str:
+    # Como o as_string, mas sem exigir uma conexão psycopg2: o mesmo texto
+    # serve ao pool síncrono e ao assíncrono
+    if isinstance(composable, sql.Composed):
+        return "".join(render(part) for part in composable.seq)
+    if isinstance(composable, sql.Identifier):
+        return ".".join('"%s"' % name.replace('"', '""') for name in composable.strings)
+    if isinstance(composable, sql.SQL):
+        return composable.string
+    raise TypeError(f"Trecho SQL não suportado: {type(composable).__name__}")
+
+
+class TransactionRepository:
+    # Acesso a uma tabela de lançamentos (costs ou receivements). Os comandos
+    # são montados com psycopg2.sql uma vez por combinação de filtros e
+    # reaproveitados; os de listagem, detalhe e escrita unitária rodam como
+    # prepared statements. Saldo, extrato e totais mensais são atualizados
+    # na mesma transação de cada escrita
+    def __init__(self, table: str, kind: str, not_found: str):
+        self.table = table
+        self.kind = kind
+        self.not_found = not_found
+        self.db = DB()
+        self.balances = BalanceController()
+        self.monthly_totals = MonthlyTotalsController()
+        self._statements: Dict[tuple, str] = {}
+
+    @contextmanager
+    def transaction(self, name: Optional[str] = None):
+        # Conexão do pool e cursor; commit apenas se o bloco terminar sem erro,
+        # caso contrário o pool desfaz a transação ao receber a conexão
+        with self.db.connection() as conn:
+            with conn.cursor(name=name) as cur:
+                yield cur
+            conn.commit()
+
+    def statement(self, key: tuple, build: Callable[[], sql.Composable]) -> str:
+        # Monta e renderiza o comando na primeira vez; depois só consulta o cache
+        statement = self._statements.get(key)
+        if statement is None:
+            statement = render(build())
+            self._statements[key] = statement
+        return statement
+
+    def _format(self, query: str, **parts) -> sql.Composed:
+        # Nomes viram identificadores escapados; trechos já compostos entram como estão
+        return sql.SQL(query).format(
+            table=sql.Identifier(self.table),
+            **{
+                name: sql.Identifier(part) if isinstance(part, str) else part
+                for name, part in parts.items()
+            },
+        )
+
+    def _record(
+        self,
+        cur,
+        user_id: int,
+        entries: List[Tuple[Optional[int], Decimal, date]],
+        month_entries: List[Tuple[date, Decimal, int]],
+    ):
+        # Atualiza saldo, extrato e totais mensais na mesma transação
+        self.balances.record(cur, user_id, self.kind, entries)
+        self.monthly_totals.record(cur, user_id, self.kind, month_entries)
+
+    def create_statement(self) -> str:
+        return self.statement(("create",), lambda: self._format(
+            """
+            INSERT INTO {table} (user_id, title, description, value, transaction_date)
+            VALUES (%s, %s, %s, %s, %s)
+            RETURNING id, title, description, value, transaction_date
+            """
+        ))
+
+    def create(
+        self,
+        user_id: int,
+        title: str,
+        description: Optional[str],
+        value: Decimal,
+        transaction_date: date,
+    ) -> dict:
+        with self.transaction() as cur:
+            execute_prepared(
+                cur,
+                self.create_statement(),
+                (user_id, title, description, value, transaction_date),
+            )
+            item = as_row(cur.fetchone())
+
+            self._record(
+                cur, user_id,
+                [(item["id"], item["value"], item["transaction_date"])],
+                [(item["transaction_date"], item["value"], 1)],
+            )
+
+        return item
+
+    def _build_list(self, has_start: bool, has_end: bool, has_cursor: bool, include_total: bool) -> sql.Composed:
+        # Monta os filtros compartilhados pela página e pela contagem
+        filters = [sql.SQL("user_id = %s")]
+        if has_start:
+            filters.append(sql.SQL("transaction_date >= %s"))
+        if has_end:
+            filters.append(sql.SQL("transaction_date <= %s"))
+
+        page_filters = list(filters)
+        if has_cursor:
+            # Keyset: continua logo após o último item entregue
+            page_filters.append(sql.SQL("(transaction_date, id) < (%s, %s)"))
+
+        # Busca um item a mais para saber se há próxima página;
+        # o id desempata datas iguais e torna a ordem estável
+        page_query = sql.SQL(
+            """
+            SELECT id, title, description, value, transaction_date
+            FROM {table}
+            WHERE {filters}
+            ORDER BY transaction_date DESC, id DESC
+            LIMIT %s OFFSET %s
+            """
+        ).format(table=sql.Identifier(self.table), filters=sql.SQL(" AND ").join(page_filters))
+
+        if not include_total:
+            return page_query
+
+        # Página e total na mesma ida ao banco; o LEFT JOIN garante
+        # uma linha com o total mesmo quando a página está vazia
+        return sql.SQL(
+            """
+            SELECT page.id, page.title, page.description, page.value,
+                   page.transaction_date, total.total_items
+            FROM (
+                SELECT COUNT(*) AS total_items
+                FROM {table}
+                WHERE {filters}
+            ) AS total
+            LEFT JOIN ({page_query}) AS page ON true
+            ORDER BY page.transaction_date DESC, page.id DESC
+            """
+        ).format(
+            table=sql.Identifier(self.table),
+            filters=sql.SQL(" AND ").join(filters),
+            page_query=page_query,
+        )
+
+    def list_statement(
+        self,
+        user_id: int,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        page: int = 1,
+        page_size: int = 20,
+        include_total: bool = True,
+        cursor: Optional[Tuple[date, int]] = None,
+    ) -> Tuple[str, list]:
+        filter_params = [user_id]
+        if start_date:
+            filter_params.append(start_date)
+        if end_date:
+            filter_params.append(end_date)
+
+        page_params = list(filter_params)
+        if cursor:
+            page_params.extend(cursor)
+            offset = 0
+        else:
+            offset = (page - 1) * page_size
+        page_params.extend([page_size + 1, offset])
+
+        flags = (bool(start_date), bool(end_date), bool(cursor), bool(include_total))
+
+        return (
+            self.statement(("list", *flags), lambda: self._build_list(*flags)),
+            [*filter_params, *page_params] if include_total else page_params,
+        )
+
+    def list_result(
+        self,
+        rows: list,
+        page: int,
+        page_size: int,
+        include_total: bool,
+        cursor: Optional[Tuple[date, int]],
+    ) -> Dict[str, any]:
+        if include_total:
+            # total_items é a última coluna; o zip abaixo a descarta
+            total_items = rows[0][-1]
+            rows = [row for row in rows if row[0] is not None]
+        else:
+            total_items = None
+
+        has_next = len(rows) > page_size
+        items = [as_row(row) for row in rows[:page_size]]
+
+        next_cursor = None
+        if has_next:
+            last = items[-1]
+            next_cursor = encode_cursor(last["transaction_date"], last["id"])
+
+        total_pages = None
+        if total_items is not None:
+            total_pages = (total_items + page_size - 1) // page_size
+
+        return {
+            "items": items,
+            "pagination": {
+                "page": None if cursor else page,
+                "page_size": page_size,
+                "total_items": total_items,
+                "total_pages": total_pages,
+                "has_next": has_next,
+                "next_cursor": next_cursor,
+            }
+        }
+
+    def list_page(
+        self,
+        user_id: int,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        page: int = 1,
+        page_size: int = 20,
+        include_total: bool = True,
+        cursor: Optional[Tuple[date, int]] = None,
+    ) -> Dict[str, any]:
+        query, params = self.list_statement(
+            user_id, start_date, end_date, page, page_size, include_total, cursor
+        )
+
+        with self.transaction() as cur:
+            execute_prepared(cur, query, params)
+            rows = cur.fetchall()
+
+        return self.list_result(rows, page, page_size, include_total, cursor)
+
+    def get_statement(self) -> str:
+        return self.statement(("get",), lambda: self._format(
+            """
+            SELECT id, title, description, value, transaction_date
+            FROM {table}
+            WHERE id = %s AND user_id = %s
+            """
+        ))
+
+    def get(self, user_id: int, item_id: int) -> Optional[Dict]:
+        with self.transaction() as cur:
+            execute_prepared(cur, self.get_statement(), (item_id, user_id))
+            return as_row(cur.fetchone())
+
+    def _write_previous(self, cur, user_id: int, item: Optional[tuple]) -> Optional[Dict]:
+        # Nenhuma linha afetada: o lançamento não existe ou é de outro usuário
+        if item is None:
+            return None
+
+        *row, previous_value, previous_date = item
+        item = as_row(row)
+
+        self._record(
+            cur, user_id,
+            changed_entries(item, previous_value, previous_date),
+            [(previous_date, -previous_value, -1), (item["transaction_date"], item["value"], 1)],
+        )
+        return item
+
+    def update(
+        self,
+        user_id: int,
+        item_id: int,
+        title: str,
+        description: Optional[str],
+        value: Decimal,
+        transaction_date: date,
+    ) -> Optional[Dict]:
+        with self.transaction() as cur:
+            # Atualiza em um único comando; o CTE trava a linha e devolve
+            # valor e data anteriores para calcular as variações
+            execute_prepared(
+                cur,
+                self.statement(("update",), lambda: self._format(
+                    """
+                    WITH old AS (
+                        SELECT id, value, transaction_date
+                        FROM {table}
+                        WHERE id = %s AND user_id = %s
+                        FOR UPDATE
+                    )
+                    UPDATE {table} AS t
+                    SET title = %s,
+                        description = %s,
+                        value = %s,
+                        transaction_date = %s
+                    FROM old
+                    WHERE t.id = old.id
+                    """
+                ) + RETURNING_PREVIOUS),
+                (item_id, user_id, title, description, value, transaction_date),
+            )
+            return self._write_previous(cur, user_id, cur.fetchone())
+
+    def patch(self, user_id: int, item_id: int, updates: Dict) -> Optional[Dict]:
+        # Um comando por combinação de campos alterados
+        fields = tuple(field for field in PATCH_FIELDS if updates.get(field) is not None)
+
+        if not fields:
+            # Nada a alterar: apenas devolve o lançamento atual
+            return self.get(user_id, item_id)
+
+        with self.transaction() as cur:
+            execute_prepared(
+                cur,
+                self.statement(("patch", fields), lambda: self._format(
+                    """
+                    WITH old AS (
+                        SELECT id, value, transaction_date
+                        FROM {table}
+                        WHERE id = %s AND user_id = %s
+                        FOR UPDATE
+                    )
+                    UPDATE {table} AS t
+                    SET {assignments}
+                    FROM old
+                    WHERE t.id = old.id
+                    """,
+                    assignments=sql.SQL(", ").join(
+                        sql.SQL("{} = %s").format(sql.Identifier(field)) for field in fields
+                    ),
+                ) + RETURNING_PREVIOUS),
+                (item_id, user_id, *(updates[field] for field in fields)),
+            )
+            return self._write_previous(cur, user_id, cur.fetchone())
+
+    def delete(self, user_id: int, item_id: int) -> bool:
+        with self.transaction() as cur:
+            # Remove o lançamento; o RETURNING informa se ele existia
+            execute_prepared(
+                cur,
+                self.statement(("delete",), lambda: self._format(
+                    "DELETE FROM {table} WHERE id = %s AND user_id = %s RETURNING value, transaction_date"
+                )),
+                (item_id, user_id),
+            )
+            deleted = cur.fetchone()
+            if not deleted:
+                return False
+
+            value, transaction_date = deleted
+
+            # O lançamento excluído não pode ser referenciado no extrato
+            self._record(cur, user_id, [(None, -value, transaction_date)], [(transaction_date, -value, -1)])
+
+        return True
+
+    def import_rows(self, user_id: int, batches: Iterable[List[Tuple[int, any]]]) -> int:
+        imported = 0
+        staging = f"import_{self.table}"
+
+        with self.transaction() as cur:
+            # Tabela de staging descartada ao fim da transação
+            cur.execute(
+                self.statement(("import_staging",), lambda: self._format(
+                    """
+                    CREATE TEMP TABLE {staging} (
+                        line int4 NOT NULL,
+                        title varchar(255) NOT NULL,
+                        description text NULL,
+                        value numeric(10, 2) NOT NULL,
+                        transaction_date date NOT NULL
+                    ) ON COMMIT DROP
+                    """,
+                    staging=staging,
+                ))
+            )
+            copy = self.statement(("import_copy",), lambda: self._format(
+                "COPY {staging} (line, title, description, value, transaction_date) FROM STDIN",
+                staging=staging,
+            ))
+            merge = self.statement(("import_merge",), lambda: self._format(
+                """
+                INSERT INTO {table} (user_id, title, description, value, transaction_date)
+                SELECT %s, title, description, value, transaction_date
+                FROM {staging}
+                ORDER BY line
+                RETURNING id, value, transaction_date
+                """,
+                staging=staging,
+            ))
+            truncate = self.statement(("import_truncate",), lambda: self._format(
+                "TRUNCATE {staging}", staging=staging,
+            ))
+
+            # Cada lote validado é carregado via COPY e mesclado em seguida,
+            # então a memória usada depende do tamanho do lote, não do arquivo
+            for batch in batches:
+                cur.copy_expert(
+                    copy,
+                    copy_buffer(
+                        (line, item.title, item.description, item.value, item.transaction_date)
+                        for line, item in batch
+                    ),
+                )
+                cur.execute(merge, (user_id,))
+                inserted = cur.fetchall()
+
+                self._record(
+                    cur, user_id,
+                    [(item_id, value, transaction_date) for item_id, value, transaction_date in inserted],
+                    [(transaction_date, value, 1) for _, value, transaction_date in inserted],
+                )
+                cur.execute(truncate)
+                imported += len(inserted)
+
+        return imported
+
+    def export(
+        self,
+        user_id: int,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        itersize: int = EXPORT_ITERSIZE,
+    ) -> Iterator[tuple]:
+        filters = [sql.SQL("user_id = %s")]
+        params = [user_id]
+
+        # Adiciona filtros de data se fornecidos
+        if start_date:
+            filters.append(sql.SQL("transaction_date >= %s"))
+            params.append(start_date)
+        if end_date:
+            filters.append(sql.SQL("transaction_date <= %s"))
+            params.append(end_date)
+
+        # Cursor nomeado (server-side): o banco entrega as linhas em blocos
+        # de itersize, então nem a aplicação nem o driver guardam o resultado
+        with self.transaction(name=f"export_{self.table}") as cur:
+            cur.itersize = itersize
+            cur.execute(
+                self.statement(("export", bool(start_date), bool(end_date)), lambda: sql.SQL(
+                    """
+                    SELECT {columns}
+                    FROM {table}
+                    WHERE {filters}
+                    ORDER BY transaction_date DESC, id DESC
+                    """
+                ).format(
+                    columns=sql.SQL(", ").join(map(sql.Identifier, EXPORT_COLUMNS)),
+                    table=sql.Identifier(self.table),
+                    filters=sql.SQL(" AND ").join(filters),
+                )),
+                params,
+            )
+
+            for row in cur:
+                yield row
+
+    def batch(
+        self,
+        user_id: int,
+        operations: List[Tuple[int, str, Optional[int], any]],
+        atomic: bool = False,
+    ) -> Tuple[Dict[int, dict], bool]:
+        creates = [(index, data) for index, op, _, data in operations if op == "create"]
+        updates = [(index, item_id, data) for index, op, item_id, data in operations if op == "update"]
+        patches = [(index, item_id, data) for index, op, item_id, data in operations if op == "patch"]
+        deletes = [(index, item_id) for index, op, item_id, _ in operations if op == "delete"]
+
+        results = {}
+        entries = []
+        month_entries = []
+        not_found = {"status": 404, "error": self.not_found}
+
+        def apply_writes(rows, writes):
+            written = {row[0]: row for row in rows}
+            for index, item_id, _ in writes:
+                row = written.get(item_id)
+                if row is None:
+                    results[index] = not_found
+                    continue
+                *row, previous_value, previous_date = row
+                item = as_row(row)
+                results[index] = {"status": 200, "data": item}
+                entries.extend(changed_entries(item, previous_value, previous_date))
+                month_entries.append((previous_date, -previous_value, -1))
+                month_entries.append((item["transaction_date"], item["value"], 1))
+
+        with self.transaction() as cur:
+            if creates:
+                # Um único INSERT com várias linhas; o RETURNING segue a ordem do VALUES
+                rows = execute_values(
+                    cur,
+                    self.statement(("batch_create",), lambda: self._format(
+                        """
+                        INSERT INTO {table} (user_id, title, description, value, transaction_date)
+                        VALUES %s
+                        RETURNING id, title, description, value, transaction_date
+                        """
+                    )),
+                    [
+                        (user_id, data.title, data.description, data.value, data.transaction_date)
+                        for _, data in creates
+                    ],
+                    page_size=len(creates),
+                    fetch=True,
+                )
+                for (index, _), row in zip(creates, rows):
+                    item = as_row(row)
+                    results[index] = {"status": 201, "data": item}
+                    entries.append((item["id"], item["value"], item["transaction_date"]))
+                    month_entries.append((item["transaction_date"], item["value"], 1))
+
+            # Trava as linhas antigas para calcular as variações; no patch
+            # campos nulos mantêm o valor atual
+            for name, writes, assignments in (
+                ("batch_update", updates, """
+                    title = v.title,
+                    description = v.description,
+                    value = v.value,
+                    transaction_date = v.transaction_date
+                """),
+                ("batch_patch", patches, """
+                    title = COALESCE(v.title, t.title),
+                    description = COALESCE(v.description, t.description),
+                    value = COALESCE(v.value, t.value),
+                    transaction_date = COALESCE(v.transaction_date, t.transaction_date)
+                """),
+            ):
+                if not writes:
+                    continue
+                rows = execute_values(
+                    cur,
+                    self.statement((name,), lambda: self._format(
+                        """
+                        WITH v (id, user_id, title, description, value, transaction_date) AS (
+                            VALUES %s
+                        ),
+                        old AS (
+                            SELECT t.id, t.value, t.transaction_date
+                            FROM {table} t
+                            JOIN v ON v.id = t.id AND v.user_id = t.user_id
+                            FOR UPDATE OF t
+                        )
+                        UPDATE {table} AS t
+                        SET {assignments}
+                        FROM v JOIN old ON old.id = v.id
+                        WHERE t.id = v.id
+                        """,
+                        assignments=sql.SQL(assignments),
+                    ) + RETURNING_PREVIOUS),
+                    [
+                        (item_id, user_id, data.title, data.description, data.value, data.transaction_date)
+                        for _, item_id, data in writes
+                    ],
+                    template="(%s::int4, %s::int4, %s::varchar, %s::text, %s::numeric, %s::date)",
+                    page_size=len(writes),
+                    fetch=True,
+                )
+                apply_writes(rows, writes)
+
+            if deletes:
+                cur.execute(
+                    self.statement(("batch_delete",), lambda: self._format(
+                        """
+                        DELETE FROM {table}
+                        WHERE user_id = %s AND id = ANY(%s)
+                        RETURNING id, value, transaction_date
+                        """
+                    )),
+                    (user_id, [item_id for _, item_id in deletes]),
+                )
+                deleted = {item_id: (value, transaction_date) for item_id, value, transaction_date in cur.fetchall()}
+                for index, item_id in deletes:
+                    if item_id not in deleted:
+                        results[index] = not_found
+                        continue
+                    value, transaction_date = deleted[item_id]
+                    results[index] = {"status": 204}
+                    entries.append((None, -value, transaction_date))
+                    month_entries.append((transaction_date, -value, -1))
+
+            # No modo atômico qualquer falha desfaz o lote inteiro
+            failed = {index: result for index, result in results.items() if result["status"] >= 400}
+            if atomic and failed:
+                cur.connection.rollback()
+                return failed, False
+
+            self._record(cur, user_id, entries, month_entries)
+
+        return results, True
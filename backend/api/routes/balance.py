@@ -0,0 +1,79 @@
+import logging
+from flask import Blueprint, request, jsonify
+from api.controllers.balance_controller import BalanceController
+from api.dtos.balance_dto import GetStatementsDTO
+from api.middlewares.auth_middleware import require_auth
+from api.middlewares.etag_middleware import conditional_get
+from api.tools.cursor import decode_cursor
+from pydantic import ValidationError
+from datetime import datetime
+
+balance_bp = Blueprint("balance", __name__)
+logger = logging.getLogger(__name__)
+balance_controller = BalanceController()
+
+
+@balance_bp.route("/balance", methods=["GET"])
+@require_auth
+@conditional_get("costs", "receivements")
+def get_balance():
+    try:
+        # Saldo materializado, sem percorrer o histórico
+        balance = balance_controller.get_balance(user_id=request.user["id"])
+
+        return jsonify(balance), 200
+
+    except Exception:
+        logger.exception("Erro não tratado em get_balance")
+        return jsonify({"error": "Erro interno do servidor"}), 500
+
+
+@balance_bp.route("/statements", methods=["GET"])
+@require_auth
+@conditional_get("costs", "receivements")
+def get_statements():
+    try:
+        params = {
+            "page_size": request.args.get("page_size", 20, type=int),
+        }
+
+        cursor = request.args.get("cursor")
+        if cursor:
+            params["cursor"] = cursor
+
+        # Valida os parâmetros usando o DTO
+        query_params = GetStatementsDTO(**params)
+
+        # Busca o extrato
+        result = balance_controller.get_statements(
+            user_id=request.user["id"],
+            page_size=query_params.page_size,
+            cursor=(
+                decode_cursor(query_params.cursor, parse=datetime.fromisoformat)
+                if query_params.cursor
+                else None
+            ),
+        )
+
+        # Adiciona links de paginação
+        base_url = request.base_url
+        pagination = result["pagination"]
+
+        links = {"first": f"{base_url}?page_size={pagination['page_size']}"}
+        if pagination["has_next"]:
+            links["next"] = (
+                f"{base_url}?cursor={pagination['next_cursor']}"
+                f"&page_size={pagination['page_size']}"
+            )
+
+        result["links"] = links
+
+        return jsonify(result), 200
+
+    except ValidationError as e:
+        return jsonify({"error": "Dados inválidos", "details": e.errors()}), 400
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception:
+        logger.exception("Erro não tratado em get_statements")
+        return jsonify({"error": "Erro interno do servidor"}), 500
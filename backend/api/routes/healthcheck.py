@@ -1,8 +1,34 @@
+import logging
 from flask import Blueprint, jsonify
+from api.tools.db import DB
+from api.tools.cache import get_read_cache
 
 healthcheck_bp = Blueprint("healthcheck", __name__)
+logger = logging.getLogger(__name__)
+db = DB()
 
 
 @healthcheck_bp.route("/healthcheck", methods=["GET"])
 def healthcheck():
     return jsonify({"status": "ok"}), 200
+
+
+@healthcheck_bp.route("/healthcheck/db", methods=["GET"])
+def healthcheck_db():
+    try:
+        # Empresta uma conexão para validar o banco e devolve as estatísticas do pool
+        with db.connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
+
+        return jsonify({"status": "ok", "pool": db.stats()}), 200
+
+    except Exception:
+        logger.warning("Banco de dados indisponível", exc_info=True)
+        return jsonify({"status": "error"}), 503
+
+
+@healthcheck_bp.route("/healthcheck/cache", methods=["GET"])
+def healthcheck_cache():
+    # Acertos, falhas e invalidações do cache de leituras
+    return jsonify({"status": "ok", "cache": get_read_cache().stats()}), 200
@@ -0,0 +1,37 @@
+import hmac, os
+from flask import Blueprint, Response, jsonify, request
+from api.tools.cache import get_read_cache
+from api.tools.db import pool_stats
+from api.tools.metrics import registry
+from api.tools.token import token_cache
+
+metrics_bp = Blueprint("metrics", __name__)
+
+# Token exigido no Authorization (bearer_token no scrape do Prometheus);
+# sem ele o endpoint fica desligado
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
+
+@metrics_bp.route("/metrics", methods=["GET"])
+def metrics():
+    if not METRICS_TOKEN:
+        return jsonify({"error": "Não encontrado"}), 404
+
+    authorization = request.headers.get("Authorization", "")
+    if not hmac.compare_digest(authorization.encode(), f"Bearer {METRICS_TOKEN}".encode()):
+        return jsonify({"error": "Token de acesso inválido"}), 401
+
+    gauges = {}
+
+    # Estado do pool de conexões deste processo
+    for key, value in (pool_stats() or {}).items():
+        gauges[f"db_pool_{key}"] = value
+
+    for key, value in get_read_cache().stats().items():
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            gauges[f"read_cache_{key}"] = value
+
+    for key, value in token_cache.stats().items():
+        gauges[f"token_cache_{key}"] = value
+
+    return Response(registry.render(gauges), mimetype="text/plain; version=0.0.4")
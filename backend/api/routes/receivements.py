@@ -1,4 +1,5 @@
-from flask import Blueprint, request, jsonify, url_for
+import logging
+from flask import Blueprint, Response, request, jsonify, url_for
 from api.controllers.receivement_controller import ReceivementController
 from api.dtos.receivement_dto import (
     CreateReceivementDTO,
@@ -6,11 +7,20 @@ from api.dtos.receivement_dto import (
     UpdateReceivementDTO,
     PatchReceivementDTO,
 )
+from api.dtos.batch_dto import BatchDTO
 from api.middlewares.auth_middleware import require_auth
+from api.middlewares.etag_middleware import conditional_get
+from api.tools.batch import build_batch_response, validate_operations
+from api.repositories.transaction_repository import EXPORT_COLUMNS
+from api.tools.pagination import pagination_links
+from api.tools.cursor import decode_cursor
+from api.tools.exporter import EXPORT_MIMETYPES, stream_rows, validate_export_format
+from api.tools.importer import ImportReport, detect_import_format, iter_records, spool_batches, validated_batches
 from pydantic import ValidationError
 from datetime import datetime
 
 receivements_bp = Blueprint("receivements", __name__)
+logger = logging.getLogger(__name__)
 receivement_controller = ReceivementController()
 
 
@@ -37,12 +47,14 @@ def create_receivement():
         return jsonify({"error": "Dados inválidos", "details": e.errors()}), 400
     except ValueError as e:
         return jsonify({"error": str(e)}), 400
-    except Exception as e:
+    except Exception:
+        logger.exception("Erro não tratado em create_receivement")
         return jsonify({"error": "Erro interno do servidor"}), 500
 
 
 @receivements_bp.route("/receivements", methods=["GET"])
 @require_auth
+@conditional_get('receivements')
 def get_receivements():
     try:
         # Converte as datas de string para date
@@ -53,6 +65,14 @@ def get_receivements():
             'page': request.args.get('page', 1, type=int),
             'page_size': request.args.get('page_size', 20, type=int)
         }
+
+        include_total = request.args.get('include_total')
+        if include_total is not None:
+            params['include_total'] = include_total
+
+        cursor = request.args.get('cursor')
+        if cursor:
+            params['cursor'] = cursor
         
         if start_date:
             params['start_date'] = datetime.strptime(start_date, '%Y-%m-%d').date()
@@ -69,36 +89,19 @@ def get_receivements():
             start_date=query_params.start_date,
             end_date=query_params.end_date,
             page=query_params.page,
-            page_size=query_params.page_size
+            page_size=query_params.page_size,
+            include_total=query_params.include_total,
+            cursor=decode_cursor(query_params.cursor) if query_params.cursor else None
         )
         
         # Adiciona links de paginação
-        base_url = request.base_url
-        pagination = result["pagination"]
-        current_page = pagination["page"]
-        total_pages = pagination["total_pages"]
-        
-        links = {}
-        
-        # Link para primeira página
-        links["first"] = f"{base_url}?page=1"
-        
-        # Link para próxima página
-        if current_page < total_pages:
-            links["next"] = f"{base_url}?page={current_page + 1}"
-        
-        # Link para última página
-        links["last"] = f"{base_url}?page={total_pages}"
-        
-        # Adiciona os parâmetros de data aos links se existirem
-        for key in links:
-            if start_date:
-                links[key] += f"&start_date={start_date}"
-            if end_date:
-                links[key] += f"&end_date={end_date}"
-            links[key] += f"&page_size={pagination['page_size']}"
-        
-        result["links"] = links
+        result["links"] = pagination_links(
+            request.base_url,
+            result["pagination"],
+            cursor_mode=bool(query_params.cursor),
+            include_total=query_params.include_total,
+            filters={"start_date": start_date, "end_date": end_date},
+        )
         
         return jsonify(result), 200
 
@@ -106,12 +109,117 @@ def get_receivements():
         return jsonify({"error": "Dados inválidos", "details": e.errors()}), 400
     except ValueError as e:
         return jsonify({"error": str(e)}), 400
-    except Exception as e:
+    except Exception:
+        logger.exception("Erro não tratado em get_receivements")
+        return jsonify({"error": "Erro interno do servidor"}), 500
+
+
+@receivements_bp.route("/receivements/batch", methods=["POST"])
+@require_auth
+def batch_receivements():
+    try:
+        data = request.get_json()
+        # Valida o lote e cada operação com o DTO correspondente
+        batch = BatchDTO(**data)
+        operations, results = validate_operations(
+            batch.operations,
+            {"create": CreateReceivementDTO, "update": UpdateReceivementDTO, "patch": PatchReceivementDTO},
+        )
+
+        # No modo atômico um erro de validação já impede o lote
+        committed = False
+        if not (batch.atomic and results):
+            operation_results, committed = receivement_controller.batch_receivements(
+                user_id=request.user["id"],
+                operations=operations,
+                atomic=batch.atomic,
+            )
+            results.update(operation_results)
+
+        response = build_batch_response(batch, results, committed)
+
+        return jsonify(response), 200 if committed else 400
+
+    except ValidationError as e:
+        return jsonify({"error": "Dados inválidos", "details": e.errors()}), 400
+    except Exception:
+        logger.exception("Erro não tratado em batch_receivements")
+        return jsonify({"error": "Erro interno do servidor"}), 500
+
+
+@receivements_bp.route("/receivements/import", methods=["POST"])
+@require_auth
+def import_receivements():
+    try:
+        # Identifica o formato pelo Content-Type ou pelo parâmetro format
+        fmt = detect_import_format(request.mimetype, request.args.get("format"))
+
+        # Valida as linhas em lotes enquanto o corpo é lido, guardando-os
+        # antes de abrir a transação
+        report = ImportReport()
+        batches = spool_batches(validated_batches(
+            iter_records(request.stream, fmt), CreateReceivementDTO, report
+        ))
+
+        # Importa os recebimentos válidos em uma única transação
+        report.imported = receivement_controller.import_receivements(
+            user_id=request.user["id"], batches=batches
+        )
+
+        return jsonify(report.as_dict()), 200
+
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception:
+        logger.exception("Erro não tratado em import_receivements")
+        return jsonify({"error": "Erro interno do servidor"}), 500
+
+
+@receivements_bp.route("/receivements/export", methods=["GET"])
+@require_auth
+def export_receivements():
+    try:
+        # Converte as datas de string para date
+        start_date = request.args.get("start_date")
+        end_date = request.args.get("end_date")
+        fmt = validate_export_format(request.args.get("format", "csv"))
+
+        params = {}
+
+        if start_date:
+            params["start_date"] = datetime.strptime(start_date, "%Y-%m-%d").date()
+        if end_date:
+            params["end_date"] = datetime.strptime(end_date, "%Y-%m-%d").date()
+
+        # Valida os filtros usando o mesmo DTO da listagem
+        query_params = GetReceivementsDTO(**params)
+        query_params.validate_dates()
+
+        # As linhas são lidas do banco à medida que a resposta é enviada
+        rows = receivement_controller.export_receivements(
+            user_id=request.user["id"],
+            start_date=query_params.start_date,
+            end_date=query_params.end_date,
+        )
+
+        return Response(
+            stream_rows(rows, EXPORT_COLUMNS, fmt),
+            mimetype=EXPORT_MIMETYPES[fmt],
+            headers={"Content-Disposition": f"attachment; filename=receivements.{fmt}"},
+        )
+
+    except ValidationError as e:
+        return jsonify({"error": "Dados inválidos", "details": e.errors()}), 400
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception:
+        logger.exception("Erro não tratado em export_receivements")
         return jsonify({"error": "Erro interno do servidor"}), 500
 
 
 @receivements_bp.route("/receivements/<int:receivement_id>", methods=["GET"])
 @require_auth
+@conditional_get('receivements')
 def get_receivement_by_id(receivement_id):
     try:
         # Busca o recebimento específico
@@ -124,7 +232,8 @@ def get_receivement_by_id(receivement_id):
             
         return jsonify(receivement), 200
 
-    except Exception as e:
+    except Exception:
+        logger.exception("Erro não tratado em get_receivement_by_id")
         return jsonify({"error": "Erro interno do servidor"}), 500
 
 
@@ -153,7 +262,8 @@ def update_receivement(receivement_id):
 
     except ValidationError as e:
         return jsonify({"error": "Dados inválidos", "details": e.errors()}), 400
-    except Exception as e:
+    except Exception:
+        logger.exception("Erro não tratado em update_receivement")
         return jsonify({"error": "Erro interno do servidor"}), 500
 
 
@@ -180,7 +290,8 @@ def patch_receivement(receivement_id):
 
     except ValidationError as e:
         return jsonify({"error": "Dados inválidos", "details": e.errors()}), 400
-    except Exception as e:
+    except Exception:
+        logger.exception("Erro não tratado em patch_receivement")
         return jsonify({"error": "Erro interno do servidor"}), 500
 
 
@@ -198,5 +309,6 @@ def delete_receivement(receivement_id):
             
         return "", 204
 
-    except Exception as e:
+    except Exception:
+        logger.exception("Erro não tratado em delete_receivement")
         return jsonify({"error": "Erro interno do servidor"}), 500
\ No newline at end of file
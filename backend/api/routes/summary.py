@@ -0,0 +1,55 @@
+import logging
+from flask import Blueprint, request, jsonify
+from api.controllers.summary_controller import SummaryController
+from api.dtos.summary_dto import GetSummaryDTO
+from api.middlewares.auth_middleware import require_auth
+from api.middlewares.etag_middleware import conditional_get
+from pydantic import ValidationError
+from datetime import datetime
+
+summary_bp = Blueprint("summary", __name__)
+logger = logging.getLogger(__name__)
+summary_controller = SummaryController()
+
+
+@summary_bp.route("/summary", methods=["GET"])
+@require_auth
+@conditional_get("costs", "receivements")
+def get_summary():
+    try:
+        # Converte as datas de string para date
+        start_date = request.args.get("start_date")
+        end_date = request.args.get("end_date")
+
+        params = {}
+
+        group_by = request.args.get("group_by")
+        if group_by:
+            params["group_by"] = group_by
+
+        if start_date:
+            params["start_date"] = datetime.strptime(start_date, "%Y-%m-%d").date()
+        if end_date:
+            params["end_date"] = datetime.strptime(end_date, "%Y-%m-%d").date()
+
+        # Valida os parâmetros usando o DTO
+        query_params = GetSummaryDTO(**params)
+        query_params.validate_dates()
+
+        # Calcula os totais no banco
+        summary = summary_controller.get_summary(
+            user_id=request.user["id"],
+            start_date=query_params.start_date,
+            end_date=query_params.end_date,
+            group_by=query_params.group_by,
+        )
+
+        return jsonify(summary), 200
+
+    except ValidationError as e:
+        return jsonify({"error": "Dados inválidos", "details": e.errors()}), 400
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception:
+        logger.exception("Erro não tratado em get_summary")
+        return jsonify({"error": "Erro interno do servidor"}), 500
@@ -0,0 +1,81 @@
+import logging
+from flask import Blueprint, request, jsonify
+from api.controllers.transaction_controller import TRANSACTION_TABLES, TransactionController
+from api.dtos.transaction_dto import GetTransactionsDTO
+from api.middlewares.auth_middleware import require_auth
+from api.middlewares.etag_middleware import conditional_get
+from api.tools.pagination import pagination_links
+from api.tools.cursor import decode_kind_cursor
+from pydantic import ValidationError
+from datetime import datetime
+
+transactions_bp = Blueprint("transactions", __name__)
+logger = logging.getLogger(__name__)
+transaction_controller = TransactionController()
+
+
+@transactions_bp.route("/transactions", methods=["GET"])
+@require_auth
+@conditional_get("costs", "receivements")
+def get_transactions():
+    try:
+        # Converte as datas de string para date
+        start_date = request.args.get("start_date")
+        end_date = request.args.get("end_date")
+
+        params = {
+            "page": request.args.get("page", 1, type=int),
+            "page_size": request.args.get("page_size", 20, type=int),
+        }
+
+        include_total = request.args.get("include_total")
+        if include_total is not None:
+            params["include_total"] = include_total
+
+        cursor = request.args.get("cursor")
+        if cursor:
+            params["cursor"] = cursor
+
+        kind = request.args.get("type")
+        if kind:
+            params["type"] = kind
+
+        if start_date:
+            params["start_date"] = datetime.strptime(start_date, "%Y-%m-%d").date()
+        if end_date:
+            params["end_date"] = datetime.strptime(end_date, "%Y-%m-%d").date()
+
+        # Valida os parâmetros usando o DTO
+        query_params = GetTransactionsDTO(**params)
+        query_params.validate_dates()
+
+        # Busca gastos e receitas numa única consulta
+        result = transaction_controller.get_transactions(
+            user_id=request.user["id"],
+            start_date=query_params.start_date,
+            end_date=query_params.end_date,
+            kind=query_params.type,
+            page=query_params.page,
+            page_size=query_params.page_size,
+            include_total=query_params.include_total,
+            cursor=decode_kind_cursor(query_params.cursor, TRANSACTION_TABLES) if query_params.cursor else None
+        )
+
+        # Adiciona links de paginação
+        result["links"] = pagination_links(
+            request.base_url,
+            result["pagination"],
+            cursor_mode=bool(query_params.cursor),
+            include_total=query_params.include_total,
+            filters={"start_date": start_date, "end_date": end_date, "type": query_params.type},
+        )
+
+        return jsonify(result), 200
+
+    except ValidationError as e:
+        return jsonify({"error": "Dados inválidos", "details": e.errors()}), 400
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception:
+        logger.exception("Erro não tratado em get_transactions")
+        return jsonify({"error": "Erro interno do servidor"}), 500
@@ -1,9 +1,12 @@
+import logging
 from flask import Blueprint, request, jsonify
 from api.controllers.user_controller import UserController
-from api.dtos.user_dto import CreateUserDTO, LoginUserDTO
+from api.dtos.user_dto import CreateUserDTO, LoginUserDTO, RefreshTokenDTO
+from api.tools.password import PasswordHasherBusy
 from pydantic import ValidationError
 
 users_bp = Blueprint("users", __name__)
+logger = logging.getLogger(__name__)
 user_controller = UserController()
 
 
@@ -21,11 +24,15 @@ def create_user():
 
         return jsonify(new_user), 201
 
+    except PasswordHasherBusy as e:
+        # Limite de hashes simultâneos atingido: o cliente tenta de novo
+        return jsonify({"error": str(e)}), 503, {"Retry-After": "1"}
     except ValidationError as e:
         return jsonify({"error": "Dados inválidos", "details": e.errors()}), 400
     except ValueError as e:
         return jsonify({"error": str(e)}), 400
-    except Exception as e:
+    except Exception:
+        logger.exception("Erro não tratado em create_user")
         return jsonify({"error": "Erro interno do servidor"}), 500
 
 
@@ -43,9 +50,53 @@ def login():
 
         return jsonify(result), 200
 
+    except PasswordHasherBusy as e:
+        # Limite de hashes simultâneos atingido: o cliente tenta de novo
+        return jsonify({"error": str(e)}), 503, {"Retry-After": "1"}
     except ValidationError as e:
         return jsonify({"error": "Dados inválidos", "details": e.errors()}), 400
     except ValueError as e:
         return jsonify({"error": str(e)}), 401
-    except Exception as e:
+    except Exception:
+        logger.exception("Erro não tratado em login")
+        return jsonify({"error": "Erro interno do servidor"}), 500
+
+
+@users_bp.route("/users/refresh", methods=["POST"])
+def refresh():
+    try:
+        data = request.get_json()
+        # Valida os dados recebidos usando o DTO
+        token_data = RefreshTokenDTO(**data)
+
+        # Rotaciona o refresh token e emite um novo token de acesso
+        result = user_controller.refresh(refresh_token=token_data.refresh_token)
+
+        return jsonify(result), 200
+
+    except ValidationError as e:
+        return jsonify({"error": "Dados inválidos", "details": e.errors()}), 400
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 401
+    except Exception:
+        logger.exception("Erro não tratado em refresh")
+        return jsonify({"error": "Erro interno do servidor"}), 500
+
+
+@users_bp.route("/users/logout", methods=["POST"])
+def logout():
+    try:
+        data = request.get_json()
+        # Valida os dados recebidos usando o DTO
+        token_data = RefreshTokenDTO(**data)
+
+        # Revoga o refresh token da sessão
+        user_controller.logout(refresh_token=token_data.refresh_token)
+
+        return "", 204
+
+    except ValidationError as e:
+        return jsonify({"error": "Dados inválidos", "details": e.errors()}), 400
+    except Exception:
+        logger.exception("Erro não tratado em logout")
         return jsonify({"error": "Erro interno do servidor"}), 500
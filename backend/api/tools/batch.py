@@ -0,0 +1,60 @@
+from api.dtos.batch_dto import BatchDTO, BatchOperationDTO
+from pydantic import BaseModel, ValidationError
+from typing import Dict, List, Optional, Tuple, Type
+
+
+def validate_operations(
+    operations: List[BatchOperationDTO],
+    dtos: Dict[str, Type[BaseModel]],
+) -> Tuple[List[Tuple[int, str, Optional[int], Optional[BaseModel]]], Dict[int, dict]]:
+    # Separa operações válidas dos erros, indexados pela posição no lote
+    valid = []
+    errors = {}
+    seen_ids = set()
+
+    for index, operation in enumerate(operations):
+        if operation.op != "create":
+            if operation.id is None:
+                errors[index] = {"status": 400, "error": "id é obrigatório para esta operação"}
+                continue
+            # Cada registro só pode aparecer uma vez para o resultado ser determinístico
+            if operation.id in seen_ids:
+                errors[index] = {"status": 400, "error": "id repetido no lote"}
+                continue
+            seen_ids.add(operation.id)
+
+        dto = None
+        if operation.op != "delete":
+            try:
+                dto = dtos[operation.op](**(operation.data or {}))
+            except ValidationError as e:
+                errors[index] = {
+                    "status": 400,
+                    "error": "Dados inválidos",
+                    "details": [
+                        {"field": ".".join(str(loc) for loc in err["loc"]), "message": err["msg"]}
+                        for err in e.errors()
+                    ],
+                }
+                continue
+
+        valid.append((index, operation.op, operation.id, dto))
+
+    return valid, errors
+
+
+def build_batch_response(batch: BatchDTO, results: Dict[int, dict], committed: bool) -> dict:
+    items = []
+
+    for index, operation in enumerate(batch.operations):
+        result = results.get(index)
+        if result is None:
+            # Operação válida desfeita porque outra falhou no modo atômico
+            result = {"status": 424, "error": "Operação desfeita por falha em outra operação do lote"}
+        items.append({"index": index, "op": operation.op, "id": operation.id, **result})
+
+    return {
+        "atomic": batch.atomic,
+        "committed": committed,
+        "results": items,
+    }
@@ -0,0 +1,282 @@
+import functools, hashlib, inspect, logging, os, pickle, threading, time
+from collections import OrderedDict
+from flask import g, has_request_context
+from typing import Callable, Optional
+
+try:
+    import redis
+except ImportError:  # pragma: no cover - depende do ambiente
+    redis = None
+
+
+logger = logging.getLogger(__name__)
+
+CACHE_BACKEND = os.getenv('CACHE_BACKEND', 'memory')
+CACHE_TTL = float(os.getenv('CACHE_TTL', 30))
+CACHE_MAXSIZE = int(os.getenv('CACHE_MAXSIZE', 10000))
+CACHE_URL = os.getenv('CACHE_URL', 'redis://localhost:6379/0')
+CACHE_PREFIX = os.getenv('CACHE_PREFIX', 'myfinance')
+# Contadores de versão no redis; precisam viver mais que as entradas
+CACHE_VERSION_TTL = float(os.getenv('CACHE_VERSION_TTL', 86400))
+
+
+class MemoryBackend:
+    def __init__(self, maxsize: int = CACHE_MAXSIZE, ttl: float = CACHE_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        # Versões ficam fora do LRU: perder uma versão traria de volta entradas antigas
+        self._counters = {}
+        self._lock = threading.Lock()
+        self._evictions = 0
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes):
+        if self.maxsize <= 0:
+            return
+
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            # Remove os menos usados recentemente ao passar do limite
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def counter(self, key: str) -> int:
+        with self._lock:
+            return self._counters.get(key, 0)
+
+    def incr(self, key: str) -> int:
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + 1
+            return self._counters[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._counters.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "backend": "memory",
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "evictions": self._evictions,
+            }
+
+
+class RedisBackend:
+    def __init__(self, url: str = CACHE_URL, ttl: float = CACHE_TTL, version_ttl: float = CACHE_VERSION_TTL):
+        if redis is None:
+            raise RuntimeError("Pacote redis não instalado")
+
+        self.ttl = ttl
+        self.version_ttl = max(version_ttl, ttl * 2)
+        self.client = redis.Redis.from_url(url)
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.client.get(key)
+
+    def set(self, key: str, value: bytes):
+        self.client.set(key, value, px=int(self.ttl * 1000))
+
+    def counter(self, key: str) -> int:
+        return int(self.client.get(key) or 0)
+
+    def incr(self, key: str) -> int:
+        # Cada escrita renova a expiração; um contador que expira já não
+        # tem entradas vivas
+        pipeline = self.client.pipeline()
+        pipeline.incr(key)
+        pipeline.expire(key, int(self.version_ttl))
+        return pipeline.execute()[0]
+
+    def clear(self):
+        for key in self.client.scan_iter(f"{CACHE_PREFIX}:*"):
+            self.client.delete(key)
+
+    def stats(self) -> dict:
+        return {"backend": "redis"}
+
+
+class NullBackend:
+    def get(self, key: str):
+        return None
+
+    def set(self, key: str, value: bytes):
+        pass
+
+    def counter(self, key: str) -> int:
+        return 0
+
+    def incr(self, key: str) -> int:
+        return 0
+
+    def clear(self):
+        pass
+
+    def stats(self) -> dict:
+        return {"backend": "none"}
+
+
+BACKENDS = {
+    "memory": MemoryBackend,
+    "redis": RedisBackend,
+    "none": NullBackend,
+}
+
+
+class ReadCache:
+    def __init__(self, backend):
+        self.backend = backend
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "invalidations": 0, "errors": 0}
+
+    def _count(self, stat: str):
+        with self._lock:
+            self._stats[stat] += 1
+
+    def _version_key(self, user_id: int) -> str:
+        return f"{CACHE_PREFIX}:v:{user_id}"
+
+    def version(self, user_id: int) -> int:
+        return self.backend.counter(self._version_key(user_id))
+
+    def get_or_load(self, user_id: int, namespace: str, params: tuple, loader: Callable):
+        # A versão do usuário faz parte da chave: uma escrita torna todas as
+        # entradas anteriores inalcançáveis, sem precisar procurá-las
+        try:
+            digest = hashlib.sha1(repr(params).encode()).hexdigest()
+            key = f"{CACHE_PREFIX}:{namespace}:{user_id}:{self.version(user_id)}:{digest}"
+            cached = self.backend.get(key)
+        except Exception:
+            # Cache indisponível nunca derruba a leitura
+            self._count("errors")
+            logger.warning("Falha ao consultar o cache", exc_info=True)
+            return loader()
+
+        if cached is not None:
+            self._count("hits")
+            # Cada leitura recebe a sua cópia, que as rotas podem alterar
+            return pickle.loads(cached)
+
+        self._count("misses")
+        value = loader()
+
+        try:
+            self.backend.set(key, pickle.dumps(value, pickle.HIGHEST_PROTOCOL))
+        except Exception:
+            self._count("errors")
+            logger.warning("Falha ao gravar no cache", exc_info=True)
+
+        return value
+
+    def invalidate(self, user_id: int):
+        try:
+            self.backend.incr(self._version_key(user_id))
+            self._count("invalidations")
+        except Exception:
+            self._count("errors")
+            logger.warning("Falha ao invalidar o cache", exc_info=True)
+
+    def clear(self):
+        self.backend.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_ratio"] = round(stats["hits"] / lookups, 4) if lookups else None
+        return {**self.backend.stats(), **stats}
+
+
+_read_cache = None
+_read_cache_lock = threading.Lock()
+
+
+def get_read_cache() -> ReadCache:
+    global _read_cache
+
+    if _read_cache is None:
+        with _read_cache_lock:
+            if _read_cache is None:
+                if CACHE_BACKEND not in BACKENDS:
+                    raise ValueError(f"Backend de cache desconhecido: {CACHE_BACKEND}")
+                _read_cache = ReadCache(BACKENDS[CACHE_BACKEND]())
+
+    return _read_cache
+
+
+_version_controller = None
+
+
+def data_versions(user_id: int, resources: tuple) -> tuple:
+    # Versões do data_versions, que mudam no commit da escrita em qualquer
+    # worker: as lidas pelo conditional_get desta requisição ou, sem ele,
+    # uma busca pela chave primária. Com elas na chave, o backend memory de
+    # um worker não serve dados anteriores a escritas feitas em outro
+    global _version_controller
+
+    versions = g.get("data_versions") if has_request_context() else None
+    if not versions or not versions.keys() >= set(resources):
+        if _version_controller is None:
+            from api.controllers.version_controller import VersionController
+            _version_controller = VersionController()
+        versions = _version_controller.get_versions(user_id, resources)
+
+    return tuple((resource, versions[resource]) for resource in sorted(resources))
+
+
+def cached(namespace: str, *resources: str):
+    # Decora leituras cujo primeiro argumento (após self) é o user_id;
+    # resources são as tabelas do data_versions de que a leitura depende
+    def decorator(fn):
+        signature = inspect.signature(fn)
+
+        @functools.wraps(fn)
+        def wrapper(self, user_id, *args, **kwargs):
+            try:
+                versions = data_versions(user_id, resources)
+            except Exception:
+                logger.warning("Falha ao consultar versões dos dados; leitura sem cache", exc_info=True)
+                return fn(self, user_id, *args, **kwargs)
+
+            bound = signature.bind(self, user_id, *args, **kwargs)
+            bound.apply_defaults()
+            params = tuple(bound.arguments.items())[2:] + versions
+
+            return get_read_cache().get_or_load(
+                user_id, namespace, params, lambda: fn(self, user_id, *args, **kwargs)
+            )
+
+        return wrapper
+
+    return decorator
+
+
+def invalidates(fn):
+    # Decora escritas: qualquer alteração do usuário descarta as leituras em cache
+    @functools.wraps(fn)
+    def wrapper(self, user_id, *args, **kwargs):
+        try:
+            return fn(self, user_id, *args, **kwargs)
+        finally:
+            get_read_cache().invalidate(user_id)
+
+    return wrapper
@@ -0,0 +1,41 @@
+import base64, binascii, json
+from datetime import date, datetime
+from typing import Callable, Iterable, Optional, Tuple, Union
+
+
+def encode_cursor(sort_value: Union[date, datetime], item_id: int, kind: Optional[str] = None) -> str:
+    # Cursor opaco com a chave (data, id) do último item entregue; listas que
+    # misturam tabelas incluem o tipo, já que os ids se repetem entre elas
+    key = [sort_value.isoformat(), item_id]
+    if kind is not None:
+        key.append(kind)
+    raw = json.dumps(key, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(
+    cursor: str, parse: Callable[[str], Union[date, datetime]] = date.fromisoformat
+) -> Tuple[Union[date, datetime], int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_value, item_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(item_id, int):
+            raise ValueError
+        return parse(sort_value), item_id
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError):
+        raise ValueError("Cursor de paginação inválido")
+
+
+def decode_kind_cursor(
+    cursor: str,
+    kinds: Iterable[str],
+    parse: Callable[[str], Union[date, datetime]] = date.fromisoformat,
+) -> Tuple[Union[date, datetime], int, str]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_value, item_id, kind = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(item_id, int) or kind not in kinds:
+            raise ValueError
+        return parse(sort_value), item_id, kind
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError):
+        raise ValueError("Cursor de paginação inválido")
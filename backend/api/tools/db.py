@@ -1,54 +1,358 @@
-import psycopg2, os
+import hashlib, logging, psycopg2, psycopg2.errors, os, re, threading, time
+from collections import deque
+from contextlib import contextmanager
+from functools import lru_cache
 from dotenv import load_dotenv
-from psycopg2.extras import DictCursor
+from psycopg2 import extensions
+from psycopg2.pool import PoolError
+from api.tools.metrics import record_acquire, record_query
+from typing import List, Optional
 
 
 load_dotenv()
 
-class DB:
-    def __init__(self, params_db=None):
-        self.conn = None
+logger = logging.getLogger(__name__)
+
+# Comandos frequentes viram PREPARE/EXECUTE; desligue atrás de um pgbouncer
+# em modo transaction, onde a sessão do servidor muda a cada transação
+PREPARED_STATEMENTS = os.getenv('DB_PREPARED_STATEMENTS', '1') == '1'
+
+_PLACEHOLDER = re.compile(r"%(s|%)")
+
+
+def get_db_params() -> dict:
+    return {
+        "dbname": os.getenv('DB_NAME'),
+        "user": os.getenv('DB_USER'),
+        "password": os.getenv('DB_PASSWORD'),
+        "host": os.getenv('DB_HOST'),
+        "port": os.getenv('DB_PORT'),
+    }
+
+
+def column_names(cur) -> List[str]:
+    return [column.name for column in cur.description]
+
+
+def as_dict(cur, row) -> Optional[dict]:
+    # Linhas chegam como tuplas; o dict é montado uma única vez, já para a resposta
+    if row is None:
+        return None
+    return dict(zip(column_names(cur), row))
+
+
+def as_dicts(cur, rows) -> List[dict]:
+    columns = column_names(cur)
+    return [dict(zip(columns, row)) for row in rows]
+
+
+class InstrumentedCursor(extensions.cursor):
+    # Soma o tempo de cada comando às métricas da requisição em andamento
+    def execute(self, query, vars=None):
+        start = time.perf_counter()
+        try:
+            return super().execute(query, vars)
+        finally:
+            record_query(time.perf_counter() - start)
+
+    def executemany(self, query, vars_list):
+        start = time.perf_counter()
+        try:
+            return super().executemany(query, vars_list)
+        finally:
+            record_query(time.perf_counter() - start)
+
+    def copy_expert(self, sql, file, size=8192):
+        start = time.perf_counter()
+        try:
+            return super().copy_expert(sql, file, size)
+        finally:
+            record_query(time.perf_counter() - start)
+
+
+class TrackedConnection(extensions.connection):
+    # Comandos já preparados nesta sessão do servidor; uma reconexão cria
+    # outro objeto, então tudo é preparado de novo na conexão nova
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.prepared = set()
+
+
+@lru_cache(maxsize=1024)
+def _prepared_form(query: str):
+    # Nome estável derivado do texto e o comando com parâmetros posicionais
+    name = "q_" + hashlib.sha1(query.encode()).hexdigest()[:16]
+    count = 0
+
+    def positional(match):
+        nonlocal count
+        if match.group(1) == "%":
+            return "%"
+        count += 1
+        return f"${count}"
+
+    return name, _PLACEHOLDER.sub(positional, query), count
+
+
+def to_positional(query: str) -> str:
+    # O mesmo comando com $1, $2... no lugar de %s, como pede o asyncpg
+    return _prepared_form(query)[1]
+
+
+def execute_prepared(cur, query: str, params=()):
+    # Executa um comando com %s via PREPARE na primeira vez em cada conexão
+    # e EXECUTE nas seguintes: o servidor pula análise e, após algumas
+    # execuções, reaproveita o plano genérico
+    prepared = getattr(cur.connection, "prepared", None)
+    if not PREPARED_STATEMENTS or prepared is None:
+        return cur.execute(query, params)
+
+    name, positional, count = _prepared_form(query)
+    if name not in prepared:
+        # O PREPARE não é desfeito por rollback: só é marcado se tiver sucesso
+        cur.execute(f"PREPARE {name} AS {positional}")
+        prepared.add(name)
+
+    try:
+        if count:
+            return cur.execute(f"EXECUTE {name} ({', '.join(['%s'] * count)})", params)
+        return cur.execute(f"EXECUTE {name}")
+    except psycopg2.errors.InvalidSqlStatementName:
+        # A sessão perdeu os comandos (ex.: DISCARD ALL): a transação atual
+        # falha, mas o próximo uso desta conexão prepara tudo de novo
+        prepared.clear()
+        raise
+
+
+class ConnectionPool:
+    def __init__(
+        self,
+        params_db: dict,
+        minconn: int = 1,
+        maxconn: int = 10,
+        timeout: float = 30.0,
+        healthcheck_interval: float = 30.0,
+    ):
+        if minconn < 0 or maxconn < 1 or minconn > maxconn:
+            raise ValueError("Tamanhos de pool inválidos")
+
         self.params_db = params_db
+        self.minconn = minconn
+        self.maxconn = maxconn
+        self.timeout = timeout
+        self.healthcheck_interval = healthcheck_interval
 
+        self._cond = threading.Condition()
+        # Conexões livres com o instante em que foram devolvidas
+        self._idle = deque()
+        self._size = 0
+        self._closed = False
+        self._stats = {
+            "checkouts": 0,
+            "waits": 0,
+            "timeouts": 0,
+            "recycled": 0,
+            "healthchecks": 0,
+        }
 
-    def get_connection(self):
-        dbname = os.getenv('DB_NAME')
-        user = os.getenv('DB_USER')
-        password = os.getenv('DB_PASSWORD')
-        host = os.getenv('DB_HOST')
-        port = os.getenv('DB_PORT')
+        for _ in range(minconn):
+            self._idle.append((self._connect(), time.monotonic()))
+            self._size += 1
+
+    def _connect(self):
+        return psycopg2.connect(
+            connection_factory=TrackedConnection,
+            cursor_factory=InstrumentedCursor,
+            **self.params_db,
+        )
+
+    def _is_healthy(self, conn, idle_since: float) -> bool:
+        # Sockets mortos são detectados sem ida ao banco
+        if conn.closed != 0:
+            return False
+
+        if time.monotonic() - idle_since < self.healthcheck_interval:
+            return True
 
+        # Conexão parada há muito tempo: confirma que ainda responde
+        with self._cond:
+            self._stats["healthchecks"] += 1
         try:
-            if self.params_db:
-                self.conn = psycopg2.connect(**self.params_db)
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    def _discard(self, conn):
+        try:
+            conn.close()
+        except psycopg2.Error:
+            pass
+
+    def getconn(self):
+        deadline = time.monotonic() + self.timeout
+
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise PoolError("Pool de conexões fechado")
+
+                if self._idle:
+                    conn, idle_since = self._idle.pop()
+                    break
+
+                if self._size < self.maxconn:
+                    # Reserva a vaga e conecta fora do lock
+                    self._size += 1
+                    conn, idle_since = None, None
+                    break
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._stats["timeouts"] += 1
+                    raise PoolError("Tempo esgotado aguardando conexão do pool")
+
+                self._stats["waits"] += 1
+                self._cond.wait(remaining)
+
+            self._stats["checkouts"] += 1
+
+        if conn is not None and self._is_healthy(conn, idle_since):
+            return conn
+
+        if conn is not None:
+            with self._cond:
+                self._stats["recycled"] += 1
+            self._discard(conn)
+
+        try:
+            return self._connect()
+        except Exception:
+            # Libera a vaga reservada para não encolher o pool
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
+
+    def putconn(self, conn, close: bool = False):
+        if not close and conn.closed == 0:
+            try:
+                # Nunca devolve ao pool uma transação aberta ou abortada
+                if conn.info.transaction_status != extensions.TRANSACTION_STATUS_IDLE:
+                    conn.rollback()
+            except psycopg2.Error:
+                close = True
+        else:
+            close = True
+
+        if close:
+            self._discard(conn)
+
+        with self._cond:
+            if close or self._closed:
+                self._size -= 1
+                if not close:
+                    self._discard(conn)
             else:
-                self.conn = psycopg2.connect(dbname=dbname, user=user, password=password, host=host, port=port)
-            print("Conectado ao banco de dados")
-        except Exception as e:
-            print(f"Erro ao conectar no banco de dados: {e}")
-            self.conn = None
+                self._idle.append((conn, time.monotonic()))
+            self._cond.notify()
 
-        return self.conn
+    def closeall(self):
+        with self._cond:
+            self._closed = True
+            while self._idle:
+                conn, _ = self._idle.pop()
+                self._discard(conn)
+                self._size -= 1
+            self._cond.notify_all()
 
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "min": self.minconn,
+                "max": self.maxconn,
+                "size": self._size,
+                "idle": len(self._idle),
+                "in_use": self._size - len(self._idle),
+                **self._stats,
+            }
 
-    def is_connected(self):
-        # Verifica se a conexão está aberta
-        if self.conn is not None and self.conn.closed == 0:
-            print("Conexão está aberta")
-            return True
-     
-        print("Conexão está fechada")
-        return False
+
+_pool = None
+_pool_lock = threading.Lock()
 
 
-    def close_connection(self):
-        # Fecha a conexão se estiver aberta
-        if self.conn is not None and self.conn.closed == 0:
-            self.conn.close()
-            print("Conexão fechada com sucesso")
-            return
- 
-        print("Conexão já estava fechada ou não foi estabelecida")
+def get_pool() -> ConnectionPool:
+    global _pool
 
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(
+                    get_db_params(),
+                    minconn=int(os.getenv('DB_POOL_MIN', 1)),
+                    maxconn=int(os.getenv('DB_POOL_MAX', 10)),
+                    timeout=float(os.getenv('DB_POOL_TIMEOUT', 30)),
+                    healthcheck_interval=float(os.getenv('DB_POOL_HEALTHCHECK_INTERVAL', 30)),
+                )
+                logger.info("Pool de conexões criado", extra={"minconn": _pool.minconn, "maxconn": _pool.maxconn})
+
+    return _pool
+
+
+def pool_stats() -> Optional[dict]:
+    # Não cria o pool só para relatar estatísticas
+    pool = _pool
+    return pool.stats() if pool is not None else None
+
+
+def reset_pool_after_fork():
+    global _pool, _pool_lock
+
+    # As conexões herdadas pertencem ao processo pai: apenas esquece o pool,
+    # sem fechá-las (o close enviaria o Terminate pelo socket compartilhado)
+    _pool = None
+    _pool_lock = threading.Lock()
+
+
+def close_pool():
+    global _pool
+
+    with _pool_lock:
+        if _pool is not None:
+            _pool.closeall()
+            _pool = None
+
+
+class DB:
+    def __init__(self, params_db=None):
+        self.params_db = params_db
+        self._pool = None
+
+    @property
+    def pool(self) -> ConnectionPool:
+        if self.params_db is None:
+            return get_pool()
+
+        # Parâmetros explícitos ganham um pool próprio
+        if self._pool is None:
+            self._pool = ConnectionPool(self.params_db)
+        return self._pool
+
+    @contextmanager
+    def connection(self):
+        # Empresta uma conexão do pool; o commit fica a cargo de quem usa
+        pool = self.pool
+        start = time.perf_counter()
+        conn = pool.getconn()
+        record_acquire(time.perf_counter() - start)
+        try:
+            yield conn
+        finally:
+            # putconn desfaz qualquer transação deixada aberta
+            pool.putconn(conn)
 
-    
\ No newline at end of file
+    def stats(self) -> dict:
+        return self.pool.stats()
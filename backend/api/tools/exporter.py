@@ -0,0 +1,60 @@
+import csv, io, json, os
+from typing import Iterable, Iterator, Sequence
+
+
+EXPORT_ITERSIZE = int(os.getenv("EXPORT_ITERSIZE", 2000))
+EXPORT_CHUNK_ROWS = int(os.getenv("EXPORT_CHUNK_ROWS", 500))
+
+EXPORT_MIMETYPES = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+
+
+def validate_export_format(fmt: str) -> str:
+    if fmt not in EXPORT_MIMETYPES:
+        raise ValueError("Formato de exportação inválido, use csv ou ndjson")
+    return fmt
+
+
+def _chunks(lines: Iterable[str], chunk_rows: int) -> Iterator[str]:
+    # Agrupa linhas para não enviar um pedaço HTTP por registro
+    chunk = []
+    for line in lines:
+        chunk.append(line)
+        if len(chunk) >= chunk_rows:
+            yield "".join(chunk)
+            chunk = []
+    if chunk:
+        yield "".join(chunk)
+
+
+def _csv_lines(rows: Iterable[Sequence], columns: Sequence[str]) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    writer.writerow(columns)
+    for row in rows:
+        writer.writerow(row)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+    # Cabeçalho de exportações vazias
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def _ndjson_lines(rows: Iterable[Sequence], columns: Sequence[str]) -> Iterator[str]:
+    for row in rows:
+        yield json.dumps(dict(zip(columns, row)), default=str, ensure_ascii=False) + "\n"
+
+
+def stream_rows(
+    rows: Iterable[Sequence],
+    columns: Sequence[str],
+    fmt: str,
+    chunk_rows: int = EXPORT_CHUNK_ROWS,
+) -> Iterator[str]:
+    lines = _csv_lines(rows, columns) if fmt == "csv" else _ndjson_lines(rows, columns)
+    return _chunks(lines, chunk_rows)
@@ -0,0 +1,153 @@
+import csv, io, json, os, pickle, tempfile
+from pydantic import BaseModel, ValidationError
+from typing import Iterable, Iterator, List, Optional, Tuple, Type
+
+
+IMPORT_BATCH_SIZE = int(os.getenv("IMPORT_BATCH_SIZE", 1000))
+IMPORT_MAX_ERRORS = int(os.getenv("IMPORT_MAX_ERRORS", 100))
+# Lotes validados acima deste tamanho (bytes) vão da memória para o disco
+IMPORT_SPOOL_MAX_MEMORY = int(os.getenv("IMPORT_SPOOL_MAX_MEMORY", 8 * 1024 * 1024))
+
+CSV_CONTENT_TYPES = ("text/csv", "application/csv")
+NDJSON_CONTENT_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+
+
+class ImportReport:
+    def __init__(self, max_errors: int = IMPORT_MAX_ERRORS):
+        self.max_errors = max_errors
+        self.imported = 0
+        self.failed = 0
+        self.errors = []
+
+    def add_error(self, line: int, details: List[dict]):
+        # Guarda só os primeiros erros para a memória não crescer com o arquivo
+        self.failed += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append({"line": line, "errors": details})
+
+    def as_dict(self) -> dict:
+        return {
+            "imported": self.imported,
+            "failed": self.failed,
+            "errors": self.errors,
+            "errors_truncated": self.failed > len(self.errors),
+        }
+
+
+def detect_import_format(content_type: Optional[str], requested: Optional[str] = None) -> str:
+    if requested:
+        if requested not in ("csv", "ndjson"):
+            raise ValueError("Formato de importação inválido, use csv ou ndjson")
+        return requested
+
+    mimetype = (content_type or "").split(";")[0].strip().lower()
+    if mimetype in CSV_CONTENT_TYPES:
+        return "csv"
+    if mimetype in NDJSON_CONTENT_TYPES:
+        return "ndjson"
+
+    raise ValueError("Content-Type não suportado, envie text/csv ou application/x-ndjson")
+
+
+def iter_records(stream, fmt: str) -> Iterator[Tuple[int, Optional[dict], Optional[str]]]:
+    # Lê o corpo da requisição linha a linha, sem carregá-lo inteiro
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+
+    if fmt == "csv":
+        reader = csv.DictReader(text)
+        try:
+            for row in reader:
+                # Campos vazios usam o valor padrão do DTO
+                yield reader.line_num, {k: v for k, v in row.items() if k and v != ""}, None
+        except csv.Error as e:
+            # line_num ainda não conta a linha que falhou
+            raise ValueError(f"CSV inválido na linha {reader.line_num + 1}: {e}")
+        return
+
+    for line_number, line in enumerate(text, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            yield line_number, None, "JSON inválido"
+            continue
+        if not isinstance(record, dict):
+            yield line_number, None, "Cada linha deve ser um objeto JSON"
+            continue
+        yield line_number, record, None
+
+
+def validated_batches(
+    records: Iterable[Tuple[int, Optional[dict], Optional[str]]],
+    dto: Type[BaseModel],
+    report: ImportReport,
+    batch_size: int = IMPORT_BATCH_SIZE,
+) -> Iterator[List[Tuple[int, BaseModel]]]:
+    batch = []
+
+    for line, record, error in records:
+        if error:
+            report.add_error(line, [{"field": None, "message": error}])
+            continue
+
+        try:
+            batch.append((line, dto(**record)))
+        except ValidationError as e:
+            report.add_error(line, [
+                {"field": ".".join(str(loc) for loc in err["loc"]), "message": err["msg"]}
+                for err in e.errors()
+            ])
+            continue
+
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+
+    if batch:
+        yield batch
+
+
+def spool_batches(batches: Iterable[List[Tuple[int, BaseModel]]]) -> Iterator[List[Tuple[int, BaseModel]]]:
+    # Lê e valida o corpo inteiro antes de qualquer transação: um upload lento
+    # não segura uma conexão do pool nem as travas do saldo do usuário
+    spool = tempfile.SpooledTemporaryFile(max_size=IMPORT_SPOOL_MAX_MEMORY)
+    try:
+        for batch in batches:
+            pickle.dump(batch, spool, pickle.HIGHEST_PROTOCOL)
+        spool.seek(0)
+    except BaseException:
+        spool.close()
+        raise
+    return _read_spool(spool)
+
+
+def _read_spool(spool) -> Iterator[List[Tuple[int, BaseModel]]]:
+    with spool:
+        while True:
+            try:
+                yield pickle.load(spool)
+            except EOFError:
+                return
+
+
+def copy_value(value) -> str:
+    # Formato texto do COPY: \N para nulo e escape de separadores
+    if value is None:
+        return "\\N"
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+def copy_buffer(rows: Iterable[tuple]) -> io.StringIO:
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write("\t".join(copy_value(value) for value in row))
+        buffer.write("\n")
+    buffer.seek(0)
+    return buffer
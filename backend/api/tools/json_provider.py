@@ -0,0 +1,82 @@
+import dataclasses, decimal, json, os, uuid
+from datetime import date
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depende do ambiente
+    orjson = None
+
+
+# orjson (padrão quando instalado) ou stdlib
+JSON_ENCODER = os.getenv('JSON_ENCODER', 'orjson' if orjson else 'stdlib')
+
+
+def _default(o):
+    # Decimal vira string para não perder precisão, como o encoder padrão do Flask
+    if isinstance(o, decimal.Decimal):
+        return str(o)
+    if isinstance(o, date):
+        return o.isoformat()
+    if isinstance(o, uuid.UUID):
+        return str(o)
+    if dataclasses.is_dataclass(o) and not isinstance(o, type):
+        return dataclasses.asdict(o)
+    if hasattr(o, "__html__"):
+        return str(o.__html__())
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+
+def _orjson_dumps(obj, indent: bool = False) -> bytes:
+    # date/datetime/UUID/dataclass são nativos; chaves int aparecem nos lotes
+    option = orjson.OPT_NON_STR_KEYS
+    if indent:
+        option |= orjson.OPT_INDENT_2
+    return orjson.dumps(obj, default=_default, option=option)
+
+
+def _stdlib_dumps(obj, indent: bool = False) -> bytes:
+    return json.dumps(
+        obj,
+        default=_default,
+        ensure_ascii=False,
+        separators=None if indent else (",", ":"),
+        indent=2 if indent else None,
+    ).encode("utf-8")
+
+
+ENCODERS = {"stdlib": _stdlib_dumps}
+if orjson is not None:
+    ENCODERS["orjson"] = _orjson_dumps
+
+
+def get_encoder(name: str = JSON_ENCODER):
+    if name not in ENCODERS:
+        raise ValueError(f"Encoder JSON indisponível: {name}")
+    return ENCODERS[name]
+
+
+def dumps(obj, encoder: str = JSON_ENCODER) -> bytes:
+    return get_encoder(encoder)(obj)
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    # Ordenar as chaves custa caro e não muda o significado da resposta
+    sort_keys = False
+    encoder = JSON_ENCODER
+
+    def dumps(self, obj, **kwargs) -> str:
+        return get_encoder(self.encoder)(obj).decode("utf-8")
+
+    def loads(self, s, **kwargs):
+        if orjson is not None and self.encoder == "orjson":
+            return orjson.loads(s)
+        return json.loads(s, **kwargs)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = self.compact is False or (self.compact is None and self._app.debug)
+
+        # Os bytes vão direto para o corpo, sem decodificar e recodificar
+        body = get_encoder(self.encoder)(obj, indent=indent) + b"\n"
+        return self._app.response_class(body, mimetype=self.mimetype)
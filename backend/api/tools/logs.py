@@ -0,0 +1,115 @@
+import atexit, datetime, json, logging, os, queue, sys, threading, traceback
+from contextvars import ContextVar
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO').upper()
+LOG_FORMAT = os.getenv('LOG_FORMAT', 'json')
+LOG_QUEUE_SIZE = int(os.getenv('LOG_QUEUE_SIZE', 10000))
+
+# Id da requisição em andamento; None fora de requisições
+request_id: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+# Atributos padrão do LogRecord; o restante veio via extra= e vai para o JSON
+_RESERVED = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "request_id"}
+
+
+class RequestIdFilter(logging.Filter):
+    def filter(self, record) -> bool:
+        record.request_id = request_id.get()
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record) -> str:
+        entry = {
+            "ts": datetime.datetime.fromtimestamp(record.created, datetime.timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+
+        if getattr(record, "request_id", None):
+            entry["request_id"] = record.request_id
+
+        for key, value in vars(record).items():
+            if key not in _RESERVED:
+                entry[key] = value
+
+        if record.exc_info:
+            entry["exc"] = "".join(traceback.format_exception(*record.exc_info)).rstrip()
+
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class DroppingQueueHandler(QueueHandler):
+    # Com a fila cheia a mensagem é descartada: logar nunca bloqueia a requisição.
+    # O prepare() formata na thread de origem, onde o traceback ainda existe;
+    # a thread de escrita só grava a linha pronta
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+        self._lock_dropped = threading.Lock()
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._lock_dropped:
+                self.dropped += 1
+
+
+_listener: Optional[QueueListener] = None
+_handler: Optional[DroppingQueueHandler] = None
+
+
+def setup_logging(level: str = LOG_LEVEL, fmt: str = LOG_FORMAT, stream=None):
+    global _listener, _handler
+
+    stop_logging()
+
+    if fmt == 'json':
+        formatter = JsonFormatter()
+    else:
+        formatter = logging.Formatter('%(asctime)s %(levelname)s [%(request_id)s] %(name)s: %(message)s')
+
+    _handler = DroppingQueueHandler(queue.Queue(LOG_QUEUE_SIZE))
+    _handler.setFormatter(formatter)
+    _handler.addFilter(RequestIdFilter())
+
+    # A escrita no stdout acontece numa thread dedicada
+    writer = logging.StreamHandler(stream or sys.stdout)
+    writer.setFormatter(logging.Formatter('%(message)s'))
+    _listener = QueueListener(_handler.queue, writer)
+    _listener.start()
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(_handler)
+    root.setLevel(level)
+
+
+def stop_logging():
+    global _listener
+
+    # Esvazia a fila antes de encerrar o processo
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def reset_logging_after_fork():
+    global _listener
+
+    # A thread de escrita não existe no processo filho; recria fila e thread
+    _listener = None
+    setup_logging()
+
+
+def dropped_logs() -> int:
+    return _handler.dropped if _handler is not None else 0
+
+
+atexit.register(stop_logging)
@@ -0,0 +1,129 @@
+import bisect, threading, time
+from contextvars import ContextVar
+from typing import Dict, Optional, Tuple
+
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+
+class RequestMetrics:
+    # Tempo gasto no banco, quantidade de comandos e espera por conexão de uma requisição
+    __slots__ = ("start", "db_time", "queries", "acquire_time")
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.db_time = 0.0
+        self.queries = 0
+        self.acquire_time = 0.0
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.start
+
+
+# Métricas da requisição em andamento; None fora de requisições (scripts, migrações)
+current_request: ContextVar[Optional[RequestMetrics]] = ContextVar("current_request", default=None)
+
+
+def record_query(duration: float):
+    metrics = current_request.get()
+    if metrics is not None:
+        metrics.db_time += duration
+        metrics.queries += 1
+
+
+def record_acquire(duration: float):
+    registry.acquire.observe((), duration)
+
+    metrics = current_request.get()
+    if metrics is not None:
+        metrics.acquire_time += duration
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, labelnames: Tuple[str, ...], buckets: Tuple[float, ...]):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        # labels -> [contagem por bucket..., soma, total]
+        self._series: Dict[tuple, list] = {}
+
+    def observe(self, labels: tuple, value: float):
+        index = bisect.bisect_left(self.buckets, value)
+
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * (len(self.buckets) + 2)
+            if index < len(self.buckets):
+                series[index] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def _labels(self, labels: tuple, extra: str = "") -> str:
+        pairs = [f'{name}="{_escape(value)}"' for name, value in zip(self.labelnames, labels)]
+        if extra:
+            pairs.append(extra)
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+    def render(self) -> list:
+        with self._lock:
+            snapshot = {labels: list(series) for labels, series in self._series.items()}
+
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for labels, series in sorted(snapshot.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                bucket_labels = self._labels(labels, 'le="%s"' % bound)
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            bucket_labels = self._labels(labels, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{bucket_labels} {series[-1]}")
+            lines.append(f"{self.name}_sum{self._labels(labels)} {series[-2]}")
+            lines.append(f"{self.name}_count{self._labels(labels)} {series[-1]}")
+        return lines
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self.latency = Histogram(
+            "http_request_duration_seconds", "Duração das requisições",
+            ("method", "route", "status"), LATENCY_BUCKETS,
+        )
+        self.db_time = Histogram(
+            "http_request_db_duration_seconds", "Tempo gasto no banco por requisição",
+            ("method", "route"), LATENCY_BUCKETS,
+        )
+        self.queries = Histogram(
+            "http_request_db_queries", "Comandos SQL executados por requisição",
+            ("method", "route"), QUERY_BUCKETS,
+        )
+        self.acquire = Histogram(
+            "db_pool_acquire_seconds", "Espera para obter uma conexão do pool",
+            (), LATENCY_BUCKETS,
+        )
+
+    def observe_request(self, method: str, route: str, status: int, metrics: RequestMetrics, elapsed: float):
+        self.latency.observe((method, route, str(status)), elapsed)
+        self.db_time.observe((method, route), metrics.db_time)
+        self.queries.observe((method, route), metrics.queries)
+
+    def render(self, gauges: Optional[Dict[str, float]] = None) -> str:
+        lines = []
+        for histogram in (self.latency, self.db_time, self.queries, self.acquire):
+            lines.extend(histogram.render())
+
+        for name, value in (gauges or {}).items():
+            lines.append(f"# TYPE {name} gauge")
+            lines.append(f"{name} {value}")
+
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
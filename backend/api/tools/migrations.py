@@ -0,0 +1,169 @@
+import logging, os, re
+from api.tools.db import DB
+from typing import List, Optional, Tuple
+
+
+# Arquivos numerados, ex.: 001.sql, 002_indices.sql
+MIGRATION_FILE = re.compile(r"^(\d+)[^/]*\.sql$")
+
+# Chave do advisory lock que impede dois runners simultâneos
+MIGRATION_LOCK_ID = 724501
+
+# Primeira linha das migrações que não podem rodar numa transação (ex.: CREATE
+# INDEX CONCURRENTLY): cada comando, terminado por ";", roda em autocommit
+NO_TRANSACTION = "-- migrate: no-transaction"
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MIGRATIONS_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "info"
+)
+
+
+def get_migrations_dir() -> str:
+    return os.path.abspath(os.getenv("MIGRATIONS_DIR", DEFAULT_MIGRATIONS_DIR))
+
+
+def list_migrations(directory: Optional[str] = None) -> List[Tuple[int, str, str]]:
+    directory = directory or get_migrations_dir()
+    migrations = []
+
+    for name in os.listdir(directory):
+        match = MIGRATION_FILE.match(name)
+        if match:
+            migrations.append((int(match.group(1)), name, os.path.join(directory, name)))
+
+    migrations.sort()
+
+    versions = [version for version, _, _ in migrations]
+    if len(versions) != len(set(versions)):
+        raise ValueError("Existem migrações com o mesmo número de versão")
+
+    return migrations
+
+
+def split_statements(script: str) -> List[str]:
+    # Descarta comentários de linha e separa os comandos pelo ";"; basta para
+    # as migrações sem transação, que não têm funções nem strings com ";"
+    lines = [line for line in script.splitlines() if not line.lstrip().startswith("--")]
+    return [statement.strip() for statement in "\n".join(lines).split(";") if statement.strip()]
+
+
+def _run_migration(conn, cur, script: str):
+    if not script.startswith(NO_TRANSACTION):
+        cur.execute(script)
+        return
+
+    # Um índice CONCURRENTLY que falhar fica INVALID: remova-o antes de
+    # rodar de novo, já que o IF NOT EXISTS o consideraria criado
+    conn.autocommit = True
+    try:
+        for statement in split_statements(script):
+            cur.execute(statement)
+    finally:
+        conn.autocommit = False
+
+
+def _ensure_migrations_table(cur):
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS public.schema_migrations (
+            version int4 NOT NULL,
+            name varchar(255) NOT NULL,
+            applied_at timestamp DEFAULT now() NOT NULL,
+            CONSTRAINT schema_migrations_pkey PRIMARY KEY (version)
+        )
+        """
+    )
+
+
+def _applied_versions(cur) -> set:
+    cur.execute("SELECT version FROM schema_migrations")
+    return {row[0] for row in cur.fetchall()}
+
+
+def _register_baseline(cur, migrations) -> Optional[str]:
+    # Bancos criados à mão com o info/001.sql já têm o schema inicial:
+    # marca a primeira migração como aplicada em vez de executá-la
+    if not migrations:
+        return None
+
+    cur.execute("SELECT to_regclass('public.users') IS NOT NULL")
+    if not cur.fetchone()[0]:
+        return None
+
+    version, name, _ = migrations[0]
+    cur.execute(
+        "INSERT INTO schema_migrations (version, name) VALUES (%s, %s)",
+        (version, name),
+    )
+    return name
+
+
+def migration_status(db: Optional[DB] = None, directory: Optional[str] = None) -> List[dict]:
+    db = db or DB()
+    migrations = list_migrations(directory)
+
+    with db.connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute("SELECT to_regclass('public.schema_migrations') IS NOT NULL")
+            applied = _applied_versions(cur) if cur.fetchone()[0] else set()
+
+    return [
+        {"version": version, "name": name, "applied": version in applied}
+        for version, name, _ in migrations
+    ]
+
+
+def migrate(
+    db: Optional[DB] = None,
+    directory: Optional[str] = None,
+    target: Optional[int] = None,
+) -> List[str]:
+    db = db or DB()
+    migrations = list_migrations(directory)
+    applied_now = []
+
+    with db.connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute("SELECT pg_advisory_lock(%s)", (MIGRATION_LOCK_ID,))
+            conn.commit()
+
+            try:
+                _ensure_migrations_table(cur)
+                applied = _applied_versions(cur)
+
+                if not applied:
+                    baseline = _register_baseline(cur, migrations)
+                    if baseline:
+                        logger.info("Schema existente registrado", extra={"migration": baseline})
+                        applied = _applied_versions(cur)
+                conn.commit()
+
+                for version, name, path in migrations:
+                    if version in applied:
+                        continue
+                    if target is not None and version > target:
+                        break
+
+                    # Cada arquivo roda em sua própria transação, salvo os
+                    # marcados com NO_TRANSACTION
+                    with open(path, encoding="utf-8") as f:
+                        _run_migration(conn, cur, f.read())
+                    cur.execute(
+                        "INSERT INTO schema_migrations (version, name) VALUES (%s, %s)",
+                        (version, name),
+                    )
+                    conn.commit()
+
+                    applied_now.append(name)
+                    logger.info("Migração aplicada", extra={"migration": name})
+
+            except Exception:
+                conn.rollback()
+                raise
+            finally:
+                cur.execute("SELECT pg_advisory_unlock(%s)", (MIGRATION_LOCK_ID,))
+                conn.commit()
+
+    return applied_now
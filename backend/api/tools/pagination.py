@@ -0,0 +1,41 @@
+from typing import Dict, Optional
+
+
+def pagination_links(
+    base_url: str,
+    pagination: dict,
+    cursor_mode: bool,
+    include_total: bool,
+    filters: Optional[Dict[str, str]] = None,
+) -> Dict[str, str]:
+    # Links das listagens paginadas, compartilhados pelo app Flask e pelo ASGI
+    current_page = pagination["page"]
+    total_pages = pagination["total_pages"]
+
+    links = {}
+
+    # Link para primeira página
+    links["first"] = f"{base_url}?page=1"
+
+    # Link para próxima página: no modo cursor segue o next_cursor,
+    # no modo por página mantém a numeração usada pelos clientes atuais
+    if pagination["has_next"]:
+        if cursor_mode:
+            links["next"] = f"{base_url}?cursor={pagination['next_cursor']}"
+        else:
+            links["next"] = f"{base_url}?page={current_page + 1}"
+
+    # Link para última página, apenas quando o total foi calculado
+    if total_pages is not None:
+        links["last"] = f"{base_url}?page={total_pages}"
+
+    # Mantém os filtros informados nos links
+    for key in links:
+        for name, value in (filters or {}).items():
+            if value:
+                links[key] += f"&{name}={value}"
+        links[key] += f"&page_size={pagination['page_size']}"
+        if not include_total:
+            links[key] += "&include_total=false"
+
+    return links
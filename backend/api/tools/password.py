@@ -1,15 +1,130 @@
-import bcrypt
+import bcrypt, os, secrets, threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from random import randint
 
 
+BCRYPT_ROUNDS = int(os.getenv('BCRYPT_ROUNDS', 12))
+PASSWORD_HASH_EXECUTOR = os.getenv('PASSWORD_HASH_EXECUTOR', 'thread')
+PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', 2))
+PASSWORD_HASH_MAX_PENDING = int(os.getenv('PASSWORD_HASH_MAX_PENDING', 8))
+PASSWORD_HASH_TIMEOUT = float(os.getenv('PASSWORD_HASH_TIMEOUT', 5))
+
+
+class PasswordHasherBusy(Exception):
+    pass
+
+
+def _hashpw(password: bytes, rounds: int) -> str:
+    return bcrypt.hashpw(password, bcrypt.gensalt(rounds=rounds)).decode()
+
+
+def _checkpw(password: bytes, hashed: bytes) -> bool:
+    return bcrypt.checkpw(password, hashed)
+
+
+class PasswordHasher:
+    def __init__(
+        self,
+        rounds: int = BCRYPT_ROUNDS,
+        workers: int = PASSWORD_HASH_WORKERS,
+        max_pending: int = PASSWORD_HASH_MAX_PENDING,
+        timeout: float = PASSWORD_HASH_TIMEOUT,
+        executor: str = PASSWORD_HASH_EXECUTOR,
+    ):
+        self.rounds = rounds
+        self.timeout = timeout
+        self._dummy_hash = None
+        # Vagas para hashes em execução ou na fila; acima disso recusa na hora
+        self._slots = threading.BoundedSemaphore(max(max_pending, workers))
+
+        if executor == 'process':
+            self._executor: Executor = ProcessPoolExecutor(max_workers=workers)
+        else:
+            # O bcrypt libera o GIL, então threads já rodam em paralelo
+            self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='bcrypt')
+
+    def _run(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            raise PasswordHasherBusy("Muitas requisições de autenticação simultâneas")
+
+        try:
+            future = self._executor.submit(fn, *args)
+        except Exception:
+            self._slots.release()
+            raise
+
+        # A vaga só é liberada quando o hash termina, mesmo após um timeout
+        future.add_done_callback(lambda _: self._slots.release())
+
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            raise PasswordHasherBusy("Tempo esgotado aguardando o processamento da senha")
+
+    def hash(self, password: str) -> str:
+        return self._run(_hashpw, password.encode('utf-8'), self.rounds)
+
+    def check(self, password: str, hashed: str) -> bool:
+        return self._run(_checkpw, password.encode('utf-8'), hashed.encode())
+
+    def check_dummy(self, password: str) -> bool:
+        # Mesmo custo de conferir uma senha real, para emails sem cadastro: o
+        # hash fixo é gerado uma vez, no custo atual, pelo mesmo pool
+        if self._dummy_hash is None:
+            self._dummy_hash = self.hash(secrets.token_urlsafe(32))
+
+        self.check(password, self._dummy_hash)
+        return False
+
+    def needs_rehash(self, hashed: str) -> bool:
+        # Formato $2b$<custo>$...: hashes com custo menor que o atual são refeitos
+        try:
+            return int(hashed.split('$')[2]) < self.rounds
+        except (IndexError, ValueError):
+            return True
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
+
+
+_hasher = None
+_hasher_lock = threading.Lock()
+
+
+def get_hasher() -> PasswordHasher:
+    global _hasher
+
+    if _hasher is None:
+        with _hasher_lock:
+            if _hasher is None:
+                _hasher = PasswordHasher()
+
+    return _hasher
+
+
+def reset_hasher_after_fork():
+    global _hasher, _hasher_lock
+
+    # As threads/processos do executor não existem no processo filho
+    _hasher = None
+    _hasher_lock = threading.Lock()
+
+
 def hash_password(password):
-    salt = bcrypt.gensalt()
-    hashed = bcrypt.hashpw(password.encode('utf-8'), salt).decode()
-    return hashed
+    return get_hasher().hash(password)
 
 
 def check_password(password, hashed):
-    return bcrypt.checkpw(password.encode('utf-8'), hashed.encode())
+    return get_hasher().check(password, hashed)
+
+
+def check_dummy_password(password):
+    return get_hasher().check_dummy(password)
+
+
+def needs_rehash(hashed):
+    return get_hasher().needs_rehash(hashed)
 
 
 def generate_confirmation_code():
@@ -17,4 +132,4 @@ def generate_confirmation_code():
     for _ in range(5):
         code += str(randint(0, 9))
 
-    return code
\ No newline at end of file
+    return code
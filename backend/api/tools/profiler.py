@@ -0,0 +1,75 @@
+import hmac, os, re, sys, threading, time
+from collections import Counter
+from typing import Optional
+
+
+# off: desligado; header: só requisições com X-Profile: <PROFILE_TOKEN>; all: todas as requisições
+PROFILING = os.getenv('PROFILING', 'off')
+PROFILE_HEADER = 'X-Profile'
+# Segredo do modo header: sem ele qualquer cliente ligaria o profiler e
+# gravaria arquivos em disco. Vazio desliga o modo header
+PROFILE_TOKEN = os.getenv('PROFILE_TOKEN', '')
+PROFILE_INTERVAL = float(os.getenv('PROFILE_INTERVAL', 0.001))
+PROFILE_DIR = os.getenv('PROFILE_DIR', '/tmp/myfinance-profiles')
+
+
+def should_profile(headers) -> bool:
+    if PROFILING == 'all':
+        return True
+    if PROFILING != 'header' or not PROFILE_TOKEN:
+        return False
+    return hmac.compare_digest(headers.get(PROFILE_HEADER, '').encode(), PROFILE_TOKEN.encode())
+
+
+def _frame_name(frame) -> str:
+    code = frame.f_code
+    module = frame.f_globals.get('__name__', os.path.basename(code.co_filename))
+    return f"{module}:{code.co_name}"
+
+
+class SamplingProfiler:
+    # Amostra periodicamente a pilha da thread que atende a requisição, sem
+    # instrumentar cada chamada como o cProfile; o custo fica na thread amostradora
+    def __init__(self, interval: float = PROFILE_INTERVAL):
+        self.interval = interval
+        self.samples = Counter()
+        self._target = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        self._target = threading.get_ident()
+        self._thread = threading.Thread(target=self._run, name='profiler', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._target)
+            if frame is None:
+                continue
+
+            stack = []
+            while frame is not None:
+                stack.append(_frame_name(frame))
+                frame = frame.f_back
+            self.samples[";".join(reversed(stack))] += 1
+
+    def folded(self) -> str:
+        # Formato "pilha;separada;por;ponto-e-vírgula contagem" aceito pelo
+        # flamegraph.pl, speedscope e inferno
+        return "".join(f"{stack} {count}\n" for stack, count in self.samples.most_common())
+
+    def write(self, label: str, directory: str = PROFILE_DIR) -> str:
+        os.makedirs(directory, exist_ok=True)
+        name = re.sub(r"[^A-Za-z0-9_.-]+", "_", label).strip("_") or "request"
+        path = os.path.join(directory, f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{name}.folded")
+
+        with open(path, "w") as f:
+            f.write(self.folded())
+
+        return path
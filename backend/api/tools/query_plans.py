@@ -0,0 +1,90 @@
+from api.controllers.cost_controller import CostController
+from api.controllers.receivement_controller import ReceivementController
+from api.repositories.transaction_repository import TransactionRepository
+from api.tools.db import DB
+from datetime import date
+from typing import List, Optional
+
+
+# Valores representativos: períodos e cursor que abrangem todo o histórico
+START_DATE = date(2000, 1, 1)
+END_DATE = date(2100, 1, 1)
+CURSOR = (date(2100, 1, 1), 2147483647)
+
+
+def repositories() -> List[TransactionRepository]:
+    return [CostController().repository, ReceivementController().repository]
+
+
+def hot_queries(user_id: int = 1, item_id: int = 1) -> List[dict]:
+    # Os próprios comandos que os repositórios executam, com os parâmetros na
+    # ordem deles; a listagem padrão inclui a contagem via LEFT JOIN
+    queries = []
+
+    for repository in repositories():
+        table = repository.table
+        variants = {
+            "listagem": {},
+            "listagem sem total": {"include_total": False},
+            "listagem por período": {"start_date": START_DATE, "end_date": END_DATE},
+            "listagem por cursor": {"cursor": CURSOR, "include_total": False},
+            "listagem por cursor com total": {"cursor": CURSOR},
+        }
+        for name, options in variants.items():
+            sql, params = repository.list_statement(user_id, **options)
+            queries.append({"name": f"{table}: {name}", "table": table, "sql": sql, "params": params})
+
+        queries.append({
+            "name": f"{table}: detalhe",
+            "table": table,
+            "sql": repository.get_statement(),
+            "params": [item_id, user_id],
+        })
+
+    return queries
+
+
+def _walk(node: dict, under_limit: bool = False):
+    yield node, under_limit
+    under_limit = under_limit or node["Node Type"] == "Limit"
+    for child in node.get("Plans", []):
+        yield from _walk(child, under_limit)
+
+
+def check_query_plans(db: Optional[DB] = None, user_id: Optional[int] = None) -> List[dict]:
+    db = db or DB()
+    results = []
+
+    with db.connection() as conn:
+        with conn.cursor() as cur:
+            # Em bases pequenas o planner prefere Seq Scan mesmo com índice;
+            # desligá-lo mostra se existe um índice capaz de atender a consulta
+            cur.execute("SET LOCAL enable_seqscan = off")
+
+            for query in hot_queries(user_id or 1):
+                cur.execute("EXPLAIN (FORMAT JSON) " + query["sql"], query["params"])
+                plan = cur.fetchone()[0][0]["Plan"]
+                nodes = list(_walk(plan))
+
+                problems = []
+                for node, under_limit in nodes:
+                    if node["Node Type"] == "Seq Scan" and node.get("Relation Name") == query["table"]:
+                        problems.append(f"Seq Scan em {query['table']}")
+                    # Ordenar abaixo do LIMIT é ordenar todas as linhas do usuário;
+                    # acima dele (a página já pronta, com o total) é barato
+                    if under_limit and node["Node Type"] in ("Sort", "Incremental Sort"):
+                        problems.append("ordenação em memória (Sort)")
+
+                results.append({
+                    "name": query["name"],
+                    "ok": not problems,
+                    "problems": problems,
+                    "nodes": [
+                        f"{node['Node Type']} ({node['Index Name']})" if "Index Name" in node else node["Node Type"]
+                        for node, _ in nodes
+                    ],
+                })
+
+        conn.rollback()
+
+    return results
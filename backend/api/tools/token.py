@@ -1,26 +1,109 @@
-import jwt, datetime, os
+import jwt, datetime, hashlib, logging, os, secrets, threading, time
+from collections import OrderedDict
 from dotenv import load_dotenv
-from typing import Union
+from typing import Tuple, Union
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
 
-def generate_token(user_info: dict, expiration_time: int = 3600) -> str:
+# Lida uma única vez, na inicialização
+SECRET_KEY = os.getenv('SECRET_KEY')
+TOKEN_CACHE_SIZE = int(os.getenv('TOKEN_CACHE_SIZE', 10000))
+ACCESS_TOKEN_EXPIRATION = int(os.getenv('ACCESS_TOKEN_EXPIRATION', 3600))
+REFRESH_TOKEN_EXPIRATION = int(os.getenv('REFRESH_TOKEN_EXPIRATION', 30 * 24 * 3600))
+
+
+class TokenCache:
+    def __init__(self, maxsize: int = TOKEN_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "rejected": 0, "expired": 0}
+
+    def get(self, token: str) -> Union[dict, None]:
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+
+            payload, exp = entry
+            # A entrada vence junto com o exp do próprio token
+            if exp <= time.time():
+                del self._entries[token]
+                self._stats["expired"] += 1
+                return None
+
+            self._entries.move_to_end(token)
+            self._stats["hits"] += 1
+            return dict(payload)
+
+    def set(self, token: str, payload: dict):
+        exp = payload.get('exp')
+        if self.maxsize <= 0 or not isinstance(exp, (int, float)):
+            return
+
+        with self._lock:
+            self._entries[token] = (dict(payload), exp)
+            self._entries.move_to_end(token)
+            # Remove os menos usados recentemente ao passar do limite
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def count(self, stat: str):
+        with self._lock:
+            self._stats[stat] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"size": len(self._entries), "maxsize": self.maxsize, **self._stats}
+
+
+token_cache = TokenCache()
+
+
+def generate_token(user_info: dict, expiration_time: int = ACCESS_TOKEN_EXPIRATION) -> str:
     exp = datetime.datetime.utcnow() + datetime.timedelta(seconds=expiration_time)
     user_info['exp'] = exp
 
-    return jwt.encode(user_info, os.getenv('SECRET_KEY'), algorithm='HS256')
+    return jwt.encode(user_info, SECRET_KEY, algorithm='HS256')
+
+
+def hash_refresh_token(refresh_token: str) -> str:
+    return hashlib.sha256(refresh_token.encode()).hexdigest()
+
+
+def generate_refresh_token() -> Tuple[str, str]:
+    # Token opaco e aleatório; o banco guarda apenas o hash
+    refresh_token = secrets.token_urlsafe(48)
+    return refresh_token, hash_refresh_token(refresh_token)
 
 
 def validate_token(token: str) -> Union[dict, None]:
+    # Tokens já verificados dispensam uma nova decodificação HS256
+    payload = token_cache.get(token)
+    if payload is not None:
+        return payload
+
     try:
-        decoded_payload = jwt.decode(token, os.getenv('SECRET_KEY'), algorithms=['HS256'])
-        print(f'Dados decodificados: {decoded_payload}')
-        return decoded_payload
+        decoded_payload = jwt.decode(token, SECRET_KEY, algorithms=['HS256'])
     except jwt.ExpiredSignatureError:
-        print('O token expirou!')
+        token_cache.count("expired")
+        logger.debug('O token expirou')
+        return None
     except jwt.InvalidTokenError:
-        print('Token inválido!')
-    except Exception as e:
-        print(f'Erro ao decodificar o token: {e}')
-    return None
+        token_cache.count("rejected")
+        logger.debug('Token inválido')
+        return None
+    except Exception:
+        token_cache.count("rejected")
+        logger.warning('Erro ao decodificar o token', exc_info=True)
+        return None
+
+    token_cache.set(token, decoded_payload)
+    return decoded_payload
@@ -0,0 +1,7 @@
+from api.asgi.app import create_async_app
+
+
+# App assíncrono opcional, com as mesmas rotas do run:app:
+#   uvicorn asgi:app --workers 4
+#   GUNICORN_WORKER_CLASS=uvicorn gunicorn -c gunicorn.conf.py asgi:app
+app = create_async_app()
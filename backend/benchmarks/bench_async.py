@@ -0,0 +1,187 @@
+import argparse, asyncio, json, os, random, resource, sys, time
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+from benchmarks.loadtest import SCENARIOS, load_fixture, start_gunicorn, summarize
+
+
+# Compara o app Flask (run:app, gthread) e o app ASGI (asgi:app, uvicorn com
+# asyncpg) nos mesmos endpoints e com os mesmos workers, subindo a quantidade
+# de requisições em andamento. O cliente é assíncrono: cada conexão keep-alive
+# é uma corrotina, então milhares delas cabem num único processo.
+# Uso: python -m benchmarks.bench_async --workers 2 --concurrency 64 512 2048
+
+# Endpoints atendidos nativamente pelo app ASGI
+DEFAULT_ENDPOINTS = [
+    "costs.list", "costs.list_no_total", "costs.detail", "costs.create",
+    "receivements.list", "receivements.detail",
+]
+
+
+async def _read_body(reader: asyncio.StreamReader, headers: Dict[str, str]):
+    if headers.get("transfer-encoding", "").lower() == "chunked":
+        while True:
+            size = int((await reader.readline()).split(b";")[0], 16)
+            await reader.readexactly(size + 2)
+            if size == 0:
+                return
+    await reader.readexactly(int(headers.get("content-length", 0)))
+
+
+async def http_request(
+    reader: asyncio.StreamReader,
+    writer: asyncio.StreamWriter,
+    host: str,
+    method: str,
+    path: str,
+    headers: dict,
+    body: Optional[dict],
+) -> Tuple[int, bool]:
+    payload = b"" if body is None else json.dumps(body).encode()
+    lines = [f"{method} {path} HTTP/1.1", f"Host: {host}", f"Content-Length: {len(payload)}"]
+    if body is not None:
+        lines.append("Content-Type: application/json")
+    lines.extend(f"{name}: {value}" for name, value in headers.items())
+    writer.write(("\r\n".join(lines) + "\r\n\r\n").encode() + payload)
+    await writer.drain()
+
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError("Conexão fechada pelo servidor")
+    status = int(status_line.split()[1])
+
+    response_headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        response_headers[name.strip().lower()] = value.strip()
+
+    await _read_body(reader, response_headers)
+    return status, response_headers.get("connection", "").lower() == "close"
+
+
+async def run_level(name: str, base_url: str, fixture, requests: int, concurrency: int, seed: int) -> dict:
+    scenario = SCENARIOS[name]
+    parts = urlsplit(base_url)
+    host, port = parts.hostname, parts.port or 80
+    prefix = parts.path.rstrip("/")
+
+    latencies: List[float] = []
+    statuses: Dict[int, int] = {}
+    errors = 0
+    issued = 0
+
+    async def connection(index: int):
+        nonlocal errors, issued
+        rng = random.Random(seed * 1000 + index)
+        reader = writer = None
+
+        while issued < requests:
+            issued += 1
+            method, path, headers, body = scenario(fixture, rng)
+            start = time.perf_counter()
+            try:
+                if writer is None:
+                    reader, writer = await asyncio.open_connection(host, port)
+                status, close = await http_request(reader, writer, host, method, prefix + path, headers, body)
+            except (OSError, ValueError, asyncio.IncompleteReadError):
+                status, close = 0, True
+            latencies.append(time.perf_counter() - start)
+
+            if status == 0 or status >= 400:
+                errors += 1
+            statuses[status] = statuses.get(status, 0) + 1
+
+            if close and writer is not None:
+                writer.close()
+                writer = None
+
+        if writer is not None:
+            writer.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(connection(index) for index in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    return summarize(latencies, errors, statuses, elapsed)
+
+
+def start_target(target: str, args) -> Tuple[object, str]:
+    # Mesmo gunicorn.conf.py e mesma quantidade de workers nos dois casos
+    os.environ.update({
+        "GUNICORN_WORKER_CLASS": "uvicorn" if target == "async" else "gthread",
+        "GUNICORN_WORKERS": str(args.workers),
+        "GUNICORN_THREADS": str(args.threads),
+        "DB_ASYNC_POOL_MAX": str(args.pool_size),
+        "DB_POOL_MAX": str(args.threads if target == "sync" else args.pool_size),
+        # Sem cache de leituras: toda requisição chega ao banco
+        "CACHE_BACKEND": "none",
+    })
+    return start_gunicorn(
+        ["-c", "gunicorn.conf.py", "--log-level", "warning", "--backlog", str(max(args.concurrency) * 2)],
+        "asgi:app" if target == "async" else "run:app",
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark do app Flask contra o app ASGI")
+    parser.add_argument("--targets", nargs="+", choices=["sync", "async"], default=["sync", "async"])
+    parser.add_argument("--endpoints", nargs="+", choices=sorted(SCENARIOS), default=DEFAULT_ENDPOINTS)
+    parser.add_argument("--concurrency", nargs="+", type=int, default=[64, 512, 2048], help="Requisições em andamento")
+    parser.add_argument("--requests", type=int, default=5000, help="Requisições por endpoint e nível")
+    parser.add_argument("--warmup", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--threads", type=int, default=8, help="Threads do gthread no app Flask")
+    parser.add_argument("--pool-size", type=int, default=20, help="Conexões do asyncpg por worker")
+    parser.add_argument("--users-sample", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Arquivo JSON de resultado (padrão: stdout)")
+    args = parser.parse_args()
+
+    # Cada conexão do cliente é um descritor de arquivo
+    _, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+
+    fixture = load_fixture(args.users_sample)
+    results = {}
+
+    for target in args.targets:
+        process, base_url = start_target(target, args)
+        try:
+            for name in args.endpoints:
+                asyncio.run(run_level(name, base_url, fixture, args.warmup, min(args.concurrency), args.seed))
+                for concurrency in args.concurrency:
+                    result = asyncio.run(
+                        run_level(name, base_url, fixture, args.requests, concurrency, args.seed)
+                    )
+                    results.setdefault(name, {}).setdefault(str(concurrency), {})[target] = result
+                    print(
+                        f"{name} ({target}, {concurrency}): {result['throughput_rps']} req/s, "
+                        f"p95 {result['p95_ms']} ms, erros {result['errors']}",
+                        file=sys.stderr,
+                    )
+        finally:
+            process.terminate()
+            process.wait(timeout=30)
+
+    output = json.dumps({
+        "meta": {
+            "workers": args.workers,
+            "threads": args.threads,
+            "pool_size": args.pool_size,
+            "requests": args.requests,
+            "cpus": os.cpu_count(),
+        },
+        "results": results,
+    }, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,95 @@
+import argparse, json, statistics, sys, time
+from flask import Flask, jsonify, request
+from api.middlewares.auth_middleware import require_auth
+from api.tools.token import generate_token, token_cache
+from benchmarks.loadtest import percentile
+
+
+# Mede o custo do require_auth por requisição, com e sem o cache de tokens.
+# Uso: python -m benchmarks.bench_auth --requests 2000 --repetitions 15
+
+
+def build_app() -> Flask:
+    app = Flask(__name__)
+
+    @app.route("/ping")
+    @require_auth
+    def ping():
+        return jsonify({"id": request.user["id"]})
+
+    @app.route("/ping-public")
+    def ping_public():
+        return jsonify({"id": 0})
+
+    return app
+
+
+def measure(client, path: str, headers: dict, requests: int) -> float:
+    start = time.perf_counter()
+    for _ in range(requests):
+        client.get(path, headers=headers)
+    return (time.perf_counter() - start) / requests * 1_000_000
+
+
+def run_mode(client, mode: str, headers: dict, requests: int, maxsize: int) -> float:
+    if mode == "baseline":
+        # Linha de base: mesma rota sem autenticação
+        return measure(client, "/ping-public", {}, requests)
+
+    if mode == "uncached":
+        token_cache.maxsize = 0
+        token_cache.clear()
+    else:
+        token_cache.maxsize = maxsize
+    return measure(client, "/ping", headers, requests)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark de autenticação")
+    parser.add_argument("--requests", type=int, default=2000, help="Requisições por rodada de cada modo")
+    parser.add_argument("--repetitions", type=int, default=15)
+    parser.add_argument("--warmup", type=int, default=2000)
+    args = parser.parse_args()
+
+    client = build_app().test_client()
+    token = generate_token({"id": 1, "name": "bench", "email": "bench@example.com"})
+    headers = {"Authorization": f"Bearer {token}"}
+    maxsize = token_cache.maxsize
+    modes = ["baseline", "uncached", "cached"]
+
+    # Aquece rotas, Flask e cache antes de medir
+    for mode in modes:
+        run_mode(client, mode, headers, args.warmup, maxsize)
+
+    # Modos intercalados, com a ordem girando a cada rodada: a ordem de
+    # execução e a deriva da máquina afetam todos por igual. O custo da
+    # autenticação é a diferença para a linha de base da mesma rodada
+    samples = {mode: [] for mode in modes}
+    for repetition in range(args.repetitions):
+        order = modes[repetition % len(modes):] + modes[:repetition % len(modes)]
+        for mode in order:
+            samples[mode].append(run_mode(client, mode, headers, args.requests, maxsize))
+    token_cache.maxsize = maxsize
+
+    def overhead(mode: str) -> dict:
+        diffs = sorted(
+            sample - baseline for sample, baseline in zip(samples[mode], samples["baseline"])
+        )
+        return {
+            "median_us": round(statistics.median(diffs), 2),
+            "p95_us": round(percentile(diffs, 95), 2),
+        }
+
+    print(json.dumps({
+        "requests": args.requests,
+        "repetitions": args.repetitions,
+        "baseline_us": round(statistics.median(samples["baseline"]), 2),
+        "auth_uncached": overhead("uncached"),
+        "auth_cached": overhead("cached"),
+        "cache": token_cache.stats(),
+    }))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
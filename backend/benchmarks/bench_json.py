@@ -0,0 +1,79 @@
+import argparse, json, sys, time
+from datetime import date, timedelta
+from decimal import Decimal
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+from api.repositories.transaction_repository import COLUMNS
+from api.tools.json_provider import ENCODERS, FastJSONProvider
+
+
+# Mede a serialização de uma página de gastos: do resultado do banco
+# (tuplas) até os bytes da resposta.
+# Uso: python -m benchmarks.bench_json --sizes 100 10000
+
+
+def build_rows(size: int) -> list:
+    start = date(2024, 1, 1)
+    return [
+        (i, f"Gasto {i}", "Descrição de teste" if i % 2 else None,
+         Decimal(f"{i % 1000}.{i % 100:02d}"), start + timedelta(days=i % 365))
+        for i in range(1, size + 1)
+    ]
+
+
+def payload(items: list) -> dict:
+    return {
+        "items": items,
+        "pagination": {"page": 1, "page_size": len(items), "total_items": len(items),
+                       "total_pages": 1, "has_next": False, "next_cursor": None},
+    }
+
+
+def measure(fn, repeat: int) -> float:
+    fn()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark de serialização JSON")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 10000])
+    parser.add_argument("--repeat", type=int, default=0, help="0 ajusta pelo tamanho")
+    args = parser.parse_args()
+
+    app = Flask(__name__)
+    default_provider = DefaultJSONProvider(app)
+    fast_provider = FastJSONProvider(app)
+    results = []
+
+    for size in args.sizes:
+        rows = build_rows(size)
+        repeat = args.repeat or max(5, 200_000 // size)
+
+        # Caminho antigo: DictRow copiado para dict e jsonify padrão do Flask
+        def legacy():
+            items = [dict(zip(COLUMNS, row)) for row in rows]
+            items = [{key: item[key] for key in COLUMNS} for item in items]
+            return default_provider.dumps(payload(items)).encode("utf-8")
+
+        result = {"rows": size, "repeat": repeat, "flask_default_ms": round(measure(legacy, repeat), 3)}
+
+        for name in ENCODERS:
+            fast_provider.encoder = name
+
+            def fast():
+                items = [dict(zip(COLUMNS, row)) for row in rows]
+                return fast_provider.response(payload(items)).get_data()
+
+            result[f"{name}_ms"] = round(measure(fast, repeat), 3)
+
+        results.append(result)
+
+    print(json.dumps(results, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
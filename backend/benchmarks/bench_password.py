@@ -0,0 +1,72 @@
+import argparse, json, statistics, sys, time
+from concurrent.futures import ThreadPoolExecutor
+from api.tools.password import PasswordHasher, PasswordHasherBusy, _hashpw
+
+
+# Mede a vazão de logins (bcrypt.checkpw) para diferentes tamanhos de pool.
+# Uso: python -m benchmarks.bench_password --pool-sizes 1 2 4 --clients 16
+
+
+def run(pool_size: int, clients: int, requests: int, rounds: int, executor: str) -> dict:
+    hasher = PasswordHasher(
+        rounds=rounds,
+        workers=pool_size,
+        max_pending=clients,
+        timeout=60,
+        executor=executor,
+    )
+    hashed = _hashpw(b"senha-de-teste", rounds)
+    latencies = []
+    rejected = 0
+
+    def login(_):
+        nonlocal rejected
+        start = time.perf_counter()
+        try:
+            hasher.check("senha-de-teste", hashed)
+        except PasswordHasherBusy:
+            rejected += 1
+            return
+        latencies.append(time.perf_counter() - start)
+
+    # Aquece o pool antes de medir
+    hasher.check("senha-de-teste", hashed)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        list(pool.map(login, range(requests)))
+    elapsed = time.perf_counter() - start
+    hasher.shutdown()
+
+    latencies.sort()
+    return {
+        "pool_size": pool_size,
+        "executor": executor,
+        "rounds": rounds,
+        "clients": clients,
+        "requests": requests,
+        "rejected": rejected,
+        "logins_per_second": round(len(latencies) / elapsed, 2),
+        "p50_ms": round(statistics.median(latencies) * 1000, 2) if latencies else None,
+        "p95_ms": round(latencies[int(len(latencies) * 0.95) - 1] * 1000, 2) if latencies else None,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark de hashing de senhas")
+    parser.add_argument("--pool-sizes", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=64)
+    parser.add_argument("--rounds", type=int, default=12)
+    parser.add_argument("--executor", choices=["thread", "process"], default="thread")
+    args = parser.parse_args()
+
+    for pool_size in args.pool_sizes:
+        result = run(pool_size, args.clients, args.requests, args.rounds, args.executor)
+        print(json.dumps(result))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,156 @@
+import argparse, json, os, statistics, sys, time
+from datetime import date
+from decimal import Decimal
+
+# O cache de leituras esconderia o banco: toda chamada precisa chegar ao Postgres
+os.environ["CACHE_BACKEND"] = "none"
+
+from api.controllers.cost_controller import CostController
+from api.tools import db
+from benchmarks.seed import BENCH_EMAIL_PATTERN
+
+
+# Compara get_costs, get_cost_by_id e create_cost com e sem prepared statements
+# sobre os dados de benchmarks.seed. Mede a latência por chamada no cliente e o
+# "Planning Time" informado pelo EXPLAIN ANALYZE do comando em texto e do EXECUTE.
+# Uso: python -m benchmarks.bench_prepared --requests 2000
+
+
+def pick_user(controller: CostController):
+    with controller.repository.db.connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                SELECT u.id, MIN(c.id)
+                FROM users u
+                JOIN costs c ON c.user_id = u.id
+                WHERE u.email LIKE %s
+                GROUP BY u.id
+                ORDER BY u.id
+                LIMIT 1
+                """,
+                (BENCH_EMAIL_PATTERN,),
+            )
+            row = cur.fetchone()
+
+    if row is None:
+        raise RuntimeError("Nenhum usuário de benchmark; rode python -m benchmarks.seed antes")
+    return row
+
+
+def calls(controller: CostController, user_id: int, cost_id: int, created: list) -> dict:
+    def create():
+        cost = controller.create_cost(user_id, "Bench prepared", None, Decimal("1.00"), date.today())
+        created.append(cost["id"])
+
+    return {
+        "get_costs": lambda: controller.get_costs(user_id, page=1, page_size=20),
+        "get_cost_by_id": lambda: controller.get_cost_by_id(user_id, cost_id),
+        "create_cost": create,
+    }
+
+
+def measure(fn, modes: tuple, requests: int, warmup: int, rounds: int) -> dict:
+    # Os modos se alternam em rodadas: create_cost faz a tabela crescer e o
+    # modo medido por último não pode pagar sozinho por isso
+    for enabled in modes:
+        db.PREPARED_STATEMENTS = enabled
+        for _ in range(warmup):
+            fn()
+
+    latencies = {enabled: [] for enabled in modes}
+    for round_ in range(rounds):
+        for enabled in modes[round_ % 2:] + modes[:round_ % 2]:
+            db.PREPARED_STATEMENTS = enabled
+            for _ in range(requests // rounds):
+                start = time.perf_counter()
+                fn()
+                latencies[enabled].append(time.perf_counter() - start)
+
+    return {"prepared" if enabled else "plain": summarize(samples) for enabled, samples in latencies.items()}
+
+
+def summarize(latencies: list) -> dict:
+    latencies.sort()
+    return {
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 3),
+        "p50_ms": round(latencies[len(latencies) // 2] * 1000, 3),
+        "p95_ms": round(latencies[int(len(latencies) * 0.95) - 1] * 1000, 3),
+    }
+
+
+def planning_time(controller: CostController, key: tuple, params: list, prepared: bool) -> float:
+    # Média do Planning Time do servidor; escritas são desfeitas ao final
+    repository = controller.repository
+    query = repository._statements[key]
+    name, positional, count = db._prepared_form(query)
+    # Nome próprio: a conexão do pool pode já ter o comando preparado
+    name += "_bench"
+    samples = []
+
+    with repository.db.connection() as conn:
+        with conn.cursor() as cur:
+            if prepared:
+                cur.execute(f"PREPARE {name} AS {positional}")
+                # Depois de 5 execuções o servidor passa a usar o plano genérico
+                for _ in range(6):
+                    cur.execute(f"EXECUTE {name} ({', '.join(['%s'] * count)})", params)
+                explain = f"EXPLAIN (ANALYZE, FORMAT JSON) EXECUTE {name} ({', '.join(['%s'] * count)})"
+            else:
+                explain = "EXPLAIN (ANALYZE, FORMAT JSON) " + query
+
+            for _ in range(20):
+                cur.execute(explain, params)
+                samples.append(cur.fetchone()[0][0]["Planning Time"])
+
+            if prepared:
+                cur.execute(f"DEALLOCATE {name}")
+        conn.rollback()
+
+    return round(statistics.fmean(samples), 4)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark de prepared statements")
+    parser.add_argument("--requests", type=int, default=2000, help="Chamadas por endpoint e modo")
+    parser.add_argument("--warmup", type=int, default=100)
+    parser.add_argument("--rounds", type=int, default=10, help="Alternâncias entre os modos")
+    args = parser.parse_args()
+
+    controller = CostController()
+    user_id, cost_id = pick_user(controller)
+    created = []
+    results = {}
+
+    try:
+        # As leituras vêm antes de create_cost, que adiciona gastos ao usuário medido
+        for name, fn in calls(controller, user_id, cost_id, created).items():
+            results[name] = measure(fn, (False, True), args.requests, args.warmup, args.rounds)
+            for mode in ("plain", "prepared"):
+                print(f"{name} ({mode}): {results[name][mode]['mean_ms']} ms", file=sys.stderr)
+
+        # Os comandos já estão no cache do repositório após as chamadas acima
+        planning = {
+            "get_costs": (("list", False, False, False, True), [user_id, user_id, 21, 0]),
+            "get_cost_by_id": (("get",), [cost_id, user_id]),
+            "create_cost": (("create",), [user_id, "Bench prepared", None, Decimal("1.00"), date.today()]),
+        }
+        for name, (key, params) in planning.items():
+            results[name]["planning_ms"] = {
+                "plain": planning_time(controller, key, params, prepared=False),
+                "prepared": planning_time(controller, key, params, prepared=True),
+            }
+    finally:
+        db.PREPARED_STATEMENTS = True
+        # Remove os gastos criados pelo próprio controller, mantendo saldo e totais
+        if created:
+            controller.batch_costs(
+                user_id, [(index, "delete", created_id, None) for index, created_id in enumerate(created)]
+            )
+
+    print(json.dumps(results, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,83 @@
+import argparse, json, os, sys
+from flask import Flask, jsonify, request
+from benchmarks.loadtest import SCENARIOS, Fixture, run_scenario, start_gunicorn, HttpClient
+
+
+# Compara os modelos de worker do gunicorn.conf.py (sync, gthread, gevent) num
+# endpoint limitado por I/O: cada requisição espera uma ida simulada ao banco
+# (sleep, que libera o GIL e é cooperativo sob gevent) e serializa uma página.
+# Não precisa de Postgres, então mede só o modelo de concorrência.
+# Uso: python -m benchmarks.bench_workers --workers 2 --concurrency 32
+
+app = Flask(__name__)
+
+PAGE = [
+    {"id": i, "title": f"Gasto {i}", "description": None, "value": "10.00", "transaction_date": "2024-01-01"}
+    for i in range(20)
+]
+
+
+@app.route("/io")
+def io_bound():
+    import time
+
+    time.sleep(request.args.get("ms", 10, type=float) / 1000)
+    return jsonify({"items": PAGE})
+
+
+@app.route("/healthcheck")
+def healthcheck():
+    return jsonify({"status": "ok"})
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark dos modelos de worker do gunicorn")
+    parser.add_argument("--models", nargs="+", default=["sync", "gthread", "gevent"])
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--worker-connections", type=int, default=100)
+    parser.add_argument("--io-ms", type=float, default=10)
+    parser.add_argument("--requests", type=int, default=3000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    args = parser.parse_args()
+
+    SCENARIOS["workers.io"] = lambda fixture, rng: ("GET", f"/io?ms={args.io_ms}", {}, None)
+    results = {}
+
+    for model in args.models:
+        os.environ.update({
+            "GUNICORN_WORKER_CLASS": model,
+            "GUNICORN_WORKERS": str(args.workers),
+            "GUNICORN_THREADS": str(args.threads),
+            "GUNICORN_WORKER_CONNECTIONS": str(args.worker_connections),
+        })
+        process, base_url = start_gunicorn(
+            ["-c", "gunicorn.conf.py", "--log-level", "warning"], "benchmarks.bench_workers:app"
+        )
+        try:
+            results[model] = run_scenario(
+                "workers.io", lambda: HttpClient(base_url), Fixture([{}]),
+                args.requests, args.concurrency, 200, 42,
+            )
+        finally:
+            process.terminate()
+            process.wait(timeout=30)
+
+        print(f"{model}: {results[model]['throughput_rps']} req/s, p95 {results[model]['p95_ms']} ms", file=sys.stderr)
+
+    print(json.dumps({
+        "meta": {
+            "workers": args.workers,
+            "threads": args.threads,
+            "worker_connections": args.worker_connections,
+            "io_ms": args.io_ms,
+            "concurrency": args.concurrency,
+            "cpus": os.cpu_count(),
+        },
+        "results": results,
+    }, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,73 @@
+import argparse, json, sys
+
+
+# Compara dois resultados de benchmarks.loadtest e aponta regressões por endpoint.
+# Sai com código 1 se houver regressão, para uso em CI.
+# Uso: python -m benchmarks.compare base.json new.json --threshold 0.10
+
+
+def compare(base: dict, new: dict, threshold: float, metric: str) -> list:
+    rows = []
+
+    for name, current in new["results"].items():
+        previous = base["results"].get(name)
+        if previous is None:
+            rows.append({"endpoint": name, "status": "new"})
+            continue
+
+        problems = []
+        if previous[metric] and current[metric] > previous[metric] * (1 + threshold):
+            problems.append(f"{metric} +{current[metric] / previous[metric] - 1:.0%}")
+        if previous["throughput_rps"] and current["throughput_rps"] < previous["throughput_rps"] * (1 - threshold):
+            problems.append(f"throughput {current['throughput_rps'] / previous['throughput_rps'] - 1:.0%}")
+        if current["error_rate"] > previous["error_rate"] + 0.01:
+            problems.append(f"erros {previous['error_rate']:.2%} -> {current['error_rate']:.2%}")
+
+        rows.append({
+            "endpoint": name,
+            "status": "regression" if problems else "ok",
+            f"base_{metric}": previous[metric],
+            f"new_{metric}": current[metric],
+            "base_rps": previous["throughput_rps"],
+            "new_rps": current["throughput_rps"],
+            "problems": problems,
+        })
+
+    return rows
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compara dois resultados de teste de carga")
+    parser.add_argument("base")
+    parser.add_argument("new")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Variação tolerada (0.10 = 10%%)")
+    parser.add_argument("--metric", choices=["p50_ms", "p95_ms", "p99_ms"], default="p95_ms")
+    parser.add_argument("--json", action="store_true", help="Saída em JSON")
+    args = parser.parse_args()
+
+    with open(args.base) as f:
+        base = json.load(f)
+    with open(args.new) as f:
+        new = json.load(f)
+
+    rows = compare(base, new, args.threshold, args.metric)
+
+    if args.json:
+        print(json.dumps(rows, indent=2))
+    else:
+        print(f"{'endpoint':32} {'status':11} {'base':>10} {'new':>10} {'base rps':>10} {'new rps':>10}")
+        for row in rows:
+            if row["status"] == "new":
+                print(f"{row['endpoint']:32} {'new':11}")
+                continue
+            print(
+                f"{row['endpoint']:32} {row['status']:11} "
+                f"{row[f'base_{args.metric}']:>10} {row[f'new_{args.metric}']:>10} "
+                f"{row['base_rps']:>10} {row['new_rps']:>10}  {', '.join(row['problems'])}"
+            )
+
+    return 1 if any(row["status"] == "regression" for row in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
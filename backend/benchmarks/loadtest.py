@@ -0,0 +1,348 @@
+import argparse, http.client, json, math, os, platform, random, socket, subprocess, sys, threading, time
+from datetime import date, datetime, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+
+# Teste de carga dos endpoints de usuários, gastos e receitas sobre os dados
+# gerados por benchmarks.seed. Roda o app real em processo (test client do
+# Flask) ou via HTTP, inclusive subindo um gunicorn local.
+# Uso:
+#   python -m benchmarks.loadtest --target inprocess --output base.json
+#   python -m benchmarks.loadtest --target gunicorn --concurrency 16 --output new.json
+#   python -m benchmarks.compare base.json new.json
+
+
+class Fixture:
+    def __init__(self, users: List[dict]):
+        if not users:
+            raise RuntimeError("Nenhum usuário de benchmark; rode python -m benchmarks.seed antes")
+        self.users = users
+
+    def pick(self, rng: random.Random) -> dict:
+        return rng.choice(self.users)
+
+
+def load_fixture(sample: int) -> Fixture:
+    from api.tools.db import DB
+    from api.tools.token import generate_token
+    from benchmarks.seed import BENCH_EMAIL_PATTERN
+
+    with DB().connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                "SELECT id, name, email FROM users WHERE email LIKE %s ORDER BY id LIMIT %s",
+                (BENCH_EMAIL_PATTERN, sample),
+            )
+            users = {
+                user_id: {"id": user_id, "name": name, "email": email, "costs": [], "receivements": []}
+                for user_id, name, email in cur.fetchall()
+            }
+
+            # Alguns ids de cada usuário para detalhe e alteração
+            for table in ("costs", "receivements"):
+                cur.execute(
+                    f"""
+                    SELECT user_id, id FROM (
+                        SELECT user_id, id, row_number() OVER (PARTITION BY user_id ORDER BY id) AS rn
+                        FROM {table}
+                        WHERE user_id = ANY(%s)
+                    ) AS t
+                    WHERE rn <= 20
+                    """,
+                    (list(users),),
+                )
+                for user_id, item_id in cur.fetchall():
+                    users[user_id][table].append(item_id)
+
+    for user in users.values():
+        # O servidor precisa usar o mesmo SECRET_KEY
+        user["token"] = generate_token({"id": user["id"], "name": user["name"], "email": user["email"]})
+
+    return Fixture(list(users.values()))
+
+
+def _auth(user: dict) -> dict:
+    return {"Authorization": f"Bearer {user['token']}"}
+
+
+def _transaction(rng: random.Random) -> dict:
+    return {
+        "title": f"Carga {rng.randint(1, 10**6)}",
+        "description": None,
+        "value": f"{rng.uniform(1, 500):.2f}",
+        "transaction_date": date.today().isoformat(),
+    }
+
+
+def _resource_scenarios(resource: str) -> Dict[str, Callable]:
+    def list_page(fixture, rng):
+        user = fixture.pick(rng)
+        return "GET", f"/{resource}?page=1&page_size=20", _auth(user), None
+
+    def list_no_total(fixture, rng):
+        user = fixture.pick(rng)
+        return "GET", f"/{resource}?page=1&page_size=20&include_total=false", _auth(user), None
+
+    def detail(fixture, rng):
+        user = fixture.pick(rng)
+        return "GET", f"/{resource}/{rng.choice(user[resource] or [0])}", _auth(user), None
+
+    def create(fixture, rng):
+        user = fixture.pick(rng)
+        return "POST", f"/{resource}", _auth(user), _transaction(rng)
+
+    def patch(fixture, rng):
+        user = fixture.pick(rng)
+        body = {"value": f"{rng.uniform(1, 500):.2f}"}
+        return "PATCH", f"/{resource}/{rng.choice(user[resource] or [0])}", _auth(user), body
+
+    return {
+        f"{resource}.list": list_page,
+        f"{resource}.list_no_total": list_no_total,
+        f"{resource}.detail": detail,
+        f"{resource}.create": create,
+        f"{resource}.patch": patch,
+    }
+
+
+def _login(fixture, rng):
+    from benchmarks.seed import BENCH_PASSWORD
+
+    user = fixture.pick(rng)
+    return "POST", "/users/login", {}, {"email": user["email"], "password": BENCH_PASSWORD}
+
+
+SCENARIOS: Dict[str, Callable] = {
+    **_resource_scenarios("costs"),
+    **_resource_scenarios("receivements"),
+    "users.login": _login,
+}
+
+
+class InProcessClient:
+    def __init__(self):
+        from api import app
+        self.client = app.test_client()
+
+    def request(self, method: str, path: str, headers: dict, body: Optional[dict]) -> int:
+        response = self.client.open(path, method=method, headers=headers, json=body)
+        response.close()
+        return response.status_code
+
+
+class HttpClient:
+    def __init__(self, base_url: str):
+        parts = urlsplit(base_url)
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.prefix = parts.path.rstrip("/")
+        self.conn = None
+
+    def request(self, method: str, path: str, headers: dict, body: Optional[dict]) -> int:
+        # Conexão keep-alive por thread; refeita se o servidor fechar
+        for attempt in range(2):
+            if self.conn is None:
+                self.conn = http.client.HTTPConnection(self.host, self.port, timeout=60)
+            try:
+                payload = None
+                headers = dict(headers)
+                if body is not None:
+                    payload = json.dumps(body).encode()
+                    headers["Content-Type"] = "application/json"
+                self.conn.request(method, self.prefix + path, body=payload, headers=headers)
+                response = self.conn.getresponse()
+                response.read()
+                if response.will_close:
+                    self.conn.close()
+                    self.conn = None
+                return response.status
+            except (http.client.HTTPException, ConnectionError):
+                self.conn.close()
+                self.conn = None
+                if attempt:
+                    raise
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    # Nearest-rank
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(q / 100 * len(sorted_values)) - 1, 0)
+    return sorted_values[rank]
+
+
+def run_scenario(
+    name: str,
+    make_client: Callable,
+    fixture: Fixture,
+    requests: int,
+    concurrency: int,
+    warmup: int,
+    seed: int,
+) -> dict:
+    scenario = SCENARIOS[name]
+    latencies: List[List[float]] = [[] for _ in range(concurrency)]
+    errors = [0] * concurrency
+    statuses: Dict[int, int] = {}
+    statuses_lock = threading.Lock()
+    per_thread = [requests // concurrency + (1 if i < requests % concurrency else 0) for i in range(concurrency)]
+    barrier = threading.Barrier(concurrency + 1)
+
+    def worker(index: int):
+        rng = random.Random(seed * 1000 + index)
+        try:
+            client = make_client()
+            for _ in range(warmup // concurrency):
+                client.request(*scenario(fixture, rng))
+        finally:
+            # Todas as threads começam juntas, mesmo se o aquecimento falhar
+            barrier.wait()
+
+        for _ in range(per_thread[index]):
+            method, path, headers, body = scenario(fixture, rng)
+            start = time.perf_counter()
+            try:
+                status = client.request(method, path, headers, body)
+            except Exception:
+                status = 0
+            latencies[index].append(time.perf_counter() - start)
+            if status == 0 or status >= 400:
+                errors[index] += 1
+            with statuses_lock:
+                statuses[status] = statuses.get(status, 0) + 1
+
+    threads = [threading.Thread(target=worker, args=(i,), daemon=True) for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    values = [v for thread_values in latencies for v in thread_values]
+    return summarize(values, sum(errors), statuses, elapsed)
+
+
+def summarize(values: List[float], errors: int, statuses: Dict[int, int], elapsed: float) -> dict:
+    values = sorted(values)
+    total = len(values)
+    return {
+        "requests": total,
+        "errors": errors,
+        "error_rate": round(errors / total, 4) if total else 0.0,
+        "statuses": {str(status): count for status, count in sorted(statuses.items())},
+        "throughput_rps": round(total / elapsed, 2) if elapsed else 0.0,
+        "mean_ms": round(sum(values) / total * 1000, 3) if total else 0.0,
+        "p50_ms": round(percentile(values, 50) * 1000, 3),
+        "p95_ms": round(percentile(values, 95) * 1000, 3),
+        "p99_ms": round(percentile(values, 99) * 1000, 3),
+        "max_ms": round(values[-1] * 1000, 3) if values else 0.0,
+    }
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_gunicorn(extra_args: List[str], app_module: str = "run:app") -> Tuple[subprocess.Popen, str]:
+    port = _free_port()
+    backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    process = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "--bind", f"127.0.0.1:{port}", *extra_args, app_module],
+        cwd=backend_dir,
+    )
+
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError("gunicorn encerrou durante a inicialização")
+        try:
+            if HttpClient(base_url).request("GET", "/healthcheck", {}, None) == 200:
+                return process, base_url
+        except OSError:
+            time.sleep(0.2)
+
+    process.terminate()
+    raise RuntimeError("gunicorn não respondeu ao healthcheck")
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Teste de carga da API")
+    parser.add_argument("--target", choices=["inprocess", "http", "gunicorn"], default="inprocess")
+    parser.add_argument("--url", default="http://127.0.0.1:5000", help="Base da API no modo http")
+    parser.add_argument("--gunicorn-args", default="", help="Argumentos extras para o gunicorn")
+    parser.add_argument("--endpoints", nargs="+", choices=sorted(SCENARIOS), help="Padrão: todos menos users.login")
+    parser.add_argument("--requests", type=int, default=2000, help="Requisições por endpoint")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--warmup", type=int, default=100)
+    parser.add_argument("--users-sample", type=int, default=500, help="Usuários sorteados nas requisições")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Arquivo JSON de resultado (padrão: stdout)")
+    args = parser.parse_args()
+
+    endpoints = args.endpoints or [name for name in SCENARIOS if name != "users.login"]
+    fixture = load_fixture(args.users_sample)
+
+    process = None
+    if args.target == "inprocess":
+        make_client = InProcessClient
+    else:
+        base_url = args.url
+        if args.target == "gunicorn":
+            process, base_url = start_gunicorn(args.gunicorn_args.split())
+        make_client = lambda: HttpClient(base_url)
+
+    results = {}
+    try:
+        for name in endpoints:
+            results[name] = run_scenario(
+                name, make_client, fixture, args.requests, args.concurrency, args.warmup, args.seed
+            )
+            print(f"{name}: {results[name]['throughput_rps']} req/s, p95 {results[name]['p95_ms']} ms", file=sys.stderr)
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait(timeout=30)
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "commit": _git_commit(),
+            "target": args.target,
+            "gunicorn_args": args.gunicorn_args or None,
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+            "users_sample": args.users_sample,
+            "seed": args.seed,
+            "python": platform.python_version(),
+            "cpus": os.cpu_count(),
+        },
+        "results": results,
+    }
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,135 @@
+import argparse, sys, time
+from api.tools.db import DB
+from api.tools.password import hash_password
+
+
+# Popula o Postgres local (serviço db do docker-compose) com usuários e
+# lançamentos sintéticos para os testes de carga. Os dados são gerados no
+# próprio banco com generate_series, em blocos de usuários.
+# Uso: python -m benchmarks.seed --users 10000 --rows 10000000
+
+BENCH_EMAIL = "bench-%s@example.com"
+BENCH_EMAIL_PATTERN = "bench-%@example.com"
+BENCH_PASSWORD = "bench-password"
+
+INSERT_TRANSACTIONS = """
+    INSERT INTO {table} (user_id, title, description, value, transaction_date)
+    SELECT u.id,
+           %s || ' ' || g,
+           CASE WHEN g %% 3 = 0 THEN NULL ELSE 'Lançamento sintético' END,
+           round((random() * 500 + 1)::numeric, 2),
+           CURRENT_DATE - (random() * %s)::int
+    FROM users u
+    CROSS JOIN generate_series(1, %s) AS g
+    WHERE u.email LIKE %s AND u.id BETWEEN %s AND %s
+"""
+
+
+def reset(db: DB) -> int:
+    with db.connection() as conn:
+        with conn.cursor() as cur:
+            # Lançamentos, extrato e saldos saem em cascata
+            cur.execute("DELETE FROM users WHERE email LIKE %s", (BENCH_EMAIL_PATTERN,))
+            conn.commit()
+            return cur.rowcount
+
+
+def seed(db: DB, users: int, rows: int, days: int, chunk: int, seed_value: float) -> dict:
+    per_user = max(rows // max(users, 1), 0)
+    # Metade gastos, metade receitas
+    costs_per_user = per_user // 2
+    receivements_per_user = per_user - costs_per_user
+
+    # Um único hash para todos: o bcrypt não é o que está sendo medido aqui
+    password = hash_password(BENCH_PASSWORD)
+
+    with db.connection() as conn:
+        with conn.cursor() as cur:
+            # Mesma semente, mesmos dados
+            cur.execute("SELECT setseed(%s)", (seed_value,))
+            cur.execute(
+                """
+                INSERT INTO users (name, email, password)
+                SELECT 'Bench ' || n, 'bench-' || n || '@example.com', %s
+                FROM generate_series(1, %s) AS n
+                ON CONFLICT (email) DO NOTHING
+                """,
+                (password, users),
+            )
+            cur.execute(
+                "SELECT min(id), max(id) FROM users WHERE email LIKE %s",
+                (BENCH_EMAIL_PATTERN,),
+            )
+            first_id, last_id = cur.fetchone()
+            conn.commit()
+
+            inserted = {"costs": 0, "receivements": 0}
+            for start in range(first_id, last_id + 1, chunk):
+                end = min(start + chunk - 1, last_id)
+                for table, title, count in (
+                    ("costs", "Gasto", costs_per_user),
+                    ("receivements", "Recebimento", receivements_per_user),
+                ):
+                    if count <= 0:
+                        continue
+                    cur.execute(
+                        INSERT_TRANSACTIONS.format(table=table),
+                        (title, days, count, BENCH_EMAIL_PATTERN, start, end),
+                    )
+                    inserted[table] += cur.rowcount
+                # Um commit por bloco mantém as transações curtas
+                conn.commit()
+                print(f"Usuários {start}-{end}: {sum(inserted.values())} lançamentos", file=sys.stderr)
+
+            # Estatísticas atualizadas para o planejador escolher os índices
+            conn.autocommit = True
+            cur.execute("ANALYZE users, costs, receivements")
+            conn.autocommit = False
+
+    return {"users": last_id - first_id + 1, **inserted}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Gera dados sintéticos para testes de carga")
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--rows", type=int, default=100000, help="Total de lançamentos (gastos + receitas)")
+    parser.add_argument("--days", type=int, default=730, help="Intervalo de datas, em dias até hoje")
+    parser.add_argument("--chunk", type=int, default=500, help="Usuários por comando")
+    parser.add_argument("--seed", type=float, default=0.42)
+    parser.add_argument("--reset", action="store_true", help="Remove os usuários de benchmark antes")
+    parser.add_argument(
+        "--no-ledger", dest="ledger", action="store_false",
+        help="Não recalcula saldos e extratos (ficam fora de sincronia com os lançamentos)",
+    )
+    args = parser.parse_args()
+
+    db = DB()
+    if args.reset:
+        print(f"Usuários removidos: {reset(db)}", file=sys.stderr)
+
+    start = time.perf_counter()
+    result = seed(db, args.users, args.rows, args.days, args.chunk, args.seed)
+
+    # Os lançamentos entram direto nas tabelas: sem o rebuild, saldo e
+    # extrato não correspondem a eles
+    if args.ledger:
+        from api.controllers.balance_controller import BalanceController
+        result["statements"] = BalanceController().rebuild()
+    else:
+        print(
+            "ATENÇÃO: --no-ledger deixa balances e statements fora de sincronia; "
+            "rode python rebuild_balances.py antes de medir saldo ou extrato",
+            file=sys.stderr,
+        )
+
+    # Os relatórios dependem dos totais mensais
+    from api.controllers.monthly_totals_controller import MonthlyTotalsController
+    result["monthly_totals"] = MonthlyTotalsController().rebuild()
+
+    result["seconds"] = round(time.perf_counter() - start, 1)
+    print(result)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
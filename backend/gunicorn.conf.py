@@ -0,0 +1,85 @@
+import importlib.util, multiprocessing, os
+
+
+# Configuração do gunicorn em produção. Carregada automaticamente quando o
+# gunicorn é iniciado neste diretório: gunicorn -c gunicorn.conf.py run:app
+
+cpus = multiprocessing.cpu_count()
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:5000")
+
+# gthread: threads por worker, bom para handlers que esperam o banco.
+# gevent: greenlets; exige gevent e psycogreen (requirements-gevent.txt).
+# uvicorn: event loop para o app ASGI (asgi:app); exige requirements-asgi.txt
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "gthread")
+if worker_class not in ("gthread", "gevent", "sync", "uvicorn"):
+    raise ValueError(f"GUNICORN_WORKER_CLASS inválido: {worker_class}")
+
+workers = int(os.getenv("GUNICORN_WORKERS", cpus * 2 + 1))
+# Com threads > 1 o gunicorn troca sync por gthread silenciosamente
+threads = int(os.getenv("GUNICORN_THREADS", 4)) if worker_class == "gthread" else 1
+worker_connections = int(os.getenv("GUNICORN_WORKER_CONNECTIONS", 100))
+
+# Cada thread/greenlet pode segurar uma conexão: o pool acompanha a concorrência
+# do worker, limitado para não estourar o max_connections do Postgres
+if worker_class == "gevent":
+    # Falha no boot, e não no primeiro worker, se faltar alguma dependência
+    missing = [name for name in ("gevent", "psycogreen") if importlib.util.find_spec(name) is None]
+    if missing:
+        raise RuntimeError(
+            f"GUNICORN_WORKER_CLASS=gevent exige {', '.join(missing)}: pip install -r requirements-gevent.txt"
+        )
+    os.environ.setdefault("DB_POOL_MAX", str(min(worker_connections, 20)))
+    # Sob gevent as threads do executor viram greenlets; o bcrypt roda em processos
+    os.environ.setdefault("PASSWORD_HASH_EXECUTOR", "process")
+elif worker_class == "gthread":
+    os.environ.setdefault("DB_POOL_MAX", str(threads))
+elif worker_class == "uvicorn":
+    # No app ASGI o pool síncrono só atende as rotas do Flask montadas nele
+    os.environ.setdefault("DB_POOL_MAX", os.getenv("ASGI_WSGI_WORKERS", "10"))
+    worker_class = "uvicorn.workers.UvicornWorker"
+
+# Carrega o app uma vez no master e compartilha a memória com os workers.
+# Com gevent o monkey patch só acontece no worker, depois do carregamento,
+# então o preload fica desligado por padrão
+preload_app = os.getenv("GUNICORN_PRELOAD", "0" if worker_class == "gevent" else "1") == "1"
+
+# Recicla workers periodicamente; o jitter evita que todos reiniciem juntos
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", 2000))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", 200))
+
+timeout = int(os.getenv("GUNICORN_TIMEOUT", 30))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", 30))
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", 5))
+
+# O log de acesso fica a cargo do middleware de logs da API
+accesslog = None
+errorlog = "-"
+loglevel = os.getenv("LOG_LEVEL", "info").lower()
+
+
+def post_fork(server, worker):
+    # Sem preload o app é carregado no próprio worker e não há o que refazer
+    if not server.cfg.preload_app:
+        return
+
+    # Estado criado no master não sobrevive ao fork: threads somem e
+    # sockets seriam compartilhados entre processos
+    from api.tools.db import reset_pool_after_fork
+    from api.tools.logs import reset_logging_after_fork
+    from api.tools.password import reset_hasher_after_fork
+
+    reset_pool_after_fork()
+    reset_hasher_after_fork()
+    reset_logging_after_fork()
+
+
+def post_worker_init(worker):
+    if worker_class != "gevent":
+        return
+
+    # Sem o patch, cada consulta bloquearia todos os greenlets do worker;
+    # a presença do psycogreen já foi conferida ao carregar a configuração
+    from psycogreen.gevent import patch_psycopg
+
+    patch_psycopg()
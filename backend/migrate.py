@@ -0,0 +1,41 @@
+import argparse, sys
+from api.tools.migrations import migrate, migration_status
+from api.tools.query_plans import check_query_plans
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Migrações do banco de dados")
+    parser.add_argument(
+        "command",
+        nargs="?",
+        default="upgrade",
+        choices=["upgrade", "status", "check-plans"],
+    )
+    parser.add_argument("--target", type=int, help="Aplica migrações até esta versão")
+    parser.add_argument("--user-id", type=int, help="Usuário usado no EXPLAIN")
+    args = parser.parse_args()
+
+    if args.command == "status":
+        for migration in migration_status():
+            mark = "x" if migration["applied"] else " "
+            print(f"[{mark}] {migration['name']}")
+        return 0
+
+    if args.command == "check-plans":
+        failed = False
+        for result in check_query_plans(user_id=args.user_id):
+            status = "OK  " if result["ok"] else "FALHA"
+            print(f"{status} {result['name']}: {' -> '.join(result['nodes'])}")
+            for problem in result["problems"]:
+                print(f"      {problem}")
+            failed = failed or not result["ok"]
+        return 1 if failed else 0
+
+    applied = migrate(target=args.target)
+    if not applied:
+        print("Nenhuma migração pendente")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
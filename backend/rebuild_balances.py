@@ -0,0 +1,18 @@
+import argparse, sys
+from api.controllers.balance_controller import BalanceController
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Recalcula saldos e extratos a partir dos lançamentos"
+    )
+    parser.add_argument("--user-id", type=int, help="Recalcula apenas este usuário")
+    args = parser.parse_args()
+
+    rebuilt = BalanceController().rebuild(user_id=args.user_id)
+    print(f"Extrato recalculado: {rebuilt} lançamentos")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
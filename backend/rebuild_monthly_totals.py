@@ -0,0 +1,36 @@
+import argparse, sys
+from api.controllers.monthly_totals_controller import MonthlyTotalsController
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Recalcula ou confere os totais mensais a partir dos lançamentos"
+    )
+    parser.add_argument("--user-id", type=int, help="Apenas este usuário")
+    parser.add_argument(
+        "--verify",
+        action="store_true",
+        help="Só compara com os lançamentos; sai com erro se houver divergência",
+    )
+    args = parser.parse_args()
+
+    controller = MonthlyTotalsController()
+
+    if args.verify:
+        mismatches = controller.verify(user_id=args.user_id)
+        for row in mismatches:
+            print(
+                f"Usuário {row['user_id']} {row['month']:%Y-%m} {row['kind']}: "
+                f"{row['stored_total']} ({row['stored_count']}) "
+                f"!= {row['expected_total']} ({row['expected_count']})"
+            )
+        print(f"Divergências: {len(mismatches)}")
+        return 1 if mismatches else 0
+
+    rebuilt = controller.rebuild(user_id=args.user_id)
+    print(f"Totais mensais recalculados: {rebuilt} linhas")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
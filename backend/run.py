@@ -1,5 +1,7 @@
+import os
 from api import app
 
 
 if __name__ == '__main__':
-    app.run(debug=True)
\ No newline at end of file
+    # Servidor de desenvolvimento; em produção use o gunicorn (gunicorn.conf.py)
+    app.run(debug=os.getenv('FLASK_DEBUG', '1') == '1')
\ No newline at end of file
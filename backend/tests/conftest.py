@@ -0,0 +1,6 @@
+import os
+
+# Lidos na importação dos módulos da API: precisam vir antes deles
+os.environ.setdefault("SECRET_KEY", "test-secret-key-with-at-least-32-bytes")
+os.environ["CACHE_BACKEND"] = "memory"
+os.environ.setdefault("PROFILING", "off")
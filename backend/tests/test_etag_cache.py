@@ -0,0 +1,84 @@
+import pytest
+from decimal import Decimal
+from types import SimpleNamespace
+from api import app
+from api.middlewares import etag_middleware
+from api.routes import costs
+from api.tools import cache
+from api.tools.cache import get_read_cache
+from api.tools.token import generate_token
+
+
+USER = {"id": 1, "name": "Teste", "email": "teste@example.com"}
+HEADERS = {"Authorization": f"Bearer {generate_token(USER)}"}
+
+
+def page(title: str) -> dict:
+    return {
+        "items": [{"id": 1, "title": title, "description": None, "value": Decimal("10.00"), "transaction_date": None}],
+        "pagination": {
+            "page": 1, "page_size": 20, "total_items": 1, "total_pages": 1,
+            "has_next": False, "next_cursor": None,
+        },
+    }
+
+
+@pytest.fixture
+def state(monkeypatch):
+    # Estado do "banco": versão do data_versions e a página atual de gastos
+    state = {"version": 1, "title": "antigo"}
+    get_versions = lambda user_id, resources: {resource: state["version"] for resource in resources}
+    monkeypatch.setattr(etag_middleware.version_controller, "get_versions", get_versions)
+    monkeypatch.setattr(cache, "_version_controller", SimpleNamespace(get_versions=get_versions))
+    monkeypatch.setattr(
+        costs.cost_controller.repository, "list_page",
+        lambda *args, **kwargs: page(state["title"]),
+    )
+    get_read_cache().clear()
+    yield state
+    get_read_cache().clear()
+
+
+def test_write_from_other_worker_is_not_served_under_new_etag(state):
+    client = app.test_client()
+
+    first = client.get("/costs", headers=HEADERS)
+    assert first.status_code == 200
+    assert first.get_json()["items"][0]["title"] == "antigo"
+
+    # Escrita commitada por outro worker: a trigger avança o data_versions,
+    # mas o contador do cache deste processo não foi incrementado
+    state["version"] = 2
+    state["title"] = "novo"
+
+    second = client.get("/costs", headers={**HEADERS, "If-None-Match": first.headers["ETag"]})
+    assert second.status_code == 200
+    assert second.headers["ETag"] != first.headers["ETag"]
+    assert second.get_json()["items"][0]["title"] == "novo"
+
+    third = client.get("/costs", headers={**HEADERS, "If-None-Match": second.headers["ETag"]})
+    assert third.status_code == 304
+
+
+def test_unchanged_versions_are_served_from_cache(state):
+    client = app.test_client()
+
+    first = client.get("/costs", headers=HEADERS)
+    # Sem escrita a versão não muda: a leitura vem do cache, e não do banco
+    state["title"] = "nunca lido"
+
+    second = client.get("/costs", headers=HEADERS)
+    assert second.headers["ETag"] == first.headers["ETag"]
+    assert second.get_json()["items"][0]["title"] == "antigo"
+
+
+def test_reads_without_conditional_get_follow_data_versions(state):
+    # Leitura fora do conditional_get (sem g.data_versions): as versões vêm
+    # do banco, então a escrita de outro worker também invalida o cache
+    assert costs.cost_controller.get_costs(1)["items"][0]["title"] == "antigo"
+
+    state["title"] = "novo"
+    assert costs.cost_controller.get_costs(1)["items"][0]["title"] == "antigo"
+
+    state["version"] = 2
+    assert costs.cost_controller.get_costs(1)["items"][0]["title"] == "novo"
@@ -0,0 +1,37 @@
+import io
+import pytest
+from api.dtos.cost_dto import CreateCostDTO
+from api.tools.importer import ImportReport, iter_records, spool_batches, validated_batches
+
+
+def test_malformed_csv_is_a_value_error_with_the_line():
+    body = "title,value,transaction_date\nMercado,10,2024-01-05\n" + "x" * 200000 + ",1,2024-01-05\n"
+
+    with pytest.raises(ValueError, match="linha 3"):
+        list(iter_records(io.BytesIO(body.encode()), "csv"))
+
+
+def test_spool_reads_the_whole_body_before_returning():
+    read = []
+
+    def batches():
+        for line in (1, 2, 3):
+            read.append(line)
+            yield [(line, CreateCostDTO(title="Mercado", value="10", transaction_date="2024-01-05"))]
+
+    spooled = spool_batches(batches())
+
+    # O corpo já foi consumido antes de qualquer lote ser entregue
+    assert read == [1, 2, 3]
+    assert [batch[0][0] for batch in spooled] == [1, 2, 3]
+
+
+def test_spool_keeps_validated_rows():
+    body = b"title,value,transaction_date\nMercado,10,2024-01-05\n,abc,2024-01-05\n"
+    report = ImportReport()
+
+    spooled = spool_batches(validated_batches(iter_records(io.BytesIO(body), "csv"), CreateCostDTO, report))
+
+    assert [[item.title for _, item in batch] for batch in spooled] == [["Mercado"]]
+    assert report.failed == 1
+    assert report.errors[0]["line"] == 3
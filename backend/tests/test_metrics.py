@@ -0,0 +1,38 @@
+import pytest
+from api import app
+from api.routes import metrics
+from api.tools import profiler
+
+
+@pytest.fixture
+def client():
+    return app.test_client()
+
+
+def test_metrics_is_off_without_token(client, monkeypatch):
+    monkeypatch.setattr(metrics, "METRICS_TOKEN", "")
+    assert client.get("/metrics").status_code == 404
+
+
+def test_metrics_requires_the_token(client, monkeypatch):
+    monkeypatch.setattr(metrics, "METRICS_TOKEN", "segredo")
+
+    assert client.get("/metrics").status_code == 401
+    assert client.get("/metrics", headers={"Authorization": "Bearer outro"}).status_code == 401
+
+    response = client.get("/metrics", headers={"Authorization": "Bearer segredo"})
+    assert response.status_code == 200
+    assert "http_request_duration_seconds" in response.get_data(as_text=True)
+
+
+def test_profile_header_needs_the_shared_secret(monkeypatch):
+    monkeypatch.setattr(profiler, "PROFILING", "header")
+
+    # Sem segredo configurado o modo header fica desligado
+    monkeypatch.setattr(profiler, "PROFILE_TOKEN", "")
+    assert not profiler.should_profile({"X-Profile": "1"})
+
+    monkeypatch.setattr(profiler, "PROFILE_TOKEN", "segredo")
+    assert not profiler.should_profile({"X-Profile": "1"})
+    assert not profiler.should_profile({})
+    assert profiler.should_profile({"X-Profile": "segredo"})
@@ -0,0 +1,79 @@
+import contextlib
+from api.tools import migrations
+
+
+class FakeCursor:
+    def __init__(self, connection):
+        self.connection = connection
+        self.result = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, query, params=None):
+        self.connection.statements.append((query.strip(), self.connection.autocommit))
+        # Banco novo: sem schema_migrations aplicadas e sem tabela users
+        self.result = [(False,)] if "to_regclass" in query else []
+
+    def fetchone(self):
+        return self.result[0]
+
+    def fetchall(self):
+        return self.result
+
+
+class FakeConnection:
+    def __init__(self):
+        self.statements = []
+        self.autocommit = False
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+
+def run_migrations(tmp_path, files):
+    for name, script in files.items():
+        (tmp_path / name).write_text(script, encoding="utf-8")
+
+    connection = FakeConnection()
+    db = type("DB", (), {"connection": lambda self: contextlib.nullcontext(connection)})()
+    return migrations.migrate(db=db, directory=str(tmp_path)), connection
+
+
+def test_no_transaction_migration_runs_each_statement_in_autocommit(tmp_path):
+    applied, connection = run_migrations(tmp_path, {
+        "001.sql": "CREATE TABLE a (id int4);\nCREATE TABLE b (id int4);\n",
+        "002.sql": (
+            "-- migrate: no-transaction\n"
+            "--índices\n"
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_a ON a (id);\n"
+            "DROP INDEX CONCURRENTLY IF EXISTS idx_b;\n"
+        ),
+    })
+
+    assert applied == ["001.sql", "002.sql"]
+    assert connection.autocommit is False
+
+    # O 001 vai inteiro numa transação; o 002, um comando por vez em autocommit
+    assert ("CREATE TABLE a (id int4);\nCREATE TABLE b (id int4);", False) in connection.statements
+    assert ("CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_a ON a (id)", True) in connection.statements
+    assert ("DROP INDEX CONCURRENTLY IF EXISTS idx_b", True) in connection.statements
+    assert all(not autocommit for query, autocommit in connection.statements if "schema_migrations" in query)
+
+
+def test_shipped_index_migration_runs_outside_a_transaction():
+    path = next(path for version, _, path in migrations.list_migrations() if version == 2)
+    with open(path, encoding="utf-8") as f:
+        script = f.read()
+
+    assert script.startswith(migrations.NO_TRANSACTION)
+    assert all("CONCURRENTLY" in statement for statement in migrations.split_statements(script))
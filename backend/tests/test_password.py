@@ -0,0 +1,64 @@
+import contextlib
+import pytest
+from api.controllers.user_controller import UserController
+from api.tools import password
+from api.tools.password import PasswordHasher
+
+
+class FakeCursor:
+    description = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, query, params=None):
+        pass
+
+    def fetchone(self):
+        return None
+
+
+class FakeConnection:
+    def cursor(self):
+        return FakeCursor()
+
+
+class RecordingHasher(PasswordHasher):
+    def __init__(self):
+        super().__init__(rounds=4, workers=1)
+        self.checked = []
+
+    def _run(self, fn, *args):
+        if fn is password._checkpw:
+            self.checked.append(args[1].decode())
+        return super()._run(fn, *args)
+
+
+@pytest.fixture
+def hasher(monkeypatch):
+    hasher = RecordingHasher()
+    monkeypatch.setattr(password, "_hasher", hasher)
+    yield hasher
+    hasher.shutdown()
+
+
+def test_unknown_email_checks_a_dummy_hash_through_the_pool(hasher):
+    controller = UserController()
+
+    @contextlib.contextmanager
+    def connect():
+        yield FakeConnection()
+
+    controller.db.connection = connect
+
+    for _ in range(2):
+        with pytest.raises(ValueError, match="Email ou senha inválidos"):
+            controller.login("ninguem@example.com", "segredo")
+
+    # Um único hash fixo, no custo configurado, conferido a cada tentativa
+    assert len(hasher.checked) == 2
+    assert hasher.checked[0] == hasher.checked[1]
+    assert hasher.checked[0].split("$")[2] == "04"
@@ -0,0 +1,138 @@
+import contextlib, re
+import pytest
+from datetime import date
+from decimal import Decimal
+from api.repositories.transaction_repository import TransactionRepository
+
+
+class FakeCursor:
+    def __init__(self, connection):
+        self.connection = connection
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, query, params=None):
+        query = query.decode() if isinstance(query, bytes) else query
+        self.connection.statements.append(" ".join(query.split()))
+        self.connection.params.append(params)
+
+    def mogrify(self, template, args):
+        return repr(args).encode()
+
+    def fetchone(self):
+        return self.connection.results.pop(0)
+
+
+class FakeConnection:
+    # Registra cada comando enviado ao banco; as linhas vêm de results, em ordem
+    encoding = "UTF8"
+
+    def __init__(self, results):
+        self.results = list(results)
+        self.statements = []
+        self.params = []
+        self.commits = 0
+
+    def cursor(self, name=None):
+        return FakeCursor(self)
+
+    def commit(self):
+        self.commits += 1
+
+
+@pytest.fixture
+def repository():
+    return TransactionRepository("costs", "cost", "Gasto não encontrado")
+
+
+def run(repository, results, call):
+    connection = FakeConnection(results)
+
+    @contextlib.contextmanager
+    def connect():
+        yield connection
+
+    repository.db.connection = connect
+    return call(), connection
+
+
+# Comandos do extrato: uma linha na data do lançamento, ou várias linhas
+# seguidas do recálculo dos saldos
+SINGLE_ENTRY = ["WITH later AS ( UPDATE statements"]
+MOVED_ENTRY = ["INSERT INTO statements", "UPDATE statements AS s"]
+
+
+def assert_single_write(statements, command, ledger):
+    # Exatamente uma ida ao banco para a escrita, sem SELECT prévio, seguida
+    # do saldo, do extrato e dos totais mensais
+    assert len(statements) == len(ledger) + 3
+    assert not any(statement.startswith("SELECT") for statement in statements)
+
+    write, balance, *rest, monthly = statements
+    assert write.startswith(command)
+    assert "RETURNING" in write
+    assert balance.startswith("INSERT INTO balances")
+    for statement, prefix in zip(rest, ledger):
+        assert statement.startswith(prefix)
+    assert monthly.startswith("INSERT INTO monthly_totals")
+
+
+def test_update_is_one_statement_plus_ledger_and_rollup(repository):
+    row = (2, "Mercado", None, Decimal("70.00"), date(2024, 2, 10), Decimal("50.00"), date(2024, 1, 5))
+    item, connection = run(
+        repository, [row, (Decimal("-20.00"),)],
+        lambda: repository.update(1, 2, "Mercado", None, Decimal("70.00"), date(2024, 2, 10)),
+    )
+
+    assert item["value"] == Decimal("70.00")
+    assert_single_write(connection.statements, "WITH old AS", MOVED_ENTRY)
+    assert "FOR UPDATE" in connection.statements[0]
+    assert re.search(r"\) UPDATE \"costs\" AS t SET", connection.statements[0])
+    assert connection.commits == 1
+
+    # Mudou a data: o valor antigo sai em 05/01, o novo entra em 10/02 e os
+    # saldos do extrato são refeitos a partir da data mais antiga
+    assert connection.params[3][2] == date(2024, 1, 5)
+
+
+def test_patch_is_one_statement_plus_ledger_and_rollup(repository):
+    row = (2, "Mercado", None, Decimal("70.00"), date(2024, 1, 5), Decimal("50.00"), date(2024, 1, 5))
+    item, connection = run(
+        repository, [row, (Decimal("-20.00"),)],
+        lambda: repository.patch(1, 2, {"value": Decimal("70.00")}),
+    )
+
+    assert item["value"] == Decimal("70.00")
+    assert_single_write(connection.statements, "WITH old AS", SINGLE_ENTRY)
+    assert "FOR UPDATE" in connection.statements[0]
+    assert 'SET "value" = %s' in connection.statements[0]
+    assert connection.commits == 1
+
+
+def test_delete_is_one_statement_plus_ledger_and_rollup(repository):
+    deleted, connection = run(
+        repository, [(Decimal("50.00"), date(2024, 1, 5)), (Decimal("50.00"),)],
+        lambda: repository.delete(1, 2),
+    )
+
+    assert deleted is True
+    assert_single_write(connection.statements, 'DELETE FROM "costs"', SINGLE_ENTRY)
+    assert connection.commits == 1
+
+    # A linha do extrato fica na data do lançamento excluído
+    assert connection.params[2][3] == date(2024, 1, 5)
+    assert connection.params[2][-1] == Decimal("50.00")
+
+
+def test_missing_item_stops_after_the_write(repository):
+    item, connection = run(
+        repository, [None],
+        lambda: repository.update(1, 2, "Mercado", None, Decimal("70.00"), date(2024, 1, 5)),
+    )
+
+    assert item is None
+    assert len(connection.statements) == 1
@@ -1,6 +1,6 @@
 import React, { createContext, useContext, useEffect, useReducer } from 'react';
 import { AuthState, LoginCredentials, SignupData, User } from '../types';
-import { authAPI } from '../services/api';
+import { authAPI, cancelTokenRefresh, scheduleTokenRefresh, tokenStorage } from '../services/api';
 import { jwtDecode } from 'jwt-decode';
 
 // Initial state
@@ -20,6 +20,7 @@ type AuthAction =
   | { type: 'SIGNUP_REQUEST' }
   | { type: 'SIGNUP_SUCCESS' }
   | { type: 'SIGNUP_FAILURE'; payload: string }
+  | { type: 'TOKEN_REFRESHED'; payload: string }
   | { type: 'LOGOUT' };
 
 // Reducer
@@ -41,6 +42,11 @@ const authReducer = (state: AuthState, action: AuthAction): AuthState => {
         token: action.payload.token,
         error: null,
       };
+    case 'TOKEN_REFRESHED':
+      return {
+        ...state,
+        token: action.payload,
+      };
     case 'SIGNUP_SUCCESS':
       return {
         ...state,
@@ -79,6 +85,11 @@ const AuthContext = createContext<AuthContextType | undefined>(undefined);
 export const AuthProvider: React.FC<{ children: React.ReactNode }> = ({ children }) => {
   const [state, dispatch] = useReducer(authReducer, initialState);
 
+  // Keep the context in sync with proactive refreshes
+  const onTokenRefreshed = (token: string) => {
+    dispatch({ type: 'TOKEN_REFRESHED', payload: token });
+  };
+
   // Check for existing token on mount
   useEffect(() => {
     const token = localStorage.getItem('token');
@@ -97,11 +108,14 @@ export const AuthProvider: React.FC<{ children: React.ReactNode }> = ({ children
             },
           },
         });
+        scheduleTokenRefresh(onTokenRefreshed);
       } catch (error) {
         // Invalid token
-        localStorage.removeItem('token');
+        tokenStorage.clear();
       }
     }
+
+    return cancelTokenRefresh;
   }, []);
 
   // Login function
@@ -111,8 +125,9 @@ export const AuthProvider: React.FC<{ children: React.ReactNode }> = ({ children
       const response = await authAPI.login(credentials);
       const { access_token } = response;
       
-      // Store token
-      localStorage.setItem('token', access_token);
+      // Store access and refresh tokens
+      tokenStorage.set(response);
+      scheduleTokenRefresh(onTokenRefreshed);
       
       // Decode JWT to get user info
       const decoded = jwtDecode<{ id: number; name: string; email: string }>(access_token);
@@ -154,7 +169,9 @@ export const AuthProvider: React.FC<{ children: React.ReactNode }> = ({ children
 
   // Logout function
   const logout = () => {
-    localStorage.removeItem('token');
+    cancelTokenRefresh();
+    // Revoke the refresh token server-side before clearing local storage
+    authAPI.logout().finally(tokenStorage.clear);
     dispatch({ type: 'LOGOUT' });
   };
 
@@ -9,12 +9,13 @@ import {
   useTheme,
 } from '@mui/material';
 import { ArrowDownCircle, ArrowUpCircle, Wallet } from 'lucide-react';
-import { expensesAPI, incomesAPI } from '../services/api';
-import { Transaction } from '../types';
+import { summaryAPI, transactionsAPI } from '../services/api';
+import { FinancialSummary, TransactionItem } from '../types';
 
 const Dashboard: React.FC = () => {
-  const [expenses, setExpenses] = useState<Transaction[]>([]);
-  const [incomes, setIncomes] = useState<Transaction[]>([]);
+  const [expenses, setExpenses] = useState<TransactionItem[]>([]);
+  const [incomes, setIncomes] = useState<TransactionItem[]>([]);
+  const [summary, setSummary] = useState<FinancialSummary | null>(null);
   const [isLoading, setIsLoading] = useState(true);
   const theme = useTheme();
 
@@ -22,13 +23,16 @@ const Dashboard: React.FC = () => {
     const fetchData = async () => {
       try {
         setIsLoading(true);
-        const [expensesData, incomesData] = await Promise.all([
-          expensesAPI.getAll(1, 5),
-          incomesAPI.getAll(1, 5),
+        // Latest 5 of each kind, filtered by the API, and the totals
+        const [expensesData, incomesData, summaryData] = await Promise.all([
+          transactionsAPI.getAll(1, 5, 'cost'),
+          transactionsAPI.getAll(1, 5, 'receivement'),
+          summaryAPI.get(),
         ]);
-        
+
         setExpenses(expensesData.items);
         setIncomes(incomesData.items);
+        setSummary(summaryData);
       } catch (error) {
         console.error('Error fetching dashboard data:', error);
       } finally {
@@ -39,10 +43,10 @@ const Dashboard: React.FC = () => {
     fetchData();
   }, []);
 
-  // Calculate totals
-  const totalExpenses = expenses.reduce((acc, expense) => acc + Number(expense.value), 0);
-  const totalIncomes = incomes.reduce((acc, income) => acc + Number(income.value), 0);
-  const balance = totalIncomes - totalExpenses;
+  // Totals are aggregated by the API over the whole history
+  const totalExpenses = Number(summary?.totals.expenses ?? 0);
+  const totalIncomes = Number(summary?.totals.income ?? 0);
+  const balance = Number(summary?.totals.net ?? 0);
 
   const summaryCards = [
     {
@@ -130,7 +134,7 @@ const Dashboard: React.FC = () => {
             ) : expenses.length > 0 ? (
               expenses.map((expense) => (
                 <Box
-                  key={expense.id}
+                  key={`${expense.kind}-${expense.id}`}
                   sx={{
                     py: 1.5,
                     display: 'flex',
@@ -173,7 +177,7 @@ const Dashboard: React.FC = () => {
             ) : incomes.length > 0 ? (
               incomes.map((income) => (
                 <Box
-                  key={income.id}
+                  key={`${income.kind}-${income.id}`}
                   sx={{
                     py: 1.5,
                     display: 'flex',
@@ -31,7 +31,7 @@ const ExpenseList: React.FC = () => {
         dateFilter.end_date
       );
       setExpenses(response.items);
-      setTotalItems(response.pagination.total_items);
+      setTotalItems(response.pagination.total_items ?? 0);
     } catch (error) {
       console.error('Error fetching expenses:', error);
     } finally {
@@ -31,7 +31,7 @@ const IncomeList: React.FC = () => {
         dateFilter.end_date
       );
       setIncomes(response.items);
-      setTotalItems(response.pagination.total_items);
+      setTotalItems(response.pagination.total_items ?? 0);
     } catch (error) {
       console.error('Error fetching incomes:', error);
     } finally {
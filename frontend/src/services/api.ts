@@ -1,7 +1,34 @@
-import { AuthResponse, LoginCredentials, PaginatedResponse, SignupData, Transaction, TransactionFormData } from '../types';
+import { AuthResponse, FinancialSummary, LoginCredentials, PaginatedResponse, SignupData, Transaction, TransactionFormData, TransactionKind, TransactionsResponse } from '../types';
+import { jwtDecode } from 'jwt-decode';
 
 const API_URL = import.meta.env.VITE_API_URL;
 
+// Refresh this many seconds before the access token expires
+const REFRESH_MARGIN_SECONDS = 60;
+
+// Last body and ETag of each GET, revalidated with If-None-Match
+const etagCache = new Map<string, { etag: string; body: unknown }>();
+
+// Token storage
+export const tokenStorage = {
+  getAccessToken: () => localStorage.getItem('token'),
+  getRefreshToken: () => localStorage.getItem('refresh_token'),
+  set: (auth: AuthResponse) => {
+    localStorage.setItem('token', auth.access_token);
+    localStorage.setItem('refresh_token', auth.refresh_token);
+  },
+  clear: () => {
+    localStorage.removeItem('token');
+    localStorage.removeItem('refresh_token');
+    etagCache.clear();
+  },
+};
+
+const redirectToLogin = () => {
+  tokenStorage.clear();
+  window.location.href = '/login';
+};
+
 // Helper to handle API responses
 const handleResponse = async (response: Response) => {
   if (response.status === 204) {
@@ -9,8 +36,7 @@ const handleResponse = async (response: Response) => {
   }
   
   if (response.status === 401) {
-    localStorage.removeItem('token');
-    window.location.href = '/login';
+    redirectToLogin();
     throw new Error('Session expired. Please login again.');
   }
   
@@ -22,12 +48,120 @@ const handleResponse = async (response: Response) => {
   return response.json();
 };
 
-// Get authorization header
-const getAuthHeader = () => {
-  const token = localStorage.getItem('token');
-  return token ? { Authorization: `Bearer ${token}` } : {};
+// Seconds until the access token expires (0 if missing or invalid)
+const secondsUntilExpiry = (token: string | null) => {
+  if (!token) return 0;
+  try {
+    const { exp } = jwtDecode<{ exp: number }>(token);
+    return exp - Date.now() / 1000;
+  } catch {
+    return 0;
+  }
+};
+
+// Single in-flight refresh shared by every caller
+let refreshPromise: Promise<string | null> | null = null;
+
+export const refreshAccessToken = (): Promise<string | null> => {
+  if (refreshPromise) return refreshPromise;
+
+  const refreshToken = tokenStorage.getRefreshToken();
+  if (!refreshToken) return Promise.resolve(null);
+
+  refreshPromise = (async () => {
+    try {
+      const response = await fetch(`${API_URL}/users/refresh`, {
+        method: 'POST',
+        headers: {
+          'Content-Type': 'application/json',
+        },
+        body: JSON.stringify({ refresh_token: refreshToken }),
+      });
+
+      if (!response.ok) {
+        // Only a rejected refresh token ends the session
+        if (response.status === 401) tokenStorage.clear();
+        return null;
+      }
+
+      const auth: AuthResponse = await response.json();
+      tokenStorage.set(auth);
+      return auth.access_token;
+    } catch {
+      return null;
+    } finally {
+      refreshPromise = null;
+    }
+  })();
+
+  return refreshPromise;
+};
+
+// Returns a valid access token, refreshing it first when close to expiry
+const getFreshToken = async () => {
+  const token = tokenStorage.getAccessToken();
+  if (secondsUntilExpiry(token) > REFRESH_MARGIN_SECONDS) return token;
+  return (await refreshAccessToken()) ?? token;
+};
+
+// fetch with the Authorization header and one retry after a refresh on 401
+const authFetch = async (url: string, init: RequestInit = {}) => {
+  const withAuth = (token: string | null): RequestInit => ({
+    ...init,
+    headers: {
+      ...(init.headers || {}),
+      ...(token ? { Authorization: `Bearer ${token}` } : {}),
+    },
+  });
+
+  const response = await fetch(url, withAuth(await getFreshToken()));
+  if (response.status !== 401) return response;
+
+  const token = await refreshAccessToken();
+  return token ? fetch(url, withAuth(token)) : response;
+};
+
+// GET that sends the stored ETag back; a 304 reuses the previous body
+const conditionalGet = async <R>(url: string): Promise<R> => {
+  const cached = etagCache.get(url);
+  const response = await authFetch(url, cached ? { headers: { 'If-None-Match': cached.etag } } : {});
+
+  if (response.status === 304 && cached) {
+    return cached.body as R;
+  }
+
+  const body = await handleResponse(response);
+  const etag = response.headers.get('ETag');
+  if (etag) {
+    etagCache.set(url, { etag, body });
+  } else {
+    etagCache.delete(url);
+  }
+
+  return body;
+};
+
+// Schedules a proactive refresh shortly before the access token expires
+let refreshTimer: ReturnType<typeof setTimeout> | undefined;
+
+export const scheduleTokenRefresh = (onRefreshed?: (token: string) => void) => {
+  clearTimeout(refreshTimer);
+
+  const token = tokenStorage.getAccessToken();
+  if (!token || !tokenStorage.getRefreshToken()) return;
+
+  const delay = Math.max(secondsUntilExpiry(token) - REFRESH_MARGIN_SECONDS, 0) * 1000;
+  refreshTimer = setTimeout(async () => {
+    const refreshed = await refreshAccessToken();
+    if (refreshed) {
+      onRefreshed?.(refreshed);
+      scheduleTokenRefresh(onRefreshed);
+    }
+  }, delay);
 };
 
+export const cancelTokenRefresh = () => clearTimeout(refreshTimer);
+
 // Authentication API calls
 export const authAPI = {
   signup: async (data: SignupData) => {
@@ -53,6 +187,20 @@ export const authAPI = {
     
     return handleResponse(response);
   },
+
+  logout: async () => {
+    const refreshToken = tokenStorage.getRefreshToken();
+    if (!refreshToken) return;
+
+    // Best effort: the local session ends even if the request fails
+    await fetch(`${API_URL}/users/logout`, {
+      method: 'POST',
+      headers: {
+        'Content-Type': 'application/json',
+      },
+      body: JSON.stringify({ refresh_token: refreshToken }),
+    }).catch(() => undefined);
+  },
 };
 
 // Generic transaction API with type parameter
@@ -66,31 +214,18 @@ const createTransactionAPI = <T extends Transaction>(endpoint: string) => ({
     if (startDate) params.append('start_date', startDate);
     if (endDate) params.append('end_date', endDate);
     
-    const response = await fetch(`${API_URL}/${endpoint}?${params.toString()}`, {
-      headers: {
-        ...getAuthHeader(),
-      },
-    });
-    
-    return handleResponse(response);
+    return conditionalGet(`${API_URL}/${endpoint}?${params.toString()}`);
   },
   
   getById: async (id: number): Promise<T> => {
-    const response = await fetch(`${API_URL}/${endpoint}/${id}`, {
-      headers: {
-        ...getAuthHeader(),
-      },
-    });
-    
-    return handleResponse(response);
+    return conditionalGet(`${API_URL}/${endpoint}/${id}`);
   },
   
   create: async (data: TransactionFormData): Promise<T> => {
-    const response = await fetch(`${API_URL}/${endpoint}`, {
+    const response = await authFetch(`${API_URL}/${endpoint}`, {
       method: 'POST',
       headers: {
         'Content-Type': 'application/json',
-        ...getAuthHeader(),
       },
       body: JSON.stringify(data),
     });
@@ -99,11 +234,10 @@ const createTransactionAPI = <T extends Transaction>(endpoint: string) => ({
   },
   
   update: async (id: number, data: Partial<TransactionFormData>): Promise<T> => {
-    const response = await fetch(`${API_URL}/${endpoint}/${id}`, {
+    const response = await authFetch(`${API_URL}/${endpoint}/${id}`, {
       method: 'PATCH',
       headers: {
         'Content-Type': 'application/json',
-        ...getAuthHeader(),
       },
       body: JSON.stringify(data),
     });
@@ -112,11 +246,8 @@ const createTransactionAPI = <T extends Transaction>(endpoint: string) => ({
   },
   
   delete: async (id: number): Promise<void> => {
-    const response = await fetch(`${API_URL}/${endpoint}/${id}`, {
+    const response = await authFetch(`${API_URL}/${endpoint}/${id}`, {
       method: 'DELETE',
-      headers: {
-        ...getAuthHeader(),
-      },
     });
     
     return handleResponse(response);
@@ -124,4 +255,42 @@ const createTransactionAPI = <T extends Transaction>(endpoint: string) => ({
 });
 
 export const expensesAPI = createTransactionAPI<Transaction>('costs');
-export const incomesAPI = createTransactionAPI<Transaction>('receivements');
\ No newline at end of file
+export const incomesAPI = createTransactionAPI<Transaction>('receivements');
+
+// Costs and receivements in a single date-ordered list
+export const transactionsAPI = {
+  getAll: async (
+    page = 1,
+    pageSize = 10,
+    kind?: TransactionKind,
+    startDate?: string,
+    endDate?: string
+  ): Promise<TransactionsResponse> => {
+    const params = new URLSearchParams({
+      page: page.toString(),
+      page_size: pageSize.toString(),
+    });
+
+    if (kind) params.append('type', kind);
+    if (startDate) params.append('start_date', startDate);
+    if (endDate) params.append('end_date', endDate);
+
+    return conditionalGet(`${API_URL}/transactions?${params.toString()}`);
+  },
+};
+
+// Financial summary computed by the API
+export const summaryAPI = {
+  get: async (
+    startDate?: string,
+    endDate?: string,
+    groupBy: 'day' | 'week' | 'month' | 'year' = 'month'
+  ): Promise<FinancialSummary> => {
+    const params = new URLSearchParams({ group_by: groupBy });
+
+    if (startDate) params.append('start_date', startDate);
+    if (endDate) params.append('end_date', endDate);
+
+    return conditionalGet(`${API_URL}/summary?${params.toString()}`);
+  },
+};
\ No newline at end of file
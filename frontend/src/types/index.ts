@@ -26,6 +26,9 @@ export interface SignupData {
 
 export interface AuthResponse {
   access_token: string;
+  refresh_token: string;
+  token_type: string;
+  expires_in: number;
 }
 
 // Transaction types
@@ -37,6 +40,12 @@ export interface Transaction {
   transaction_date: string;
 }
 
+export type TransactionKind = 'cost' | 'receivement';
+
+export interface TransactionItem extends Transaction {
+  kind: TransactionKind;
+}
+
 export interface TransactionFormData {
   title: string;
   description: string;
@@ -46,10 +55,12 @@ export interface TransactionFormData {
 
 // Pagination types
 export interface PaginationData {
-  page: number;
+  page: number | null;
   page_size: number;
-  total_items: number;
-  total_pages: number;
+  total_items: number | null;
+  total_pages: number | null;
+  has_next: boolean;
+  next_cursor: string | null;
 }
 
 export interface PaginationLinks {
@@ -65,6 +76,32 @@ export interface PaginatedResponse<T> {
   links: PaginationLinks;
 }
 
+// Summary types
+export interface SummaryTotals {
+  income: number | string;
+  expenses: number | string;
+  net: number | string;
+  income_count: number;
+  expenses_count: number;
+}
+
+export interface SummaryBucket extends SummaryTotals {
+  period: string;
+}
+
+export interface FinancialSummary {
+  start_date: string | null;
+  end_date: string | null;
+  group_by: 'day' | 'week' | 'month' | 'year';
+  totals: SummaryTotals;
+  buckets: SummaryBucket[];
+}
+
+// Costs and receivements merged by the API, newest first
+export interface TransactionsResponse extends PaginatedResponse<TransactionItem> {
+  totals: SummaryTotals | null;
+}
+
 // Filter types
 export interface DateRangeFilter {
   start_date?: string;
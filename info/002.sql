@@ -0,0 +1,13 @@
+-- migrate: no-transaction
+--índices compostos para as listagens filtradas por usuário e período
+--(mesma ordem do ORDER BY transaction_date DESC, id DESC usado nas consultas).
+--CONCURRENTLY não bloqueia as escritas durante a criação, mas não roda numa
+--transação: o runner executa cada comando em autocommit
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_costs_user_date ON public.costs USING btree (user_id, transaction_date DESC, id DESC) INCLUDE (value);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_receivements_user_date ON public.receivements USING btree (user_id, transaction_date DESC, id DESC) INCLUDE (value);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_statements_user_date ON public.statements USING btree (user_id, transaction_date DESC, id DESC);
+
+--os índices simples em user_id ficam redundantes com os compostos
+DROP INDEX CONCURRENTLY IF EXISTS public.idx_user_id_costs;
+DROP INDEX CONCURRENTLY IF EXISTS public.idx_user_id;
+DROP INDEX CONCURRENTLY IF EXISTS public.idx_user_id_statements;
@@ -0,0 +1,4 @@
+--extrato: ao excluir um lançamento a referência vira NULL (ON DELETE SET NULL),
+--então a linha do extrato pode ficar sem cost_id e sem receivement_id
+ALTER TABLE public.statements DROP CONSTRAINT IF EXISTS statements_check;
+ALTER TABLE public.statements ADD CONSTRAINT statements_check CHECK ((NOT ((receivement_id IS NOT NULL) AND (cost_id IS NOT NULL))));
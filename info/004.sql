@@ -0,0 +1,15 @@
+--tabela refresh_tokens (apenas o sha256 do token é armazenado)
+CREATE TABLE public.refresh_tokens (
+	id serial4 NOT NULL,
+	user_id int4 NOT NULL,
+	token_hash bpchar(64) NOT NULL,
+	family_id bpchar(32) NOT NULL,
+	expires_at timestamp NOT NULL,
+	created_at timestamp DEFAULT now() NOT NULL,
+	revoked_at timestamp NULL,
+	replaced_by int4 NULL,
+	CONSTRAINT refresh_tokens_pkey PRIMARY KEY (id),
+	CONSTRAINT refresh_tokens_token_hash_key UNIQUE (token_hash),
+	CONSTRAINT refresh_tokens_user_id_fkey FOREIGN KEY (user_id) REFERENCES public.users(id) ON DELETE CASCADE
+);
+CREATE INDEX idx_refresh_tokens_family_id ON public.refresh_tokens USING btree (family_id) WHERE revoked_at IS NULL;
@@ -0,0 +1,52 @@
+--versão dos dados de cada usuário por recurso (costs, receivements), usada nos ETags;
+--mantida por triggers por comando, então um lote de N linhas incrementa uma única vez
+CREATE TABLE public.data_versions (
+	user_id int4 NOT NULL,
+	resource varchar(32) NOT NULL,
+	"version" int8 DEFAULT 0 NOT NULL,
+	updated_at timestamp DEFAULT now() NOT NULL,
+	CONSTRAINT data_versions_pkey PRIMARY KEY (user_id, resource),
+	CONSTRAINT data_versions_user_id_fkey FOREIGN KEY (user_id) REFERENCES public.users(id) ON DELETE CASCADE
+);
+
+CREATE OR REPLACE FUNCTION public.bump_data_version() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+	--as tabelas de transição existentes dependem do evento; o JOIN com users
+	--ignora exclusões em cascata de um usuário que está sendo removido
+	IF TG_OP = 'INSERT' THEN
+		INSERT INTO public.data_versions (user_id, resource, "version", updated_at)
+		SELECT DISTINCT u.id, TG_TABLE_NAME, 1, now() FROM new_rows JOIN public.users u ON u.id = new_rows.user_id
+		ON CONFLICT (user_id, resource) DO UPDATE
+		SET "version" = data_versions."version" + 1, updated_at = now();
+	ELSIF TG_OP = 'DELETE' THEN
+		INSERT INTO public.data_versions (user_id, resource, "version", updated_at)
+		SELECT DISTINCT u.id, TG_TABLE_NAME, 1, now() FROM old_rows JOIN public.users u ON u.id = old_rows.user_id
+		ON CONFLICT (user_id, resource) DO UPDATE
+		SET "version" = data_versions."version" + 1, updated_at = now();
+	ELSE
+		INSERT INTO public.data_versions (user_id, resource, "version", updated_at)
+		SELECT u.id, TG_TABLE_NAME, 1, now()
+		FROM (SELECT user_id FROM new_rows UNION SELECT user_id FROM old_rows) AS changed
+		JOIN public.users u ON u.id = changed.user_id
+		ON CONFLICT (user_id, resource) DO UPDATE
+		SET "version" = data_versions."version" + 1, updated_at = now();
+	END IF;
+	RETURN NULL;
+END;
+$$;
+
+--triggers com tabelas de transição aceitam um único evento cada
+CREATE TRIGGER costs_version_insert AFTER INSERT ON public.costs
+	REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION public.bump_data_version();
+CREATE TRIGGER costs_version_update AFTER UPDATE ON public.costs
+	REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION public.bump_data_version();
+CREATE TRIGGER costs_version_delete AFTER DELETE ON public.costs
+	REFERENCING OLD TABLE AS old_rows FOR EACH STATEMENT EXECUTE FUNCTION public.bump_data_version();
+
+CREATE TRIGGER receivements_version_insert AFTER INSERT ON public.receivements
+	REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION public.bump_data_version();
+CREATE TRIGGER receivements_version_update AFTER UPDATE ON public.receivements
+	REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION public.bump_data_version();
+CREATE TRIGGER receivements_version_delete AFTER DELETE ON public.receivements
+	REFERENCING OLD TABLE AS old_rows FOR EACH STATEMENT EXECUTE FUNCTION public.bump_data_version();
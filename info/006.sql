@@ -0,0 +1,27 @@
+--totais mensais de gastos e receitas por usuário, mantidos pelos controllers
+--na mesma transação de cada escrita; base dos relatórios por mês e por ano
+CREATE TABLE public.monthly_totals (
+	user_id int4 NOT NULL,
+	"month" date NOT NULL,
+	kind varchar(16) NOT NULL,
+	total numeric(14, 2) DEFAULT 0 NOT NULL,
+	"count" int4 DEFAULT 0 NOT NULL,
+	CONSTRAINT monthly_totals_pkey PRIMARY KEY (user_id, "month", kind),
+	CONSTRAINT monthly_totals_kind_check CHECK (kind IN ('cost', 'receivement')),
+	CONSTRAINT monthly_totals_user_id_fkey FOREIGN KEY (user_id) REFERENCES public.users(id) ON DELETE CASCADE
+);
+
+--carga inicial a partir do histórico existente. O SHARE trava as escritas em
+--costs e receivements até o commit da migração e espera as que estão em
+--andamento: nenhum lançamento fica fora da carga nem é somado duas vezes
+--pela escrita que o criou
+LOCK TABLE public.costs, public.receivements IN SHARE MODE;
+
+INSERT INTO public.monthly_totals (user_id, "month", kind, total, "count")
+SELECT user_id, date_trunc('month', transaction_date)::date, 'cost', SUM(value), COUNT(*)
+FROM public.costs
+GROUP BY 1, 2
+UNION ALL
+SELECT user_id, date_trunc('month', transaction_date)::date, 'receivement', SUM(value), COUNT(*)
+FROM public.receivements
+GROUP BY 1, 2;